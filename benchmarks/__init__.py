@@ -0,0 +1,6 @@
+"""
+Benchmark scripts for the chess tournament application.
+
+Run them from the repository root as modules, e.g.:
+    python -m benchmarks.storage_backends --sizes 1000 10000
+"""
@@ -0,0 +1,94 @@
+"""
+Measures how ClubManager loading scales with the number of workers.
+
+The script generates club files in a temporary directory, then times a serial
+load and parallel loads with thread and process pools of increasing size.
+
+Usage (from the repository root):
+    python -m benchmarks.club_loading --clubs 200 --players 2000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from models.club_manager import ClubManager
+
+
+def make_club_files(folder, clubs, players):
+    """
+    Writes the club files, plus one invalid file (to check it is still
+    reported)
+    """
+    for club_number in range(clubs):
+        data = {
+            "name": f"Club {club_number}",
+            "players": [
+                {
+                    "name": f"Player {club_number}-{number}",
+                    "email": f"player{number}@club{club_number}.com",
+                    "chess_id": f"AB{number % 100000:05d}",
+                    "birthday": "01-01-1990",
+                }
+                for number in range(players)
+            ],
+        }
+        with open(
+            os.path.join(folder, f"club{club_number:04d}.json"), "w"
+        ) as fp:
+            json.dump(data, fp)
+
+    with open(os.path.join(folder, "broken.json"), "w") as fp:
+        fp.write("{")
+
+
+def timed_load(folder, **kwargs):
+    """Loads the clubs and returns (elapsed time in seconds, club names)"""
+    start = time.perf_counter()
+    manager = ClubManager(folder, **kwargs)
+    return time.perf_counter() - start, [club.name for club in manager.clubs]
+
+
+def main(clubs, players, max_workers):
+    with tempfile.TemporaryDirectory() as folder:
+        make_club_files(folder, clubs, players)
+
+        serial_time, serial_names = timed_load(folder)
+        print(f"\n{clubs} clubs x {players} players")
+        print(f"{'mode':<10}{'workers':>8}{'time (s)':>10}{'speedup':>9}")
+        print(f"{'serial':<10}{1:>8}{serial_time:>10.3f}{1:>9.2f}")
+
+        workers = 1
+        while workers <= max_workers:
+            for mode, processes in (("threads", False), ("processes", True)):
+                elapsed, names = timed_load(
+                    folder, workers=workers, processes=processes
+                )
+                message = "parallel loading changed the order of the clubs"
+                assert names == serial_names, message
+                print(
+                    f"{mode:<10}{workers:>8}{elapsed:>10.3f}"
+                    f"{serial_time / elapsed:>9.2f}"
+                )
+            workers *= 2
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark serial and parallel club loading."
+    )
+    parser.add_argument(
+        "--clubs", type=int, default=200, help="Number of club files"
+    )
+    parser.add_argument(
+        "--players", type=int, default=2000, help="Number of players per club"
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Largest pool size to measure",
+    )
+    args = parser.parse_args()
+    main(args.clubs, args.players, args.max_workers)
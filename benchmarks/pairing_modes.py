@@ -0,0 +1,108 @@
+"""
+Compares the "swiss" (greedy) and "optimal" (maximum-weight matching) pairing
+modes.
+
+The script plays synthetic tournaments with random results. Before each round,
+both modes pair the same standings; the tournament then goes on with the
+pairing of the mode given by --play. For each mode and round, it reports the
+pairing time, the number of rematches and the points differences between
+opponents.
+
+Usage (from the repository root):
+    python -m benchmarks.pairing_modes --players 1000 --rounds 9
+"""
+import argparse
+import random
+import time
+from collections import defaultdict
+
+from models.pairing import PAIRING_MODES, pair_random
+
+RESULTS = ((1.0, 0.0), (0.5, 0.5), (0.0, 1.0))
+
+
+def quality(pairs, points, opponents):
+    """
+    Returns (rematches, sum of squared points differences, largest points
+    difference)
+    """
+    rematches = sum(1 for a, b in pairs if b in opponents[a])
+    differences = [abs(points[a] - points[b]) for a, b in pairs]
+    return (
+        rematches,
+        sum(d * d for d in differences),
+        max(differences, default=0.0),
+    )
+
+
+def main(players, rounds, play, seed):
+    rng = random.Random(seed)
+    player_ids = [f"P{number:05d}" for number in range(players)]
+    points = defaultdict(float)
+    opponents = defaultdict(set)
+
+    print(
+        f"\n{players} players, {rounds} rounds (tournament continues with the "
+        f"'{play}' pairing)"
+    )
+    print(
+        f"{'round':>5} {'mode':<8}{'time (s)':>10}{'rematches':>11}"
+        f"{'sum d^2':>9}{'max d':>7}"
+    )
+    totals = {mode: [0.0, 0, 0.0] for mode in PAIRING_MODES}
+    for number in range(1, rounds + 1):
+        if number == 1:
+            pairs = pair_random(player_ids, rng)
+        else:
+            pairings = {}
+            for mode, pair in PAIRING_MODES.items():
+                start = time.perf_counter()
+                pairings[mode] = pair(
+                    player_ids, points, opponents, random.Random(rng.random())
+                )
+                elapsed = time.perf_counter() - start
+                rematches, squares, largest = quality(
+                    pairings[mode], points, opponents
+                )
+                totals[mode][0] += elapsed
+                totals[mode][1] += rematches
+                totals[mode][2] += squares
+                print(
+                    f"{number:>5} {mode:<8}{elapsed:>10.3f}{rematches:>11}"
+                    f"{squares:>9.1f}{largest:>7.1f}"
+                )
+            pairs = pairings[play]
+
+        for a, b in pairs:
+            opponents[a].add(b)
+            opponents[b].add(a)
+            score_a, score_b = rng.choice(RESULTS)
+            points[a] += score_a
+            points[b] += score_b
+
+    print(f"{'total':>5}")
+    for mode, (elapsed, rematches, squares) in totals.items():
+        print(
+            f"{'':>5} {mode:<8}{elapsed:>10.3f}{rematches:>11}{squares:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the quality and latency of the pairing modes."
+    )
+    parser.add_argument(
+        "--players", type=int, default=1000, help="Number of players (even)"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=9, help="Number of rounds"
+    )
+    parser.add_argument(
+        "--play",
+        choices=sorted(PAIRING_MODES),
+        default="swiss",
+        help="Pairing mode used to continue the tournament",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    main(args.players, args.rounds, args.play, args.seed)
@@ -0,0 +1,158 @@
+"""
+Compares the JSON and SQLite storage backends on synthetic federations.
+
+For each size, the script generates the given number of players spread over
+clubs (plus one tournament), stores them with both backends in a temporary
+directory and times the common reads:
+- all players of one club
+- one player by chess ID
+- the matches of round 3 of a tournament
+- a scan of all players
+
+Usage (from the repository root):
+    python -m benchmarks.storage_backends --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+from models.repository import JsonRepository
+from models.sqlite_repository import SqliteRepository
+
+PLAYERS_PER_CLUB = 1000
+TOURNAMENT_PLAYERS = 64
+TOURNAMENT_ROUNDS = 7
+
+
+def make_chess_id(number):
+    """Builds a unique chess ID (two letters + 5 digits) from a number"""
+    letters = string.ascii_uppercase
+    prefix = (
+        letters[number // 100000 // 26 % 26] + letters[number // 100000 % 26]
+    )
+    return f"{prefix}{number % 100000:05d}"
+
+
+def make_clubs(count):
+    """Generates the clubs data: {key: {"name", "players"}}"""
+    clubs = {}
+    for number in range(count):
+        key = f"club{number // PLAYERS_PER_CLUB:05d}"
+        club = clubs.setdefault(key, {"name": f"Club {key}", "players": []})
+        club["players"].append({
+            "name": f"Player {number}",
+            "email": f"player{number}@example.com",
+            "chess_id": make_chess_id(number),
+            "birthday": "01-01-1990",
+        })
+    return clubs
+
+
+def make_tournament(chess_ids):
+    """Generates a tournament with random pairings and results"""
+    players = random.sample(chess_ids, min(TOURNAMENT_PLAYERS, len(chess_ids)))
+    rounds = []
+    for _ in range(TOURNAMENT_ROUNDS):
+        random.shuffle(players)
+        rounds.append(
+            [
+                {
+                    "players": [p1, p2],
+                    "completed": True,
+                    "winner": random.choice([p1, p2, None]),
+                }
+                for p1, p2 in zip(players[::2], players[1::2])
+            ]
+        )
+    return {
+        "name": "Benchmark Open",
+        "dates": {"from": "01-01-2024", "to": "07-01-2024"},
+        "venue": "Benchmark Hall",
+        "number_of_rounds": TOURNAMENT_ROUNDS,
+        "current_round": None,
+        "completed": True,
+        "finished": True,
+        "players": players,
+        "rounds": rounds,
+    }
+
+
+def timed(func, repeat=5):
+    """Returns the best time (in ms) of several calls to func"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench(repository, clubs, tournament, chess_ids):
+    """
+    Fills the repository and times the reads. Returns a dict of timings (ms).
+    """
+    start = time.perf_counter()
+    for key, data in clubs.items():
+        repository.save_club(key, data)
+    repository.save_tournament(tournament)
+    results = {"write all": (time.perf_counter() - start) * 1000}
+
+    club_key = random.choice(list(clubs))
+    chess_id = random.choice(chess_ids)
+    results["club players"] = timed(lambda: repository.club_players(club_key))
+    results["find player"] = timed(lambda: repository.find_player(chess_id))
+    results["round 3 matches"] = timed(
+        lambda: repository.round_matches(tournament["name"], 3)
+    )
+    results["scan players"] = timed(
+        lambda: sum(1 for _ in repository.iter_players()), repeat=1
+    )
+    return results
+
+
+def main(sizes):
+    random.seed(0)
+    for size in sizes:
+        clubs = make_clubs(size)
+        chess_ids = [
+            p["chess_id"] for club in clubs.values() for p in club["players"]
+        ]
+        tournament = make_tournament(chess_ids)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            json_repository = JsonRepository(
+                os.path.join(tmpdir, "tournaments"),
+                os.path.join(tmpdir, "clubs"),
+            )
+            sqlite_repository = SqliteRepository(
+                os.path.join(tmpdir, "chess.sqlite3")
+            )
+            json_results = bench(json_repository, clubs, tournament, chess_ids)
+            sqlite_results = bench(
+                sqlite_repository, clubs, tournament, chess_ids
+            )
+            sqlite_repository.close()
+
+        print(f"\n{size} players ({len(clubs)} clubs)")
+        print(f"{'operation':<18}{'json (ms)':>12}{'sqlite (ms)':>14}")
+        for operation, json_ms in json_results.items():
+            sqlite_ms = sqlite_results[operation]
+            print(f"{operation:<18}{json_ms:>12.2f}{sqlite_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the JSON and SQLite storage backends."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 100000],
+        help="Numbers of players to generate",
+    )
+    args = parser.parse_args()
+    main(args.sizes)
@@ -0,0 +1,261 @@
+"""
+Times the main tournament operations on synthetic tournaments of N players x R
+rounds.
+
+For each size, the script plays a tournament with random results and times:
+- pairing: the pairing of all the rounds (start_first_round / advance_round)
+- results: the entry of all the results (Tournament.record_result)
+- standings: the ranking of the players with the tiebreaks (get_ranked_players,
+  cold cache)
+- to_dict / from_dict: the conversion from and to the JSON format
+- save / load all: DataManager.save_tournament and load_all_tournaments (fresh
+  DataManager)
+- report: the rendering of the tournament report (output discarded)
+
+Results are printed as a table and can be written as JSON (--output), to be
+compared with the results of another commit (--compare): the ratio to the
+previous time is then shown for each operation, and operations slower than
+--threshold are flagged.
+
+Usage (from the repository root):
+    python -m benchmarks.tournament_suite --sizes 64x7 --output results.json
+    python -m benchmarks.tournament_suite --sizes 64x7 --compare results.json
+"""
+import argparse
+import contextlib
+from datetime import datetime
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+
+from models.data_manager import DataManager
+from models.identity_map import PlayerIdentityMap
+from models.player import Player
+from models.tournament import Tournament
+from screens.tournaments.tournament_report import TournamentReportScreen
+
+RESULTS = ("p1", "p2", "draw")
+
+
+def parse_size(value):
+    """Parses a "NxR" size (players x rounds)"""
+    players, _, rounds = value.lower().partition("x")
+    try:
+        return int(players), int(rounds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected PLAYERSxROUNDS (e.g. 1000x9), got '{value}'"
+        )
+
+
+def make_tournament(players, rounds, rng):
+    """Creates a tournament with synthetic players (not played yet)"""
+    tournament = Tournament(
+        f"Benchmark {players}x{rounds}",
+        "Benchmark Hall",
+        datetime(2024, 1, 1),
+        datetime(2024, 1, 9),
+        rounds,
+    )
+    for number in range(players):
+        player = Player.unknown(f"BM{number:05d}")
+        player.elo_rating = rng.randint(1000, 2700)
+        tournament.add_player(player)
+    return tournament
+
+
+def play(tournament, rng):
+    """
+    Plays all the rounds with random results. Returns the pairing and result
+    entry times (s)
+    """
+    pairing = results = 0.0
+    start = time.perf_counter()
+    current = tournament.start_first_round(rng)
+    pairing += time.perf_counter() - start
+    while current:
+        winners = []
+        for match in current.matches:
+            outcome = rng.choice(RESULTS)
+            winners.append(
+                match.player1.player_id if outcome == "p1"
+                else match.player2.player_id if outcome == "p2" else "draw"
+            )
+        start = time.perf_counter()
+        for match, winner_id in zip(current.matches, winners):
+            tournament.record_result(match, winner_id)
+        results += time.perf_counter() - start
+
+        start = time.perf_counter()
+        current = tournament.advance_round(rng)
+        pairing += time.perf_counter() - start
+    return pairing, results
+
+
+def timed(func, repeat):
+    """
+    Returns the best time (s) of several calls to func, its output discarded
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(players, rounds, repeat, seed):
+    """Runs the benchmark for one size. Returns the times (s) by operation"""
+    rng = random.Random(seed)
+    tournament = make_tournament(players, rounds, rng)
+    pairing, results = play(tournament, rng)
+    timings = {"pairing": pairing, "results": results}
+
+    def standings():
+        # A new result invalidates the cached tiebreak table
+        tournament._results_version += 1
+        tournament.get_ranked_players()
+
+    timings["standings"] = timed(standings, repeat)
+    data = tournament.to_dict()
+    timings["to_dict"] = timed(tournament.to_dict, repeat)
+    timings["from_dict"] = timed(
+        lambda: Tournament.from_dict(data, PlayerIdentityMap()), repeat
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tournaments_dir = os.path.join(tmpdir, "tournaments")
+        clubs_dir = os.path.join(tmpdir, "clubs")
+        data_manager = DataManager(tournaments_dir, clubs_dir)
+        timings["save"] = timed(
+            lambda: data_manager.save_tournament(tournament), repeat
+        )
+        timings["load all"] = timed(
+            lambda: DataManager(
+                tournaments_dir, clubs_dir
+            ).load_all_tournaments(),
+            repeat,
+        )
+
+    timings["report"] = timed(
+        lambda: TournamentReportScreen.display_report(tournament), repeat
+    )
+    return timings
+
+
+def git_commit():
+    """Returns the current commit hash, or None outside of a git repository"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(sizes, repeat, seed, output, compare, threshold):
+    previous = {}
+    if compare:
+        with open(compare) as fp:
+            for entry in json.load(fp)["results"]:
+                key = (entry["players"], entry["rounds"], entry["operation"])
+                previous[key] = entry["seconds"]
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "repeat": repeat,
+        "results": [],
+    }
+    regressions = []
+    for players, rounds in sizes:
+        timings = bench(players, rounds, repeat, seed)
+        print(f"\n{players} players x {rounds} rounds")
+        print(
+            f"{'operation':<12}{'time (ms)':>12}"
+            + (f"{'previous':>12}{'ratio':>8}" if compare else "")
+        )
+        for operation, seconds in timings.items():
+            report["results"].append(
+                {
+                    "players": players,
+                    "rounds": rounds,
+                    "operation": operation,
+                    "seconds": seconds,
+                }
+            )
+            line = f"{operation:<12}{seconds * 1000:>12.2f}"
+            before = previous.get((players, rounds, operation))
+            if before:
+                ratio = seconds / before
+                line += f"{before * 1000:>12.2f}{ratio:>8.2f}"
+                if ratio > threshold:
+                    line += "  SLOWER"
+                    regressions.append(f"{players}x{rounds} {operation}")
+            print(line)
+
+    if output:
+        with open(output, "w") as fp:
+            json.dump(report, fp, indent=2)
+        print(f"\nResults written to {output}")
+    if regressions:
+        print(
+            f"\n{len(regressions)} operation(s) slower than {threshold}x: "
+            f"{', '.join(regressions)}"
+        )
+    return not regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the tournament operations on synthetic "
+        "tournaments."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=parse_size,
+        nargs="+",
+        default=[(64, 7), (1000, 9)],
+        help="Tournament sizes, as PLAYERSxROUNDS (even numbers of players)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Repetitions of each timing (the best one is kept)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--compare",
+        help="Compare with the results of a previous run (JSON file)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Ratio to the previous time above which an operation is flagged "
+        "as slower",
+    )
+    args = parser.parse_args()
+    ok = main(
+        args.sizes,
+        args.repeat,
+        args.seed,
+        args.output,
+        args.compare,
+        args.threshold,
+    )
+    raise SystemExit(0 if ok else 1)
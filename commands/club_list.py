@@ -8,5 +8,7 @@ class ClubListCmd(BaseCommand):
     """Command to get the list of clubs"""
 
     def execute(self):
-        cm = ClubManager()
+        # Only club names are displayed: players are loaded when a club is
+        # opened
+        cm = ClubManager(lazy=True)
         return Context("main-menu", clubs=cm.clubs)
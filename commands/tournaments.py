@@ -10,10 +10,17 @@ from screens.tournaments.register_player import RegisterPlayerScreen
 from screens.tournaments.advance_round import AdvanceRoundScreen
 from screens.tournaments.enter_results import EnterResultsScreen
 from screens.tournaments.tournament_report import TournamentReportScreen
+from screens.tournaments.outcome_probabilities import (
+    OutcomeProbabilitiesScreen,
+)
+from screens.tournaments.player_history import PlayerHistoryScreen
+from screens.tournaments.federation_stats import FederationStatsScreen
+from screens.tournaments.head_to_head import HeadToHeadScreen
 from screens.main_menu import MainMenu
 from models.tournament import Tournament
-from models.player import Player
 from models.data_manager import DataManager
+from models.simulation import simulate_outcomes
+from models.result_import import read_results
 
 class TournamentController:
     """Manages the overall tournament application flow."""
@@ -31,7 +38,12 @@ class TournamentController:
             elif choice == "2":
                 self.load_and_manage_tournament()
             elif choice == "3":
+                self.view_federation_stats()
+            elif choice == "4":
+                self.view_head_to_head()
+            elif choice == "5":
                 # Back to main application menu, handled by main.py
+                self.data_manager.checkpoint()
                 break
             else:
                 print("Invalid choice. Please try again.")
@@ -63,6 +75,22 @@ class TournamentController:
             else:
                 print("Selected tournament not found.")
 
+    def view_federation_stats(self):
+        """Displays the statistics of the players over all the tournaments."""
+        stats, ratings = self.data_manager.federation_stats()
+        FederationStatsScreen.display_stats(stats, ratings)
+
+    def view_head_to_head(self):
+        """
+        Displays the record of a player against another one, over all the
+        tournaments.
+        """
+        player_ids = HeadToHeadScreen.select_players()
+        if player_ids:
+            HeadToHeadScreen.display_record(
+                self.data_manager.head_to_head(*player_ids)
+            )
+
     def manage_current_tournament(self):
         """Enters the specific management interface for the current tournament."""
         if not self.current_tournament:
@@ -80,50 +108,102 @@ class TournamentController:
             elif choice == "4":
                 self._view_tournament_report()
             elif choice == "5":
+                self._simulate_outcomes()
+            elif choice == "6":
+                self._view_player_history()
+            elif choice == "7":
+                self._import_match_results()
+            elif choice == "8":
                 print(f"Exiting management for '{self.current_tournament.name}'.")
+                self.data_manager.checkpoint()
                 break
             else:
                 print("Invalid choice. Please try again.")
 
     def _register_players_to_tournament(self):
         """Handles player registration for the current tournament."""
-        # This would involve loading players from club data and letting user select
-        available_players = self.data_manager.load_all_players_from_clubs() # Need to implement this in DataManager
+        # Only the fields displayed by the screen are kept while scanning the
+        # clubs
+        registered_ids = set(self.current_tournament.players)
+        available_players = [
+            p
+            for p in self.data_manager.iter_players_from_clubs(
+                ["chess_id", "name", "elo_rating"]
+            )
+            if p['chess_id'] not in registered_ids
+        ]
         selected_player_ids = RegisterPlayerScreen.get_players_for_registration(
-            available_players, self.current_tournament.players
+            available_players, registered_ids
         )
 
-        for player_id in selected_player_ids:
-            # Find the full player data and create a Tournament Player object
-            player_data = next((p for p in available_players if p['player_id'] == player_id), None)
-            if player_data:
-                tournament_player = Player(
-                    player_data['player_id'],
-                    player_data['first_name'],
-                    player_data['last_name'],
-                    player_data['date_of_birth'],
-                    player_data['elo_rating']
-                )
-                self.current_tournament.add_player(tournament_player)
+        # Batch lookup of the full club records (through the chess ID registry)
+        # for the players not yet in the session's identity map
+        players = self.data_manager.identity_map.resolve(
+            selected_player_ids, placeholders=False
+        )
+        try:
+            for player in players.values():
+                self.current_tournament.add_player(player)
+        except ValueError as e:
+            print(f"Cannot register players: {e}")
         self.data_manager.save_tournament(self.current_tournament)
         print(f"Players registered. Current players: {len(self.current_tournament.players)}")
 
 
     def _start_or_advance_round(self):
         """Starts a new round or advances the current one."""
-        if not self.current_tournament.players or len(self.current_tournament.players) % 2 != 0:
-            print("Not enough or odd number of players to start a round.")
+        # An odd number of players is reported by the tournament (round robins
+        # give a bye instead)
+        if len(self.current_tournament.players) < 2:
+            print("Not enough players to start a round.")
             return
 
-        if self.current_tournament.current_round == 0:
-            print("Starting Round 1...")
-            self.current_tournament.start_first_round()
-        else:
-            print(f"Advancing to Round {self.current_tournament.current_round + 1}...")
-            self.current_tournament.advance_round()
+        if self.current_tournament.completed:
+            print("All the rounds of this tournament have been played.")
+            return
+
+        try:
+            if self.current_tournament.is_arena:
+                # In an arena, players are paired when their game is over: this
+                # opens or closes the pool
+                if not self.current_tournament.rounds:
+                    print("Opening the arena...")
+                    self.current_tournament.start_first_round()
+                    self._display_new_matches(
+                        self.current_tournament.ongoing_matches()
+                    )
+                else:
+                    self.current_tournament.advance_round()
+                    print("The arena is closed: no more games will be paired.")
+                self.data_manager.save_tournament(self.current_tournament)
+                return
+            if not self.current_tournament.rounds:
+                print("Starting Round 1...")
+                self.current_tournament.start_first_round()
+            else:
+                print(
+                    "Advancing to Round "
+                    f"{len(self.current_tournament.rounds) + 1}..."
+                )
+                if self.current_tournament.advance_round() is None:
+                    print(
+                        "The last round is over: the tournament is completed."
+                    )
+        except ValueError as e:
+            print(f"Cannot start the round: {e}")
+            return
 
         if self.current_tournament.rounds:
             AdvanceRoundScreen.display_round_matches(self.current_tournament.rounds[-1])
+            if (
+                self.current_tournament.is_round_robin
+                and not self.current_tournament.completed
+            ):
+                bye = self.current_tournament.schedule().bye(
+                    len(self.current_tournament.rounds) - 1
+                )
+                if bye:
+                    print(f"Bye: {self.current_tournament.roster[bye]}")
         self.data_manager.save_tournament(self.current_tournament)
 
 
@@ -133,23 +213,102 @@ class TournamentController:
             print("No rounds have been started yet.")
             return
 
-        current_round = self.current_tournament.rounds[-1]
-        results = EnterResultsScreen.get_match_results(current_round.matches)
-
-        for match_id, winner_id in results.items():
-            for match in current_round.matches:
-                if match.match_id == match_id:
-                    match.set_winner(winner_id)
-                    # Update player scores in tournament (handled by tournament.py logic)
-                    if winner_id == match.player1.player_id:
-                        match.player1.tournament_points += 1 # Or 0.5 for draw
-                    elif winner_id == match.player2.player_id:
-                        match.player2.tournament_points += 1
-                    break
+        # The games of the current round (in an arena, all the games in
+        # progress)
+        matches = (
+            self.current_tournament.ongoing_matches()
+            if self.current_tournament.is_arena
+            else self.current_tournament.rounds[-1].matches
+        )
+        results = EnterResultsScreen.get_match_results(matches)
+
+        self._record_results(
+            [
+                (self.current_tournament.get_match(match_id), winner_id)
+                for match_id, winner_id in results.items()
+            ]
+        )
+
+    def _import_match_results(self):
+        """
+        Imports the results of the current round from a CSV/TSV file (see
+        models.result_import).
+        """
+        path = EnterResultsScreen.get_results_file()
+        if not path:
+            return
+        try:
+            with open(path, newline="", encoding="utf-8-sig") as fp:
+                results = read_results(fp, self.current_tournament)
+        except (OSError, ValueError) as e:
+            print(f"Cannot import the results: {e}")
+            return
+        print(f"{len(results)} result(s) read from {path}.")
+        self._record_results(results)
+
+    def _record_results(self, results):
+        """
+        Records results (matches with their winner), then saves the tournament
+        once.
+        """
+        # Updates the player scores in the tournament (arena players are paired
+        # again)
+        self._display_new_matches(
+            self.current_tournament.record_results(results)
+        )
+        # Once the round is over, its results are applied to the Elo ratings
+        # (in one batch)
+        ratings = self.current_tournament.update_player_elos_based_on_results()
         self.data_manager.save_tournament(self.current_tournament)
         print("Match results updated.")
-        self.current_tournament.update_player_elos_based_on_results() # Hypothetical method
+        if ratings:
+            self.data_manager.save_player_ratings(ratings)
+            print(f"Elo ratings updated for {len(ratings)} players.")
+
+    @staticmethod
+    def _display_new_matches(matches):
+        """Displays the arena games that just started."""
+        for match in matches:
+            print(
+                f"New game {match.match_id}: {match.player1} vs "
+                f"{match.player2}"
+            )
+
+    def _simulate_outcomes(self):
+        """
+        Simulates the rest of the current tournament and displays the outcome
+        probabilities.
+        """
+        try:
+            result = simulate_outcomes(self.current_tournament)
+        except ValueError as e:
+            print(f"Cannot simulate the tournament: {e}")
+            return
+        OutcomeProbabilitiesScreen.display_probabilities(
+            self.current_tournament, result
+        )
+
+    def _view_player_history(self):
+        """Displays the games of a player of the current tournament."""
+        player_id = PlayerHistoryScreen.select_player(self.current_tournament)
+        if player_id:
+            PlayerHistoryScreen.display_history(
+                self.current_tournament, player_id
+            )
 
     def _view_tournament_report(self):
-        """Displays the tournament report."""
-        TournamentReportScreen.display_report(self.current_tournament)
+        """
+        Displays the tournament report, or writes it to a file, with the
+        options chosen by the user.
+        """
+        options = TournamentReportScreen.get_report_options(
+            self.current_tournament
+        )
+        if "path" in options:
+            TournamentReportScreen.export_report(
+                self.current_tournament, **options
+            )
+        else:
+            TournamentReportScreen.display_report(
+                self.current_tournament, **options
+            )
@@ -15,7 +15,9 @@ from screens.main_menu import MainMenu
 
 def run_application():
     """Main function to run the application."""
-    data_manager = DataManager()
+    # Tournament saves are coalesced and written at most every 5 seconds (and
+    # on exit)
+    data_manager = DataManager(write_behind=5.0)
     tournament_controller = TournamentController(data_manager)
 
     # Initialize managers for existing club/player functionality if needed
@@ -44,6 +46,7 @@ def run_application():
         elif choice == "3":
             tournament_controller.run()
         elif choice == "4":
+            data_manager.checkpoint()
             print("Exiting application. Goodbye!")
             break
         else:
@@ -51,4 +54,4 @@ def run_application():
 
 
 if __name__ == "__main__":
-    run_application()
\ No newline at end of file
+    run_application()
@@ -6,5 +6,19 @@ from .match import Match
 from .round import Round
 from .tournament import Tournament
 from .tournament_manager import TournamentManager
+from .repository import Repository, JsonRepository
+from .sqlite_repository import SqliteRepository
 
-__all__ = ["Player", "ChessClub", "ClubManager", "DataManager", "Match", "Round", "Tournament", "TournamentManager"]
+__all__ = [
+    "Player",
+    "ChessClub",
+    "ClubManager",
+    "DataManager",
+    "Match",
+    "Round",
+    "Tournament",
+    "TournamentManager",
+    "Repository",
+    "JsonRepository",
+    "SqliteRepository",
+]
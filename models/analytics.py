@@ -0,0 +1,374 @@
+"""
+Federation-wide statistics of the players, over all the tournament files of a
+directory.
+
+The statistics are computed map-reduce style:
+- map: each tournament file gives a partial aggregate, the PlayerStats of its
+  players (games, wins, draws, losses, games with white and black, games
+  against each opponent), read straight from the JSON data (no Tournament
+  objects)
+- reduce: the partials of all the files are merged by player
+
+The partials are cached in a hidden file next to the directory (e.g.
+data/.tournaments.analytics, see models.tournament_catalog.sidecar_path), keyed
+by file name with the mtime, size and SHA-256 hash of the file. A file is only
+read again if its mtime or size changed, and only aggregated again if its hash
+changed too. The files to aggregate (the map step) are spread over a process
+pool. The reduce step runs in the calling process: merging two partials is a
+few additions, cheaper than sending them to a worker process and back.
+
+The performance rating is computed when the statistics are read, from the
+current ratings of the opponents (the tournament files do not keep the ratings
+of the time), with the linear "rule of 400": average rating of the rated
+opponents + 400 x (wins - losses) / games.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .tournament_catalog import sidecar_path
+
+# Below this number of files to aggregate, the work is done in the calling
+# process
+PARALLEL_THRESHOLD = 8
+
+
+@dataclass
+class PlayerStats:
+    """
+    The results of a player over some tournaments (the games with a result
+    only).
+
+    Attributes:
+        games (int): The games played.
+        wins (int): The games won.
+        draws (int): The games drawn.
+        losses (int): The games lost.
+        white (int): The games played with white (first player of the match).
+        black (int): The games played with black.
+        opponents (Counter): The number of games against each opponent, by ID.
+    """
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    white: int = 0
+    black: int = 0
+    opponents: Counter = field(default_factory=Counter)
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws / 2
+
+    @property
+    def score_percentage(self) -> float:
+        """
+        The points scored, in percent of the games played (0 without games).
+        """
+        return 100 * self.points / self.games if self.games else 0.0
+
+    @property
+    def colour_balance(self) -> int:
+        """The games with white minus the games with black."""
+        return self.white - self.black
+
+    def performance(self, ratings: Mapping[str, int]) -> Optional[float]:
+        """
+        Returns the performance rating against the opponents with a known
+        rating, or None if no opponent is rated.
+        """
+        rated_games = total = 0
+        for opponent_id, count in self.opponents.items():
+            rating = ratings.get(opponent_id)
+            if rating is not None:
+                rated_games += count
+                total += count * rating
+        if not rated_games:
+            return None
+        return (
+            total / rated_games + 400 * (self.wins - self.losses) / self.games
+        )
+
+    def merge(self, other: "PlayerStats"):
+        """Adds the results of other to these statistics."""
+        self.games += other.games
+        self.wins += other.wins
+        self.draws += other.draws
+        self.losses += other.losses
+        self.white += other.white
+        self.black += other.black
+        self.opponents.update(other.opponents)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "white": self.white,
+            "black": self.black,
+            "opponents": dict(self.opponents),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlayerStats":
+        return cls(**dict(data, opponents=Counter(data.get("opponents", {}))))
+
+
+def tournament_stats(data: Dict[str, Any]) -> Dict[str, PlayerStats]:
+    """
+    Aggregates the results of a tournament (in the JSON format of
+    Tournament.to_dict) by player.
+
+    Returns:
+        Dict[str, PlayerStats]: The statistics of the players with at least one
+            result, by ID.
+    """
+    stats: Dict[str, PlayerStats] = {}
+    for matches in data.get("rounds", []):
+        for match in matches:
+            if not match.get("completed"):
+                continue
+            white_id, black_id = match["players"]
+            winner = match.get("winner")
+            white = stats.get(white_id) or stats.setdefault(
+                white_id, PlayerStats()
+            )
+            black = stats.get(black_id) or stats.setdefault(
+                black_id, PlayerStats()
+            )
+            for player, opponent_id in ((white, black_id), (black, white_id)):
+                player.games += 1
+                player.opponents[opponent_id] += 1
+            white.white += 1
+            black.black += 1
+            if winner is None:
+                white.draws += 1
+                black.draws += 1
+            elif winner == white_id:
+                white.wins += 1
+                black.losses += 1
+            else:
+                black.wins += 1
+                white.losses += 1
+    return stats
+
+
+def _file_partial(
+    path: str, known_hash: Optional[str]
+) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Map step (in a worker process): hashes a tournament file and aggregates it,
+    unless its hash is known_hash (the file was touched but not changed).
+
+    Returns:
+        Tuple[str, Optional[Dict[str, Any]]]: The hash of the file, and the
+            partial aggregate
+        (PlayerStats as dictionaries, by player ID), None if the hash did not
+        change.
+    """
+    with open(path, "rb") as fp:
+        content = fp.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == known_hash:
+        return digest, None
+    stats = tournament_stats(json.loads(content))
+    return digest, {
+        player_id: player_stats.to_dict()
+        for player_id, player_stats in stats.items()
+    }
+
+
+def _safe_partial(
+    path: str, known_hash: Optional[str]
+) -> Optional[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    _file_partial, returning None (after a warning) for a file that cannot be
+    read or decoded.
+    """
+    try:
+        return _file_partial(path, known_hash)
+    except OSError as e:
+        print(
+            f"An unexpected error occurred reading tournament from {path}: {e}"
+        )
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        print(f"Warning: Could not decode JSON from {path}. Skipping file.")
+    except (KeyError, TypeError, ValueError) as e:
+        print(
+            f"Warning: Invalid tournament data in {path} ({e}). Skipping file."
+        )
+    return None
+
+
+class TournamentAnalytics:
+    """
+    The cached partial aggregates of the tournament files of a directory.
+
+    The cache is persisted in a hidden file next to the directory, and
+    reconciled with the files by refresh().
+    """
+
+    CACHE_SUFFIX = ".analytics"
+    CACHE_VERSION = 1
+
+    def __init__(self, storage_directory: str):
+        """
+        Args:
+            storage_directory (str): The directory holding the tournament JSON
+                files.
+        """
+        self.storage_directory = storage_directory
+        self.cache_path = sidecar_path(storage_directory, self.CACHE_SUFFIX)
+        # filename -> {"mtime_ns", "size", "hash", "stats": {player ID:
+        # PlayerStats dict}}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load_cache()
+
+    def _load_cache(self):
+        """
+        Loads the persisted partials. A missing or unreadable cache is simply
+        rebuilt.
+        """
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if (
+            isinstance(data, dict)
+            and data.get("version") == self.CACHE_VERSION
+        ):
+            self._entries = data.get("entries", {})
+
+    def _save_cache(self):
+        """
+        Writes the partials to disk (temp file + rename, so the cache is never
+        left half-written).
+        """
+        temp_path = self.cache_path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": self.CACHE_VERSION, "entries": self._entries},
+                    f,
+                )
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(
+                f"Warning: Could not write analytics cache {self.cache_path}: "
+                f"{e}"
+            )
+
+    def refresh(self, workers: Optional[int] = None) -> List[str]:
+        """
+        Reconciles the cached partials with the tournament files: new files and
+        files whose mtime or size changed are hashed, and aggregated again if
+        their content changed. Entries of deleted files are dropped.
+
+        Args:
+            workers (int, optional): The number of worker processes. Defaults
+                to the number of CPUs; 1 (or only a few files to read) works in
+                the calling process.
+
+        Returns:
+            List[str]: The names of the files aggregated again.
+        """
+        stale: Dict[str, os.stat_result] = {}
+        present = set()
+        if os.path.isdir(self.storage_directory):
+            with os.scandir(self.storage_directory) as it:
+                for dir_entry in it:
+                    if (
+                        not dir_entry.name.endswith(".json")
+                        or not dir_entry.is_file()
+                    ):
+                        continue
+                    present.add(dir_entry.name)
+                    stat = dir_entry.stat()
+                    entry = self._entries.get(dir_entry.name)
+                    if (
+                        entry is None
+                        or entry["mtime_ns"] != stat.st_mtime_ns
+                        or entry["size"] != stat.st_size
+                    ):
+                        stale[dir_entry.name] = stat
+
+        changed = not present.issuperset(self._entries)
+        self._entries = {
+            filename: entry
+            for filename, entry in self._entries.items()
+            if filename in present
+        }
+        if not stale and not changed:
+            return []
+
+        filenames = sorted(stale)
+        args = [
+            (
+                os.path.join(self.storage_directory, filename),
+                self._entries.get(filename, {}).get("hash"),
+            )
+            for filename in filenames
+        ]
+        workers = max(1, min(workers or os.cpu_count() or 1, len(args)))
+        if workers == 1 or len(args) < PARALLEL_THRESHOLD:
+            outputs = [_safe_partial(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                outputs = list(
+                    executor.map(
+                        _safe_partial,
+                        *zip(*args),
+                        chunksize=max(1, len(args) // (4 * workers)),
+                    )
+                )
+
+        aggregated = []
+        for filename, output in zip(filenames, outputs):
+            stat = stale[filename]
+            if output is None:
+                self._entries.pop(filename, None)
+                continue
+            digest, stats = output
+            entry = self._entries.get(filename)
+            if stats is None and entry is not None:
+                # Touched but not changed: the partial is kept
+                entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+                continue
+            self._entries[filename] = {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "hash": digest,
+                "stats": stats,
+            }
+            aggregated.append(filename)
+        self._save_cache()
+        return aggregated
+
+    def player_stats(
+        self, workers: Optional[int] = None
+    ) -> Dict[str, PlayerStats]:
+        """
+        Returns the statistics of all the players over all the tournament files
+        (reduce step, in the calling process), after a refresh of the partials.
+
+        Args:
+            workers (int, optional): The number of worker processes of the
+                refresh (see refresh).
+        """
+        self.refresh(workers)
+        totals: Dict[str, PlayerStats] = {}
+        for entry in self._entries.values():
+            for player_id, data in entry["stats"].items():
+                partial = PlayerStats.from_dict(data)
+                total = totals.get(player_id)
+                if total is None:
+                    totals[player_id] = partial
+                else:
+                    total.merge(partial)
+        return totals
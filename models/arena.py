@@ -0,0 +1,219 @@
+"""
+Pairing pool of the "arena" tournaments: players are paired again as soon as
+their game is over.
+
+A player who finishes a game joins the waiting pool and is paired at once with
+the waiting player that costs least, if any:
+- cost = SCORE_WEIGHT x points difference (in half points) + rating difference
+  / RATING_SCALE + REMATCH_PENALTY if they already played each other -
+  WAIT_BONUS x seconds waited
+- the last opponent of a player is never chosen again right away
+
+The pool is a priority queue in two parts:
+- the waiting players of each score (in half points), sorted by rating: the
+  closest ratings are found by binary search, in the score groups next to the
+  player's
+- a heap of the waiting players by arrival time, so that the longest waiting
+  player is always considered, whatever its score and rating
+When none of these candidates can be paired (e.g. they all just played the
+player), the search widens to every waiting player, score group by score group,
+closest scores first.
+
+Joining the pool costs O(log n) comparisons plus a bounded number of
+candidates: with thousands of waiting players, a pairing takes well under a
+millisecond.
+"""
+from bisect import bisect_left, insort
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
+
+# Name of the arena pairing mode (see Tournament.pairing)
+ARENA = "arena"
+
+SCORE_WEIGHT = 1.0
+RATING_SCALE = 100.0  # rating points worth one half point of score difference
+REMATCH_PENALTY = 4.0
+WAIT_BONUS = 0.05  # per second waited
+# Score groups searched on each side of the player's score (in half points)
+MAX_SCORE_GAP = 4
+# Candidates taken on each side of the player's rating, in each score group
+CANDIDATES = 4
+
+
+class ArenaPool:
+    """
+    The players waiting for a game in an arena tournament.
+
+    Attributes:
+        opponents (Mapping[str, Set[str]]): The players each player already
+            played (shared with the tournament).
+        last_opponent (Dict[str, str]): The last opponent of each player.
+    """
+
+    def __init__(
+        self,
+        opponents: Mapping[str, Set[str]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            opponents (Mapping[str, Set[str]]): The players each player already
+                played, by ID.
+            clock (Callable[[], float], optional): The clock measuring the
+                waiting times (seconds).
+        """
+        self.opponents = opponents
+        self.last_opponent: Dict[str, str] = {}
+        self.clock = clock
+        # half points -> [(rating, arrival number, player ID)], sorted
+        self._groups: Dict[int, List[Tuple[float, int, str]]] = {}
+        # player ID -> (half points, rating, arrival time, arrival number)
+        self._waiting: Dict[str, Tuple[int, float, float, int]] = {}
+        # (arrival number, player ID) of the waiting players (and of players
+        # already gone, skipped lazily)
+        self._queue: List[Tuple[int, str]] = []
+        self._arrivals = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._waiting
+
+    def waiting(self) -> List[str]:
+        """Returns the waiting players, longest waiting first."""
+        return sorted(
+            self._waiting, key=lambda player_id: self._waiting[player_id][3]
+        )
+
+    def _cost(
+        self,
+        player_id: str,
+        half_points: int,
+        rating: float,
+        now: float,
+        candidate: str,
+    ) -> Optional[float]:
+        """
+        Returns the cost of pairing a player with a waiting candidate, or None
+        if they cannot be paired.
+        """
+        if (
+            self.last_opponent.get(player_id) == candidate
+            or self.last_opponent.get(candidate) == player_id
+        ):
+            return None
+        waiting = self._waiting[candidate]
+        candidate_points, candidate_rating, joined, _ = waiting
+        cost = (
+            SCORE_WEIGHT * abs(half_points - candidate_points)
+            + abs(rating - candidate_rating) / RATING_SCALE
+        )
+        if candidate in self.opponents.get(player_id, ()):
+            cost += REMATCH_PENALTY
+        return cost - WAIT_BONUS * (now - joined)
+
+    def _candidates(self, half_points: int, rating: float):
+        """
+        Yields the waiting players close to a score and rating, and the longest
+        waiting player.
+        """
+        for score in range(
+            half_points - MAX_SCORE_GAP, half_points + MAX_SCORE_GAP + 1
+        ):
+            group = self._groups.get(score)
+            if group:
+                position = bisect_left(group, (rating,))
+                start = max(0, position - CANDIDATES)
+                for _, _, player_id in group[start:position + CANDIDATES]:
+                    yield player_id
+        while (
+            self._queue
+            and self._waiting.get(self._queue[0][1], (None,) * 4)[3]
+            != self._queue[0][0]
+        ):
+            heapq.heappop(self._queue)  # player paired since
+        if self._queue:
+            yield self._queue[0][1]
+
+    def _widened_candidates(self, half_points: int):
+        """
+        Yields the waiting players of each score group (as lists), closest
+        scores first.
+        """
+        for score in sorted(
+            self._groups, key=lambda score: abs(score - half_points)
+        ):
+            yield [player_id for _, _, player_id in self._groups[score]]
+
+    def join(
+        self, player_id: str, half_points: int, rating: float
+    ) -> Optional[str]:
+        """
+        Makes a player available: pairs the player with the best waiting
+        opponent, or adds the player to the pool if no opponent is available.
+
+        Args:
+            player_id (str): The ID of the player.
+            half_points (int): The tournament points of the player, in half
+                points.
+            rating (float): The Elo rating of the player.
+
+        Returns:
+            Optional[str]: The ID of the opponent (who leaves the pool), or
+                None if the player waits.
+        """
+        if player_id in self._waiting:
+            return None
+        now = self.clock()
+        best, best_cost = None, None
+        for candidate in self._candidates(half_points, rating):
+            cost = self._cost(player_id, half_points, rating, now, candidate)
+            if cost is not None and (best_cost is None or cost < best_cost):
+                best, best_cost = candidate, cost
+        if best is None:
+            # Rare: the whole pool is searched, stopping at the first score
+            # group with a possible opponent
+            for group in self._widened_candidates(half_points):
+                for candidate in group:
+                    cost = self._cost(
+                        player_id, half_points, rating, now, candidate
+                    )
+                    if cost is not None and (
+                        best_cost is None or cost < best_cost
+                    ):
+                        best, best_cost = candidate, cost
+                if best is not None:
+                    break
+
+        if best is None:
+            arrival = next(self._arrivals)
+            self._waiting[player_id] = (half_points, rating, now, arrival)
+            insort(
+                self._groups.setdefault(half_points, []),
+                (rating, arrival, player_id),
+            )
+            heapq.heappush(self._queue, (arrival, player_id))
+            return None
+
+        self.leave(best)
+        self.last_opponent[player_id] = best
+        self.last_opponent[best] = player_id
+        return best
+
+    def leave(self, player_id: str) -> bool:
+        """
+        Removes a player from the pool (its heap entry is dropped lazily).
+        Returns False if not waiting.
+        """
+        entry = self._waiting.pop(player_id, None)
+        if entry is None:
+            return False
+        half_points, rating, _, arrival = entry
+        group = self._groups[half_points]
+        del group[bisect_left(group, (rating, arrival, player_id))]
+        if not group:
+            del self._groups[half_points]
+        return True
@@ -0,0 +1,291 @@
+"""
+Clinch and elimination analysis: has a player mathematically clinched a place
+in the top N, or can the player still reach it?
+
+The answers are exact over all the possible results of the remaining games:
+- games already paired (the current round, and the whole schedule of a round
+  robin) are searched result by result
+- rounds not paired yet (Swiss tournaments) can pair anybody with anybody
+  (rematches are not excluded): their results are accounted for with a closed
+  formula, see below
+
+Points are counted in half points. To decide whether X has clinched the top N,
+X loses all its remaining games, and the search looks for results where at
+least N other players finish with X's points or more (ties are counted against
+X). To decide whether X can still reach the top N, X wins all its games, and
+the search looks for results where fewer than N players finish ahead of X (ties
+may go either way, depending on the tiebreaks).
+
+Pruning:
+- a player whose outcome is decided (already ahead of X's target, or too far
+  behind to reach it) is never branched on: the results of his games that
+  favour the search are taken directly
+- search states with the same points for the same players (players without
+  games left being interchangeable) are only searched once (memoization)
+- the search stops at the first set of results answering the question
+
+Rounds not paired yet: with R such rounds, in each round any player can meet
+anybody. To get as many players as possible to a target, the players closest to
+it are chosen; the others lose all their games ("donors"). The q chosen players
+can all reach their targets if each needs at most 2R half points, and their
+needs add up to at most R x (q + k) half points, where k is the number of
+donors they can face in a round. Keeping as many players as possible under a
+target works the same way, with the players furthest from it. (A round gives 2
+half points per game; the totals can be spread over the rounds with at most 2
+per player and per round.)
+"""
+from bisect import bisect_left
+from typing import Dict, List, Sequence, Tuple
+
+
+def _donor_games(donors: int, players: int) -> int:
+    """
+    The number of players that can face a donor in a round (the other donors
+    play each other).
+    """
+    k = min(donors, players)
+    return k if (donors - k) % 2 == 0 else k - 1
+
+
+def max_reaching(needs: Sequence[int], field: int, rounds: int) -> int:
+    """
+    Returns the largest number of players that can reach their targets with
+    `rounds` free rounds.
+
+    Args:
+        needs (Sequence[int]): The half points each player needs (0 or less:
+            target already reached).
+        field (int): The number of players paired in each round (all of them,
+            even).
+        rounds (int): The number of rounds not paired yet.
+    """
+    reached = sum(1 for need in needs if need <= 0)
+    candidates = sorted(need for need in needs if 0 < need <= 2 * rounds)
+    best = total = 0
+    for count, need in enumerate(candidates, 1):
+        total += need
+        if total <= rounds * (count + _donor_games(field - count, count)):
+            best = count
+    return reached + best
+
+
+def min_exceeding(slacks: Sequence[int], field: int, rounds: int) -> int:
+    """
+    Returns the smallest number of players that end above their thresholds
+    after `rounds` free rounds.
+
+    Args:
+        slacks (Sequence[int]): The half points each player can still score
+            without exceeding its threshold (negative: threshold already
+            exceeded).
+        field (int): The number of players paired in each round (all of them,
+            even).
+        rounds (int): The number of rounds not paired yet.
+    """
+    capacities = sorted(
+        (min(slack, 2 * rounds) for slack in slacks if slack >= 0),
+        reverse=True,
+    )
+    kept = total = 0
+    for count, capacity in enumerate(capacities, 1):
+        total += capacity
+        # Players facing a donor (who wins) score nothing; the others score 1
+        # on average
+        if total >= rounds * (count - _donor_games(field - count, count)):
+            kept = count
+    return len(slacks) - kept
+
+
+class ClinchAnalysis:
+    """
+    The remaining games of a tournament, and the clinch / elimination questions
+    about them.
+
+    Attributes:
+        points (Dict[str, int]): The points of the players, in half points.
+        games (List[Tuple[str, str]]): The games paired but not played yet.
+        free_rounds (int): The rounds not paired yet.
+        field (int): The number of players paired in each free round.
+    """
+
+    def __init__(self, tournament):
+        """
+        Args:
+            tournament (Tournament): The tournament (its current state is
+                copied).
+
+        Raises:
+            ValueError: For an arena (its games are not played in rounds).
+        """
+        if tournament.is_arena:
+            raise ValueError(
+                "An arena has no fixed number of games left to analyse."
+            )
+        self.points: Dict[str, int] = {
+            player_id: round(2 * tournament.points.get(player_id, 0.0))
+            for player_id in tournament.players
+        }
+        self.games: List[Tuple[str, str]] = []
+        self.free_rounds = 0
+        self.field = len(tournament.players)
+        if tournament.completed:
+            return
+
+        self.games = [
+            (match.player1.player_id, match.player2.player_id)
+            for match in tournament.ongoing_matches()
+        ]
+        if tournament.is_round_robin:
+            schedule = tournament.schedule()
+            for number in range(len(tournament.rounds), len(schedule)):
+                self.games += schedule[number]
+        else:
+            self.free_rounds = max(
+                0, tournament.num_rounds - len(tournament.rounds)
+            )
+        for player1_id, player2_id in self.games:
+            self.points.setdefault(player1_id, 0)
+            self.points.setdefault(player2_id, 0)
+
+    def has_clinched(self, player_id: str, places: int = 1) -> bool:
+        """
+        True if the player finishes in the top `places` whatever the remaining
+        results and tiebreaks.
+        """
+        return not self._search(player_id, places, clinch=True)
+
+    def can_reach(self, player_id: str, places: int = 1) -> bool:
+        """
+        True if some remaining results (and tiebreaks) put the player in the
+        top `places`.
+        """
+        return self._search(player_id, places, clinch=False)
+
+    def _search(self, player_id: str, places: int, clinch: bool) -> bool:
+        """
+        Clinch: searches results where `places` other players finish with the
+        player's points or more, the player losing all its games. Otherwise:
+        searches results where fewer than `places` other players finish ahead
+        of the player, the player winning all its games.
+        """
+        points = dict(self.points)
+        games = []
+        for game in self.games:
+            if player_id in game:
+                opponent = game[1] if game[0] == player_id else game[0]
+                points[opponent if clinch else player_id] += 2
+            else:
+                games.append(game)
+        free = 2 * self.free_rounds
+        target = points[player_id] if clinch else points[player_id] + free
+
+        # Indexes of the games of each player, to count the games left from a
+        # search depth on
+        indexes: Dict[str, List[int]] = {}
+        for index, game in enumerate(games):
+            for other in game:
+                indexes.setdefault(other, []).append(index)
+
+        def games_left(other: str, index: int) -> int:
+            other_indexes = indexes.get(other, ())
+            return len(other_indexes) - bisect_left(other_indexes, index)
+
+        def decided(other: str, index: int) -> bool:
+            """
+            True if the player's final position relative to the target no
+            longer depends on the results.
+            """
+            best = points[other] + 2 * games_left(other, index) + free
+            if clinch:
+                return points[other] >= target or best < target
+            return points[other] > target or best <= target
+
+        others = [other for other in points if other != player_id]
+        # Players that can never reach (clinch) or pass (otherwise) the target
+        # only matter as a count
+        relevant = [
+            other
+            for other in others
+            if not decided(other, 0) or points[other] >= target + (not clinch)
+        ]
+        unreachable = len(others) - len(relevant)
+        memo: Dict[tuple, bool] = {}
+
+        def search(index: int) -> bool:
+            if index == len(games):
+                if clinch:
+                    needs = [target - points[other] for other in relevant]
+                    return (
+                        max_reaching(needs, self.field, self.free_rounds)
+                        >= places
+                    )
+                slacks = [target - points[other] for other in relevant]
+                slacks += [free] * unreachable
+                return (
+                    min_exceeding(slacks, self.field, self.free_rounds)
+                    < places
+                )
+
+            # Bounds: the players already out of reach of the search end it
+            if clinch:
+                possible = sum(
+                    1
+                    for other in relevant
+                    if points[other] + 2 * games_left(other, index) + free
+                    >= target
+                )
+                if possible < places:
+                    return False
+            elif (
+                sum(1 for other in relevant if points[other] > target)
+                >= places
+            ):
+                return False
+
+            # Players without games left are interchangeable: only their points
+            # matter
+            playing = tuple(
+                points[other] for other in relevant if games_left(other, index)
+            )
+            idle = tuple(
+                sorted(
+                    points[other]
+                    for other in relevant
+                    if not games_left(other, index)
+                )
+            )
+            key = (index, playing, idle)
+            if key in memo:
+                return memo[key]
+
+            player1, player2 = games[index]
+            decided1 = decided(player1, index)
+            decided2 = decided(player2, index)
+            if clinch:
+                # A decided player loses: the other one gets the most points
+                outcomes = (
+                    [(2, 0)]
+                    if decided2
+                    else [(0, 2)] if decided1 else [(2, 0), (1, 1), (0, 2)]
+                )
+            else:
+                # A decided player wins: the other one gets no points
+                outcomes = (
+                    [(2, 0)]
+                    if decided1
+                    else [(0, 2)] if decided2 else [(2, 0), (1, 1), (0, 2)]
+                )
+
+            found = False
+            for gain1, gain2 in outcomes:
+                points[player1] += gain1
+                points[player2] += gain2
+                found = search(index + 1)
+                points[player1] -= gain1
+                points[player2] -= gain2
+                if found:
+                    break
+            memo[key] = found
+            return found
+
+        return search(0)
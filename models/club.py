@@ -1,6 +1,33 @@
 import json
+import os
+import threading
+from contextlib import nullcontext
+from pathlib import Path
 
-from .player import Player
+from .concurrency import FileLock, file_stamp, next_version
+from .json_stream import read_header
+from .player_old import Player
+
+
+def read_journal(journal_path, after_seq=0):
+    """
+    Yields the records of a club journal whose sequence number is greater than
+    after_seq
+    """
+
+    if not os.path.exists(journal_path):
+        return
+
+    with open(journal_path) as fp:
+        for line in fp:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn last line (the program stopped while appending): ignore
+                # it
+                return
+            if record["seq"] > after_seq:
+                yield record
 
 
 class ChessClub:
@@ -9,45 +36,444 @@ class ChessClub:
 
     Data is loaded from a JSON file (provided as argument).
     The class creates Player instances based on JSON data.
+
+    In lazy mode, only the header of the JSON file (name, player count) is read
+    when the club is created: the players are loaded on first access to the
+    `players` attribute.
+
+    In journaled mode, creating or updating a player does not rewrite the JSON
+    file: a small record is appended to a per-club journal file instead (next
+    to the JSON file, with a .journal suffix). Loading replays the journal over
+    the last snapshot, and once the journal grows past a threshold it is folded
+    into a fresh snapshot by a background thread. Clubs in plain mode also
+    replay an existing journal when loading, and their saves delete it (the
+    snapshot then holds the full state of the club).
+
+    Several programs can share the club files: changes are made under a file
+    lock, after reloading the club if its files changed (stat check, see
+    refresh). The JSON file stores a version number, and save() raises
+    ConflictError rather than overwrite a newer version.
     """
 
-    def __init__(self, filepath=None, name=None):
+    JOURNAL_SUFFIX = ".journal"
+    # Journal size (bytes) triggering a compaction
+    COMPACTION_THRESHOLD = 256 * 1024
+
+    def __init__(
+        self,
+        filepath=None,
+        name=None,
+        journaled=False,
+        compaction_threshold=None,
+        repository=None,
+        key=None,
+        lazy=False,
+        registry=None,
+    ):
         """The constructor works in two ways:
         - if the filepath is provided, it loads data from JSON
         - if it is not but a name is provided, it creates a new club (and a new JSON file)
+
+        When a repository (see models.repository) and a club key are provided,
+        they replace the JSON file: data is loaded from and saved to the
+        repository. Lazy mode (see above) only applies to clubs loaded from a
+        JSON file. If a PlayerRegistry is provided, it is notified of the saves
+        of the JSON file.
         """
 
         self.name = name
         self.filepath = filepath
         self.players = []
+        self._header = {}
+        self.repository = repository
+        self.key = key
+        self.registry = registry
+
+        self.journaled = journaled
+        self.compaction_threshold = (
+            compaction_threshold or self.COMPACTION_THRESHOLD
+        )
+        # Sequence number of the last journal record, and of the last one
+        # folded in a snapshot
+        self._journal_seq = 0
+        self._snapshot_seq = 0
+        self._journal_size = 0
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._compactor = None
+        self.version = 0
+        # Stats of the JSON file and of the journal when last read or written
+        self._stamp = None
+        self._file_lock = None
 
-        if filepath and not name:
-            # Load data from the JSON file
-            with open(filepath) as fp:
-                data = json.load(fp)
-                self.name = data["name"]
-                self.players = [
-                    Player(**player_dict) for player_dict in data["players"]
-                ]
+        if repository and not name:
+            # Load data from the repository
+            data = repository.load_club(key)
+            self.name = data["name"]
+            self.version = data.get("version", 0)
+            self.players = [
+                Player(**player_dict) for player_dict in data["players"]
+            ]
+        elif filepath and not name:
+            if lazy:
+                self._load_header()
+            else:
+                self._load()
         elif not filepath:
             # We did not have a file, so we are going to create it by running the save method
             self.save()
 
+    @property
+    def players(self):
+        """The players of the club (loaded on first access in lazy mode)"""
+
+        if self._players is None:
+            self._load()
+        return self._players
+
+    @players.setter
+    def players(self, value):
+        self._players = value
+
+    @property
+    def player_count(self):
+        """
+        The number of players, taken from the file header if the players are
+        not loaded yet
+        """
+
+        if self._players is None and "player_count" in self._header:
+            count = self._header["player_count"]
+            # Journal records past the end of the snapshot are new players
+            for record in read_journal(
+                self.journal_path, self._header.get("journal_seq", 0)
+            ):
+                count = max(count, record["index"] + 1)
+            return count
+        return len(self.players)
+
+    def _load(self):
+        """Loads data from the JSON file"""
+
+        # Stats taken before reading: a change made while reading is seen by
+        # the next refresh
+        self._stamp = self._file_stamp()
+        with open(self.filepath) as fp:
+            data = json.load(fp)
+            self.name = data["name"]
+            self.version = data.get("version", 0)
+            self.players = [
+                Player(**player_dict) for player_dict in data["players"]
+            ]
+        # Even in plain mode: a journaled program may have left records not
+        # folded in the snapshot yet
+        self._snapshot_seq = self._journal_seq = data.get("journal_seq", 0)
+        self._replay_journal()
+
+    def _load_header(self):
+        """
+        Reads the data preceding the players in the JSON file, leaving the
+        players to be loaded later
+        """
+
+        with open(self.filepath) as fp:
+            self._header = read_header(fp, "players")
+        if "name" not in self._header:
+            # The name is stored after the players: no way around a full load
+            self._load()
+            return
+        self.name = self._header["name"]
+        self.version = self._header.get("version", 0)
+        self.players = None
+
+    def _file_stamp(self):
+        return file_stamp(self.filepath), file_stamp(self.journal_path)
+
+    @property
+    def file_lock(self):
+        """
+        The lock serializing the changes to the club files between programs
+        """
+
+        if self._file_lock is None:
+            self._file_lock = FileLock(self.filepath)
+        return self._file_lock
+
+    def _exclusive(self):
+        """
+        Context manager holding the file lock (clubs stored in a repository
+        rely on the repository)
+        """
+
+        return nullcontext() if self.repository else self.file_lock
+
+    def refresh(self):
+        """Reloads the club if another program changed its files since read.
+
+        Returns True if it did. Only the files' stats are compared, so an
+        unchanged club costs two os.stat calls.
+        """
+
+        if self.repository or self._players is None:
+            return False
+        stamp = self._file_stamp()
+        if stamp == self._stamp:
+            return False
+        if self.journaled and self._stamp and stamp[0] == self._stamp[0]:
+            # Only the journal changed: apply its new records
+            self._stamp = stamp
+            self._replay_journal()
+        else:
+            self._load()
+        return True
+
+    def _read_stored_header(self):
+        """
+        Returns the data preceding the players in the JSON file (version,
+        journal_seq...), None without file
+        """
+
+        try:
+            with open(self.filepath) as fp:
+                return read_header(fp, "players")
+        except FileNotFoundError:
+            return None
+
+    def __getstate__(self):
+        """
+        Locks and threads cannot be pickled (needed to load clubs in worker
+        processes)
+        """
+
+        state = self.__dict__.copy()
+        del (
+            state["_lock"],
+            state["_snapshot_lock"],
+            state["_compactor"],
+            state["_file_lock"],
+        )
+        # The registry is shared by the clubs of the parent process
+        state["registry"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._compactor = None
+        self._file_lock = None
+
+    @property
+    def journal_path(self):
+        return Path(self.filepath).with_suffix(self.JOURNAL_SUFFIX)
+
+    def _replay_journal(self):
+        """
+        Applies the journal records that are more recent than the snapshot
+        """
+
+        for record in read_journal(self.journal_path, self._journal_seq):
+            player = Player(**record["player"])
+            if record["index"] < len(self.players):
+                self.players[record["index"]] = player
+            else:
+                self.players.append(player)
+            self._journal_seq = record["seq"]
+
+        if self.journal_path.exists():
+            self._journal_size = self.journal_path.stat().st_size
+
+    def _append_journal(self, index, player):
+        """Appends the new state of the player at the given index to the journal
+
+        Must be called with the file lock held, after a refresh: sequence
+        numbers then keep increasing across all the programs appending to the
+        journal.
+        """
+
+        with self._lock:
+            self._journal_seq += 1
+            record = {
+                "seq": self._journal_seq,
+                "index": index,
+                "player": player.serialize(),
+            }
+            line = json.dumps(record) + "\n"
+            with open(self.journal_path, "a") as fp:
+                fp.write(line)
+            self._journal_size += len(line)
+            self._stamp = self._file_stamp()
+            needs_compaction = self._journal_size > self.compaction_threshold
+
+        if needs_compaction:
+            self.compact(background=True)
+
+    def _snapshot(self):
+        """Returns the JSON data of the club"""
+
+        data = {
+            "name": self.name,
+            "version": self.version,
+            "player_count": len(self.players),
+        }
+        if self.journaled:
+            # Written before the players, so that streaming readers know it
+            # before the first player
+            data["journal_seq"] = self._journal_seq
+        data["players"] = [p.serialize() for p in self.players]
+        return data
+
+    def _write_snapshot(self, data):
+        """
+        Atomically replaces the JSON file, then drops the journal records it
+        now contains
+        """
+
+        with self._snapshot_lock, self.file_lock:
+            seq = data["journal_seq"]
+            stored = self._read_stored_header() or {}
+            if seq < self._snapshot_seq or seq < stored.get("journal_seq", 0):
+                # A more recent snapshot has already been written (by this
+                # program or another one)
+                return
+
+            # Journal sequence numbers are shared by all the programs, so the
+            # most recent snapshot wins, whatever its version
+            data["version"] = stored.get("version", 0) + 1
+            self._write_json(data)
+            self._snapshot_seq = seq
+
+            with self._lock:
+                self._trim_journal(seq)
+                self._stamp = self._file_stamp()
+
+    def _write_json(self, data):
+        """Atomically replaces the JSON file"""
+
+        temp_path = Path(self.filepath).with_suffix(".tmp")
+        with open(temp_path, "w") as fp:
+            json.dump(data, fp)
+        os.replace(temp_path, self.filepath)
+        self.version = data["version"]
+
+    def _trim_journal(self, seq):
+        """
+        Keeps only the journal records appended after the snapshot with the
+        given sequence number
+        """
+
+        if not self.journal_path.exists():
+            return
+
+        with open(self.journal_path) as fp:
+            lines = [
+                line
+                for line in fp
+                if line.endswith("\n") and json.loads(line)["seq"] > seq
+            ]
+
+        temp_path = self.journal_path.with_suffix(".journal.tmp")
+        with open(temp_path, "w") as fp:
+            fp.writelines(lines)
+        os.replace(temp_path, self.journal_path)
+        self._journal_size = sum(len(line) for line in lines)
+
+    def compact(self, background=False):
+        """
+        Folds the journal into a fresh snapshot (optionally in a background
+        thread)
+        """
+
+        if self._compactor and self._compactor.is_alive():
+            if background:
+                # A compaction is already running
+                return
+            self._compactor.join()
+
+        with self._lock:
+            data = self._snapshot()
+
+        if background:
+            self._compactor = threading.Thread(
+                target=self._write_snapshot, args=(data,)
+            )
+            self._compactor.start()
+        else:
+            self._write_snapshot(data)
+
+    def wait_compaction(self):
+        """Blocks until a running background compaction is done"""
+
+        if self._compactor:
+            self._compactor.join()
+
     def save(self):
         """Serializes the players and saves the club info to the JSON file"""
 
-        with open(self.filepath, "w") as fp:
-            json.dump(
-                {"name": self.name, "players": [p.serialize() for p in self.players]},
-                fp,
-            )
+        if self.repository:
+            # Raises ConflictError if the repository keeps versions and the
+            # club was saved since it was loaded
+            self._saved(self.repository.save_club(self.key, self._snapshot()))
+            return
+
+        if self.journaled:
+            self.compact()
+        else:
+            with self.file_lock:
+                # Raises ConflictError if another program saved the club since
+                # it was loaded
+                self.version = next_version(
+                    self.name, self._read_stored_header(), self.version
+                )
+                try:
+                    self._write_json(self._snapshot())
+                except BaseException:
+                    self.version -= 1
+                    raise
+                # The snapshot holds the full state of the club: the journal
+                # would now be stale
+                if self.journal_path.exists():
+                    os.remove(self.journal_path)
+                    self._journal_seq = self._snapshot_seq = 0
+                    self._journal_size = 0
+                self._stamp = self._file_stamp()
+
+        if self.registry:
+            self.registry.club_saved(Path(self.filepath).stem)
+
+    def _saved(self, version):
+        """
+        Keeps the version returned by a repository save (None if the repository
+        does not keep versions)
+        """
+
+        if version is not None:
+            self.version = version
 
     def create_player(self, **kwargs):
         """Utility method to create a new player instance and add it to the club"""
 
         player = Player(**kwargs)
-        self.players.append(player)
-        self.save()
+        with self._exclusive():
+            # Players added by other programs come first
+            self.refresh()
+            self.players.append(player)
+            if self.repository:
+                self._saved(
+                    self.repository.save_player(
+                        self.key, len(self.players) - 1, player.serialize()
+                    )
+                )
+            elif self.journaled:
+                self._append_journal(len(self.players) - 1, player)
+                if self.registry:
+                    self.registry.player_saved(
+                        Path(self.filepath).stem,
+                        len(self.players) - 1,
+                        player.chess_id,
+                    )
+            else:
+                self.save()
         return player
 
     def update_player(self, player, **kwargs):
@@ -56,8 +482,57 @@ class ChessClub:
         if player not in self.players:
             raise RuntimeError(f"Player {player} not in club {self.name}!")
 
-        for key, value in kwargs.items():
-            setattr(player, key, value)
+        with self._exclusive():
+            index = next(
+                idx for idx, p in enumerate(self.players) if p is player
+            )
+            if self.refresh():
+                # Another program changed the club: start from its version of
+                # the player (the instance is kept, as the caller holds it)
+                player.__dict__.update(self.players[index].__dict__)
+                self.players[index] = player
+
+            previous_chess_id = player.chess_id
+            for key, value in kwargs.items():
+                setattr(player, key, value)
 
-        self.save()
+            if self.repository:
+                self._saved(
+                    self.repository.save_player(
+                        self.key, index, player.serialize()
+                    )
+                )
+            elif self.journaled:
+                self._append_journal(index, player)
+                if self.registry:
+                    self.registry.player_saved(
+                        Path(self.filepath).stem,
+                        index,
+                        player.chess_id,
+                        previous_chess_id,
+                    )
+            else:
+                self.save()
         return player
+
+    def update_ratings(self, ratings):
+        """Sets the Elo ratings of the players found in ratings, in one save.
+
+        The ratings are given by chess ID.
+
+        Returns the number of players whose rating changed.
+        """
+
+        with self._exclusive():
+            self.refresh()
+            changed = 0
+            for player in self.players:
+                rating = ratings.get(player.chess_id)
+                if rating is not None and rating != player.elo_rating:
+                    player.elo_rating = rating
+                    changed += 1
+            if changed:
+                # A single snapshot, even in journaled mode (one journal record
+                # per player would not be a batch)
+                self.save()
+        return changed
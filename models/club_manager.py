@@ -1,24 +1,91 @@
 import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 from .club import ChessClub
 
 
 class ClubManager:
-    def __init__(self, data_folder="data/clubs"):
+
+    def __init__(
+        self,
+        data_folder="data/clubs",
+        journaled=False,
+        repository=None,
+        workers=None,
+        processes=False,
+        lazy=False,
+        registry=None,
+    ):
+        """Loads all the clubs of the data folder (or of the given repository).
+
+        If workers is set, club files are loaded in parallel by a pool of that
+        many threads (or processes, if processes is True). Clubs keep the order
+        of the serial loading. If lazy is True, only the club headers are read:
+        players are loaded when first accessed. If a PlayerRegistry is
+        provided, the clubs keep it up to date when they are saved.
+        """
         datadir = Path(data_folder)
         self.data_folder = datadir
+        self.journaled = journaled
+        self.repository = repository
+        self.registry = registry
         self.clubs = []
-        for filepath in datadir.iterdir():
-            if filepath.is_file() and filepath.suffix == ".json":
-                try:
-                    self.clubs.append(ChessClub(filepath))
-                except json.JSONDecodeError:
-                    print(filepath, "is invalid JSON file.")
+        if repository:
+            # Clubs are stored in a repository (e.g. SQLite) instead of the
+            # data folder
+            for key in repository.list_clubs():
+                self.clubs.append(ChessClub(repository=repository, key=key))
+            return
+
+        filepaths = [
+            filepath
+            for filepath in datadir.iterdir()
+            if filepath.is_file() and filepath.suffix == ".json"
+        ]
+        if workers:
+            executor_class = (
+                ProcessPoolExecutor if processes else ThreadPoolExecutor
+            )
+            with executor_class(max_workers=workers) as executor:
+                loaders = [
+                    executor.submit(
+                        ChessClub, filepath, journaled=journaled, lazy=lazy
+                    ).result
+                    for filepath in filepaths
+                ]
+        else:
+            loaders = [
+                partial(ChessClub, filepath, journaled=journaled, lazy=lazy)
+                for filepath in filepaths
+            ]
+
+        for filepath, load in zip(filepaths, loaders):
+            try:
+                club = load()
+                club.registry = registry
+                self.clubs.append(club)
+            except json.JSONDecodeError:
+                print(filepath, "is invalid JSON file.")
 
     def create(self, name):
+        if self.repository:
+            club = ChessClub(
+                name=name,
+                repository=self.repository,
+                key=name.replace(" ", ""),
+            )
+            self.clubs.append(club)
+            return club
+
         filepath = self.data_folder / (name.replace(" ", "") + ".json")
-        club = ChessClub(name=name, filepath=filepath)
+        club = ChessClub(
+            name=name,
+            filepath=filepath,
+            journaled=self.journaled,
+            registry=self.registry,
+        )
         club.save()
 
         self.clubs.append(club)
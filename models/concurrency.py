@@ -0,0 +1,215 @@
+"""
+Tools for sharing the data directory between several instances of the program
+(e.g. one per scoring table).
+
+- FileLock serializes the writers of a file across processes (and threads).
+- Version stamps implement optimistic concurrency: every tournament and club
+  file stores a "version" number, incremented on each save. A writer states the
+  version it loaded; if the stored version differs, another instance saved in
+  the meantime and ConflictError is raised, with the stored data, instead of
+  overwriting it.
+- merge_tournament_data merges the data of a stale writer into the stored data.
+"""
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ConflictError(Exception):
+    """
+    Raised when saving data that another instance changed since it was loaded.
+    """
+
+    def __init__(self, name: str, version: int, current: Dict[str, Any]):
+        """
+        Args:
+            name: The name of the tournament or club.
+            version: The version the writer loaded.
+            current: The stored data (its "version" is the stored version).
+        """
+        super().__init__(
+            f"'{name}' was saved by another instance (stored version "
+            f"{current.get('version', 0)}, "
+            f"saving from version {version})"
+        )
+        self.name = name
+        self.version = version
+        self.current = current
+
+
+class FileLock:
+    """
+    Exclusive lock on a file, held with a `with` block.
+
+    The lock is taken on a companion file (path + ".lock"), so the file itself
+    can be replaced atomically while the lock is held. The lock is reentrant
+    within a thread.
+    """
+
+    def __init__(self, path):
+        self.lock_path = f"{path}.lock"
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fp = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            self._fp = open(self.lock_path, "a+")
+            if fcntl:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_EX)
+            else:
+                self._fp.seek(0)
+                msvcrt.locking(self._fp.fileno(), msvcrt.LK_LOCK, 1)
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl:
+                fcntl.flock(self._fp.fileno(), fcntl.LOCK_UN)
+            else:
+                self._fp.seek(0)
+                msvcrt.locking(self._fp.fileno(), msvcrt.LK_UNLCK, 1)
+            self._fp.close()
+            self._fp = None
+        self._thread_lock.release()
+
+
+def file_stamp(path) -> Optional[Tuple[int, int]]:
+    """
+    Returns the (mtime_ns, size) of a file, or None if it does not exist: a
+    cheap change check.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def next_version(
+    name: str, stored: Optional[Dict[str, Any]], version: int
+) -> int:
+    """
+    Returns the version to write, after checking that the stored data is the
+    version the writer loaded.
+
+    Args:
+        name: The name of the tournament or club (for the error message).
+        stored: The stored data (at least its "version"), or None if nothing is
+            stored yet.
+        version: The version the writer loaded (0 for new data).
+
+    Raises:
+        ConflictError: If the stored version is not the version the writer
+            loaded.
+    """
+    if stored is None:
+        return version + 1
+    if stored.get("version", 0) != version:
+        raise ConflictError(name, version, stored)
+    return version + 1
+
+
+def _merge_matches(
+    number: int,
+    ours: List[Dict[str, Any]],
+    theirs: List[Dict[str, Any]],
+    conflicts: List[str],
+) -> List[Dict[str, Any]]:
+    """
+    Merges two versions of the matches of a round (see merge_tournament_data).
+    """
+    if [m["players"] for m in ours] != [m["players"] for m in theirs]:
+        conflicts.append(
+            f"Round {number} was paired differently: the stored pairings are "
+            "kept."
+        )
+        return theirs
+
+    matches = []
+    for board, (our_match, their_match) in enumerate(zip(ours, theirs), 1):
+        if not our_match.get("completed"):
+            matches.append(their_match)
+        elif not their_match.get("completed"):
+            matches.append(our_match)
+        else:
+            if our_match.get("winner") != their_match.get("winner"):
+                conflicts.append(
+                    f"Round {number}, board {board} has two different "
+                    "results: the stored one is kept."
+                )
+            matches.append(their_match)
+    return matches
+
+
+def merge_tournament_data(
+    ours: Dict[str, Any], theirs: Dict[str, Any]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Merges the tournament data of a stale writer (ours) with the stored data
+    (theirs).
+
+    Registrations and results only accumulate, so both sides are kept wherever
+    possible:
+    - players: the stored players, followed by ours that are not stored
+    - rounds: rounds with the same pairings are merged match by match (a result
+      wins over no result); a round paired differently, or a match with two
+      different results, is a conflict and the stored version is kept. Rounds
+      only one side has are kept.
+    - current_round and rated_rounds are the highest, completed/finished are
+      set if set on either side
+    - other fields: ours
+
+    Returns:
+        The merged data (to be saved with the stored version) and the
+        descriptions of the conflicts.
+    """
+    conflicts = []
+    merged = dict(ours)
+    merged["version"] = theirs.get("version", 0)
+
+    stored_players = theirs.get("players", [])
+    known = set(stored_players)
+    merged["players"] = stored_players + [
+        p for p in ours.get("players", []) if p not in known
+    ]
+
+    our_rounds, their_rounds = ours.get("rounds", []), theirs.get("rounds", [])
+    rounds = [
+        _merge_matches(number, our_round, their_round, conflicts)
+        for number, (our_round, their_round) in enumerate(
+            zip(our_rounds, their_rounds), 1
+        )
+    ]
+    longer = (
+        our_rounds if len(our_rounds) > len(their_rounds) else their_rounds
+    )
+    merged["rounds"] = rounds + longer[len(rounds):]
+
+    rounds_in_progress = [
+        r
+        for r in (ours.get("current_round"), theirs.get("current_round"))
+        if r is not None
+    ]
+    merged["current_round"] = (
+        max(rounds_in_progress) if rounds_in_progress else None
+    )
+    merged["completed"] = bool(
+        ours.get("completed") or theirs.get("completed")
+    )
+    merged["finished"] = bool(ours.get("finished") or theirs.get("finished"))
+    # Ratings are written to the clubs by the instance that rated the rounds:
+    # they must not be rated twice
+    merged["rated_rounds"] = max(
+        ours.get("rated_rounds", 0), theirs.get("rated_rounds", 0)
+    )
+    return merged, conflicts
@@ -2,68 +2,339 @@
 """
 Manages persistence operations (loading and saving) for tournament-related data (Tournaments, Players, etc.).
 This acts as the utility for data management.
+The actual storage is delegated to a repository: JSON files (default) or an
+SQLite database. Several instances of the program can share the same data:
+saves are version-checked and merged on conflict, and loads only read again
+the tournaments that changed.
 """
+
 import json
 import os
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Iterator
+from .analytics import PlayerStats, TournamentAnalytics, tournament_stats
+from .club import ChessClub
+from .head_to_head import HeadToHead, HeadToHeadIndex
 from .tournament import Tournament
 from .player import Player # Assuming Player model might also be saved/loaded independently
+from .concurrency import ConflictError, merge_tournament_data
+from .identity_map import PlayerIdentityMap
+from .player_registry import PlayerRegistry
+from .repository import Repository, JsonRepository
+from .tournament_catalog import sidecar_path
+from .write_behind import WriteBehindCache
 
 class DataManager:
-    """Handles reading from and writing to JSON files for tournament data."""
+    """
+    Handles reading and writing tournament data through a storage repository.
+    """
 
-    def __init__(self, tournaments_dir="data/tournaments", clubs_dir="data/clubs"):
+    def __init__(
+        self,
+        tournaments_dir="data/tournaments",
+        clubs_dir="data/clubs",
+        repository: Repository = None,
+        write_behind: float | None = None,
+    ):
+        """
+        If write_behind is set (a number of seconds), tournament saves are
+        coalesced: they are written at most once per write_behind seconds, on
+        checkpoint() and at exit.
+        """
         self.tournaments_dir = tournaments_dir
         self.clubs_dir = clubs_dir
-        os.makedirs(self.tournaments_dir, exist_ok=True)
-        os.makedirs(self.clubs_dir, exist_ok=True) # Ensure clubs dir exists for loading players
+        # JSON files are used unless another repository (e.g. SqliteRepository)
+        # is provided
+        self.repository = repository or JsonRepository(
+            tournaments_dir, clubs_dir
+        )
+        # With club JSON files, players are found through the chess ID registry
+        # (other repositories have their own chess ID index)
+        self.registry = (
+            PlayerRegistry(clubs_dir) if repository is None else None
+        )
+        # One Player object per chess ID for the whole session (tournaments,
+        # rounds and matches)
+        self.identity_map = PlayerIdentityMap(self.resolve_players)
+        # Tournaments loaded or saved by this instance: name -> (repository
+        # stamp when loaded, Tournament). A tournament whose stamp did not
+        # change is not read again.
+        self._tournaments: dict[str, tuple] = {}
+        # Last version of each tournament written by this instance
+        self._written_versions: dict[str, int] = {}
+        # Saves may come from the write-behind timer thread
+        self._lock = threading.RLock()
+        self.write_behind = (
+            WriteBehindCache(self._write_tournament, write_behind)
+            if write_behind
+            else None
+        )
+        # Cached per-tournament aggregates of the federation statistics (JSON
+        # files only)
+        self.analytics = (
+            TournamentAnalytics(tournaments_dir)
+            if repository is None
+            else None
+        )
+        # Games by pair of players, updated on each save (kept next to the
+        # tournaments directory with JSON files, in memory otherwise)
+        self.head_to_head_index = HeadToHeadIndex(
+            sidecar_path(tournaments_dir, HeadToHeadIndex.SUFFIX)
+            if repository is None
+            else ":memory:"
+        )
 
     def save_tournament(self, tournament: Tournament):
-        """Saves a Tournament object to a JSON file."""
-        file_name = f"{tournament.name.lower().replace(' ', '_')}.json"
-        file_path = os.path.join(self.tournaments_dir, file_name)
-        with open(file_path, 'w') as f:
-            json.dump(tournament.to_dict(), f, indent=4)
-        print(f"Tournament '{tournament.name}' saved successfully.")
+        """
+        Saves a Tournament object to the repository (or marks it dirty, in
+        write-behind mode).
+        """
+        with self._lock:
+            self._tournaments.setdefault(tournament.name, (None, tournament))
+        if self.write_behind:
+            self.write_behind.mark_dirty(tournament.name, tournament.to_dict())
+            print(f"Tournament '{tournament.name}' will be saved.")
+        else:
+            self._write_tournament(tournament.to_dict())
+            print(f"Tournament '{tournament.name}' saved successfully.")
+
+    def _write_tournament(self, data: dict):
+        """
+        Writes the data of a tournament. If another instance saved the
+        tournament since it was loaded, both versions are merged (see
+        merge_tournament_data) and the merge is written.
+        """
+        name = data["name"]
+        merged = False
+        with self._lock:
+            while True:
+                try:
+                    version = self.repository.save_tournament(data)
+                    break
+                except ConflictError as e:
+                    stored_version = e.current.get("version", 0)
+                    if stored_version == self._written_versions.get(name):
+                        # The stored data is our own previous write (an older
+                        # write-behind snapshot)
+                        data = dict(data, version=stored_version)
+                        continue
+                    data, conflicts = merge_tournament_data(data, e.current)
+                    merged = True
+                    print(
+                        f"Warning: Tournament '{name}' was saved by another "
+                        "instance. Changes merged."
+                    )
+                    for conflict in conflicts:
+                        print(f"  - {conflict}")
+
+            tournament = self._tournaments.get(name, (None, None))[1]
+            if merged:
+                # Snapshots of ours still pending (write-behind) miss the
+                # changes of the other instance: they are merged again rather
+                # than trusted as our own writes
+                self._written_versions.pop(name, None)
+                if tournament:
+                    # The tournament being edited continues from the merged
+                    # data
+                    tournament.replace_state(
+                        Tournament.from_dict(data, self.identity_map)
+                    )
+            else:
+                self._written_versions[name] = version
+            if tournament:
+                tournament.version = version
+                self._tournaments[name] = (
+                    self.repository.tournament_stamp(name),
+                    tournament,
+                )
+            try:
+                self.head_to_head_index.update_tournament(data)
+            except sqlite3.Error as e:
+                print(
+                    "Warning: Could not update the head-to-head index for "
+                    f"'{name}': {e}"
+                )
+
+    def checkpoint(self):
+        """
+        Writes the tournaments with pending saves now (write-behind mode).
+        """
+        if self.write_behind:
+            self.write_behind.flush()
 
     def load_tournament(self, name: str) -> Tournament | None:
-        """Loads a Tournament object from a JSON file."""
-        file_name = f"{name.lower().replace(' ', '_')}.json"
-        file_path = os.path.join(self.tournaments_dir, file_name)
-        if os.path.exists(file_path):
-            with open(file_path, 'r') as f:
-                data = json.load(f)
-            return Tournament.from_dict(data)
-        return None
+        """
+        Loads a Tournament object from the repository. A tournament already
+        loaded is only read again if it changed since (cheap stamp check).
+        """
+        # Pending saves must be visible to readers
+        self.checkpoint()
+        stamp = self.repository.tournament_stamp(name)
+        with self._lock:
+            loaded_stamp, tournament = self._tournaments.get(
+                name, (None, None)
+            )
+            if tournament and stamp is not None and stamp == loaded_stamp:
+                return tournament
+
+            data = self.repository.load_tournament(name)
+            if data is None:
+                self._tournaments.pop(name, None)
+                return None
+            tournament = Tournament.from_dict(data, self.identity_map)
+            self._tournaments[name] = (stamp, tournament)
+            return tournament
 
     def load_all_tournaments(self) -> list[Tournament]:
-        """Loads all tournament objects from the tournaments directory."""
+        """Loads all tournament objects from the repository."""
         tournaments = []
-        for filename in os.listdir(self.tournaments_dir):
-            if filename.endswith(".json"):
-                tournament_name = os.path.splitext(filename)[0].replace('_', ' ').title()
-                tournament = self.load_tournament(tournament_name)
-                if tournament:
-                    tournaments.append(tournament)
+        self.checkpoint()
+        for tournament_name in self.repository.list_tournaments():
+            tournament = self.load_tournament(tournament_name)
+            if tournament:
+                tournaments.append(tournament)
         return tournaments
 
+    def iter_players_from_clubs(
+        self, fields: list[str] | None = None
+    ) -> Iterator[dict]:
+        """
+        Streams the player data of all existing clubs, one player dictionary at
+        a time. Club files are never loaded as a whole, so memory does not grow
+        with the federation size. If fields is provided (e.g. ["chess_id",
+        "name"]), only those fields are kept.
+        """
+        for key in self.repository.list_clubs():
+            try:
+                yield from self.repository.iter_club_players(key, fields)
+            except json.JSONDecodeError:
+                print(f"Error decoding JSON from {key}")
+            except Exception as e:
+                print(f"An error occurred loading {key}: {e}")
+
     def load_all_players_from_clubs(self) -> list[dict]:
         """
-        Loads all player data from existing club JSON files.
+        Loads all player data from existing clubs.
         Returns a flat list of player dictionaries.
         """
         all_players = []
-        for filename in os.listdir(self.clubs_dir):
-            if filename.endswith(".json"):
-                file_path = os.path.join(self.clubs_dir, filename)
-                try:
-                    with open(file_path, 'r') as f:
-                        club_data = json.load(f)
-                        if 'players' in club_data and isinstance(club_data['players'], list):
-                            all_players.extend(club_data['players'])
-                except json.JSONDecodeError:
-                    print(f"Error decoding JSON from {filename}")
-                except Exception as e:
-                    print(f"An error occurred loading {filename}: {e}")
+        for key in self.repository.list_clubs():
+            try:
+                all_players.extend(self.repository.club_players(key))
+            except json.JSONDecodeError:
+                print(f"Error decoding JSON from {key}")
+            except Exception as e:
+                print(f"An error occurred loading {key}: {e}")
         return all_players
 
-    # Potentially add methods for saving/loading individual Player objects if needed outside of tournament context
\ No newline at end of file
+    def resolve_players(self, chess_ids: list[str]) -> dict[str, dict]:
+        """
+        Resolves chess IDs (e.g. the `players` list of a tournament) to the
+        club records of the players. Returns a dictionary of records by chess
+        ID; unknown IDs are left out.
+        """
+        if self.registry:
+            return self.registry.resolve(chess_ids)
+        records = {}
+        for chess_id in chess_ids:
+            record = self.repository.find_player(chess_id)
+            if record:
+                records[chess_id] = record
+        return records
+
+    def save_player_ratings(self, ratings: dict[str, int]) -> int:
+        """
+        Writes new Elo ratings (by chess ID, see
+        Tournament.update_player_elos_based_on_results) to the club records of
+        the players. Each club concerned is saved once, whatever the number of
+        its players rated. Players that no club knows about are skipped.
+        Returns the number of club records changed.
+        """
+        if self.registry:
+            by_club = defaultdict(dict)
+            for chess_id, rating in ratings.items():
+                location = self.registry.locate(chess_id)
+                if location:
+                    by_club[location[0]][chess_id] = rating
+            clubs = (
+                (self._json_club(key), club_ratings)
+                for key, club_ratings in by_club.items()
+            )
+        else:
+            clubs = (
+                (ChessClub(repository=self.repository, key=key), ratings)
+                for key in self.repository.list_clubs()
+            )
+
+        changed = 0
+        for club, club_ratings in clubs:
+            try:
+                changed += club.update_ratings(club_ratings)
+            except Exception as e:
+                print(f"Error saving the ratings of club {club.name}: {e}")
+        return changed
+
+    def federation_stats(
+        self, workers: int | None = None
+    ) -> tuple[dict[str, PlayerStats], dict[str, int]]:
+        """
+        Computes the statistics of every player over all the tournaments (see
+        models.analytics). With tournament JSON files, only the tournaments
+        changed since the last call are read again. Returns the statistics by
+        chess ID, and the current Elo ratings of the club players (to compute
+        the performance ratings).
+        """
+        self.checkpoint()
+        if self.analytics:
+            stats = self.analytics.player_stats(workers)
+        else:
+            stats = {}
+            for name in self.repository.list_tournaments():
+                data = self.repository.load_tournament(name)
+                for chess_id, partial in tournament_stats(data or {}).items():
+                    if chess_id in stats:
+                        stats[chess_id].merge(partial)
+                    else:
+                        stats[chess_id] = partial
+        ratings = {
+            player["chess_id"]: player["elo_rating"]
+            for player in self.iter_players_from_clubs(
+                ["chess_id", "elo_rating"]
+            )
+            if player.get("elo_rating") is not None
+        }
+        return stats, ratings
+
+    def head_to_head(self, player_id: str, opponent_id: str) -> HeadToHead:
+        """
+        Returns the record of a player against an opponent over all the
+        tournaments, from the head-to-head index (built from the stored
+        tournaments the first time it is used).
+        """
+        self.checkpoint()
+        with self._lock:
+            if not self.head_to_head_index.is_built:
+                self.head_to_head_index.rebuild(
+                    data
+                    for data in map(
+                        self.repository.load_tournament,
+                        self.repository.list_tournaments(),
+                    )
+                    if data
+                )
+        return self.head_to_head_index.record(player_id, opponent_id)
+
+    def _json_club(self, key: str) -> ChessClub:
+        """
+        Loads a club JSON file (in journaled mode if the club has a journal).
+        """
+        filepath = os.path.join(self.clubs_dir, f"{key}.json")
+        journaled = os.path.exists(
+            os.path.join(self.clubs_dir, f"{key}{ChessClub.JOURNAL_SUFFIX}")
+        )
+        return ChessClub(filepath, journaled=journaled, registry=self.registry)
+
+    # Potentially add methods for saving/loading individual Player objects if
+    # needed outside of tournament context
@@ -0,0 +1,116 @@
+"""
+Elo rating updates, computed with NumPy for a whole batch of games at once.
+
+The games of a batch (a round, or a whole tournament) are rated against the
+ratings the players had before the batch, as rating federations do for a
+tournament:
+- expected score of a player: E = 1 / (1 + 10 ** ((opponent rating - rating) /
+  400))
+- rating change: K * (score - E), summed over the games of the batch
+
+All the games are three arrays (white player, black player, white score), so
+the expected scores and the changes are array operations; the changes are then
+summed per player with np.bincount instead of a Python loop over the matches.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# K-factors: players rated at least HIGH_RATING change more slowly
+K_FACTOR = 20
+HIGH_RATING_K_FACTOR = 10
+HIGH_RATING = 2400
+
+
+def k_factors(ratings: np.ndarray) -> np.ndarray:
+    """
+    Returns the K-factor of each player, from their rating before the batch.
+    """
+    return np.where(ratings >= HIGH_RATING, HIGH_RATING_K_FACTOR, K_FACTOR)
+
+
+def expected_scores(
+    ratings: np.ndarray, opponent_ratings: np.ndarray
+) -> np.ndarray:
+    """
+    Returns the expected score of each player against the opponent at the same
+    position.
+    """
+    return 1.0 / (1.0 + 10.0 ** ((opponent_ratings - ratings) / 400.0))
+
+
+def rate_games(
+    ratings: np.ndarray,
+    player1: np.ndarray,
+    player2: np.ndarray,
+    scores: np.ndarray,
+    k: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Rates a batch of games.
+
+    Args:
+        ratings (np.ndarray): The ratings of the players before the batch.
+        player1 (np.ndarray): The index (in `ratings`) of the first player of
+            each game.
+        player2 (np.ndarray): The index of the second player of each game.
+        scores (np.ndarray): The score of the first player of each game (1, 0.5
+            or 0).
+        k (np.ndarray, optional): The K-factor of each player. Defaults to
+            k_factors(ratings).
+
+    Returns:
+        np.ndarray: The rating change of each player (not rounded).
+    """
+    ratings = np.asarray(ratings, dtype=float)
+    if k is None:
+        k = k_factors(ratings)
+    expected1 = expected_scores(ratings[player1], ratings[player2])
+    # The second player's surprise is the opposite
+    surprise = scores - expected1
+    changes1 = k[player1] * surprise
+    changes2 = -k[player2] * surprise
+    count = len(ratings)
+    return np.bincount(player1, changes1, count) + np.bincount(
+        player2, changes2, count
+    )
+
+
+def rate_results(ratings: Dict[str, float],
+                 results: Sequence[Tuple[str, str, float]]) -> Dict[str, int]:
+    """
+    Rates the results of a batch of games between players identified by ID.
+
+    Args:
+        ratings (Dict[str, float]): The ratings of the players before the
+            batch, by ID.
+        results (Sequence[Tuple[str, str, float]]): The games, as (player 1 ID,
+            player 2 ID, player 1 score).
+
+    Returns:
+        Dict[str, int]: The new (rounded) ratings of the players who played, by
+            ID.
+    """
+    if not results:
+        return {}
+    player_ids = list(ratings)
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    first, second, scores = zip(*results)
+    player1 = np.fromiter(
+        (index[player_id] for player_id in first),
+        dtype=np.int64,
+        count=len(results),
+    )
+    player2 = np.fromiter(
+        (index[player_id] for player_id in second),
+        dtype=np.int64,
+        count=len(results),
+    )
+    before = np.fromiter(ratings.values(), dtype=float, count=len(player_ids))
+
+    after = np.rint(
+        before
+        + rate_games(before, player1, player2, np.asarray(scores, dtype=float))
+    )
+    played = np.unique(np.concatenate((player1, player2)))
+    return {player_ids[i]: int(after[i]) for i in played}
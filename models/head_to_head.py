@@ -0,0 +1,217 @@
+"""
+Persistent head-to-head index: the games between any two players, across all
+the tournaments.
+
+The index is an SQLite database with one row per game with a result, keyed by
+(tournament, round, board), and indexed by the unordered pair of players: the
+pair is stored as (player_a, player_b) with player_a < player_b, and the result
+as the half points of player_a. A head-to-head query is one indexed lookup; no
+tournament file is read.
+
+The index follows the saves of the tournaments (see DataManager): each save
+compares the games of the tournament with the indexed ones, and only writes the
+games added, changed (corrected results) or removed. An index that was never
+filled is built once from all the stored tournaments.
+"""
+from dataclasses import dataclass, field
+import sqlite3
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    tournament TEXT NOT NULL,
+    round INTEGER NOT NULL,
+    board INTEGER NOT NULL,
+    player_a TEXT NOT NULL,
+    player_b TEXT NOT NULL,
+    white TEXT NOT NULL,
+    score_a INTEGER NOT NULL,
+    PRIMARY KEY (tournament, round, board)
+);
+CREATE INDEX IF NOT EXISTS games_pair ON games(player_a, player_b);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class GameRef(NamedTuple):
+    """
+    A game between two players: where it was played, who had white, and the
+    points of the player asked about.
+    """
+    tournament: str
+    round: int
+    board: int
+    white: str
+    points: float
+
+
+@dataclass
+class HeadToHead:
+    """
+    The record of a player against an opponent.
+
+    Attributes:
+        player_id (str): The player.
+        opponent_id (str): The opponent.
+        wins (int): The games won by the player.
+        draws (int): The games drawn.
+        losses (int): The games lost by the player.
+        games (List[GameRef]): The games, by tournament and round.
+    """
+    player_id: str
+    opponent_id: str
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    games: List[GameRef] = field(default_factory=list)
+
+    @property
+    def points(self) -> float:
+        return self.wins + self.draws / 2
+
+
+def _games(data: Dict[str, Any]) -> Dict[Tuple[int, int], tuple]:
+    """
+    Returns the indexed rows of the games with a result of a tournament (JSON
+    format), by (round, board).
+    """
+    games = {}
+    for number, matches in enumerate(data.get("rounds", []), 1):
+        for board, match in enumerate(matches, 1):
+            if not match.get("completed"):
+                continue
+            white, black = match["players"]
+            winner = match.get("winner")
+            white_points = 1 if winner is None else 2 if winner == white else 0
+            if white < black:
+                games[(number, board)] = (white, black, white, white_points)
+            else:
+                games[(number, board)] = (
+                    black,
+                    white,
+                    white,
+                    2 - white_points,
+                )
+    return games
+
+
+class HeadToHeadIndex:
+    """The games of all the tournaments, by unordered pair of players."""
+
+    # Of the database file, next to the tournaments directory
+    SUFFIX = ".head_to_head.sqlite3"
+
+    def __init__(self, database: str = ":memory:"):
+        """
+        Opens (and creates if needed) the index.
+
+        Args:
+            database (str): Path of the database file (or ":memory:").
+        """
+        self.database = database
+        # Saves may come from another thread (write-behind timer): sqlite3
+        # serializes the calls
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def is_built(self) -> bool:
+        """
+        True once the index holds the games of all the stored tournaments (see
+        rebuild).
+        """
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'built'"
+        ).fetchone()
+        return row is not None
+
+    def rebuild(self, tournaments: Iterable[Dict[str, Any]]):
+        """
+        Fills the index again from the data of all the tournaments (JSON
+        format).
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM games")
+            for data in tournaments:
+                self.connection.executemany(
+                    "INSERT INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        (data["name"], *key, *row)
+                        for key, row in _games(data).items()
+                    ),
+                )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('built', '1')"
+            )
+
+    def update_tournament(self, data: Dict[str, Any]) -> int:
+        """
+        Brings the games of a tournament up to date after it was saved: only
+        the games added, changed or removed since the last update are written.
+
+        Args:
+            data (Dict[str, Any]): The tournament data that was saved (as from
+                Tournament.to_dict).
+
+        Returns:
+            int: The number of games written or removed.
+        """
+        name = data["name"]
+        games = _games(data)
+        with self.connection:
+            indexed = {
+                (number, board): row
+                for number, board, *row in self.connection.execute(
+                    "SELECT round, board, player_a, player_b, white, score_a "
+                    "FROM games WHERE tournament = ?",
+                    (name,),
+                )
+            }
+            removed = [(name, *key) for key in indexed if key not in games]
+            changed = [
+                (name, *key, *row)
+                for key, row in games.items()
+                if indexed.get(key) != tuple(row)
+            ]
+            self.connection.executemany(
+                "DELETE FROM games "
+                "WHERE tournament = ? AND round = ? AND board = ?",
+                removed,
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO games VALUES (?, ?, ?, ?, ?, ?, ?)",
+                changed,
+            )
+        return len(removed) + len(changed)
+
+    def record(self, player_id: str, opponent_id: str) -> HeadToHead:
+        """
+        Returns the record of a player against an opponent, over all the
+        tournaments.
+        """
+        player_a, player_b = sorted((player_id, opponent_id))
+        record = HeadToHead(player_id, opponent_id)
+        rows = self.connection.execute(
+            "SELECT tournament, round, board, white, score_a FROM games "
+            "WHERE player_a = ? AND player_b = ? "
+            "ORDER BY tournament, round, board",
+            (player_a, player_b),
+        )
+        for tournament, number, board, white, score_a in rows:
+            half_points = score_a if player_id == player_a else 2 - score_a
+            if half_points == 2:
+                record.wins += 1
+            elif half_points == 1:
+                record.draws += 1
+            else:
+                record.losses += 1
+            record.games.append(
+                GameRef(tournament, number, board, white, half_points / 2)
+            )
+        return record
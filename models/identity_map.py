@@ -0,0 +1,92 @@
+# commands/models/identity_map.py
+"""
+Defines the PlayerIdentityMap class, which makes sure that a chess player is
+represented by a single Player instance during a session.
+"""
+from typing import Callable, Dict, Iterable, Optional
+from .player import Player
+
+
+class PlayerIdentityMap:
+    """
+    Session-scoped map from chess IDs to shared Player instances.
+
+    Tournaments, rounds and matches loaded with the same map reference the same
+    Player object for a given chess ID, instead of building their own copies.
+    Missing players are built from their club records, fetched in one batch by
+    the loader.
+    """
+
+    def __init__(
+        self, loader: Optional[Callable[[list[str]], Dict[str, dict]]] = None
+    ):
+        """
+        Args:
+            loader: Resolves a list of chess IDs to club records (e.g.
+                DataManager.resolve_players). Without a loader, players are
+                only known once adopted.
+        """
+        self.loader = loader
+        self._players: Dict[str, Player] = {}
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __getitem__(self, player_id: str) -> Player:
+        return self._players[player_id]
+
+    def get(
+        self, player_id: str, default: Optional[Player] = None
+    ) -> Optional[Player]:
+        """
+        Returns the Player already in the map (the map can be used where a dict
+        of players is expected).
+        """
+        return self._players.get(player_id, default)
+
+    def adopt(self, player: Player) -> Player:
+        """
+        Adds a Player to the map, unless its chess ID is already there. Returns
+        the shared instance.
+        """
+        return self._players.setdefault(player.player_id, player)
+
+    def resolve(
+        self, player_ids: Iterable[str], placeholders: bool = True
+    ) -> Dict[str, Player]:
+        """
+        Returns the shared Player instances of the given chess IDs, loading the
+        missing ones.
+
+        Args:
+            player_ids: The chess IDs.
+            placeholders: If True, chess IDs unknown to the loader get a
+                stand-in Player (see Player.unknown); otherwise they are left
+                out of the result.
+
+        Returns:
+            Dict[str, Player]: The players, by chess ID.
+        """
+        player_ids = list(dict.fromkeys(player_ids))
+        missing = [
+            player_id
+            for player_id in player_ids
+            if player_id not in self._players
+        ]
+        if missing:
+            records = self.loader(missing) if self.loader else {}
+            for player_id in missing:
+                if player_id in records:
+                    self._players[player_id] = Player.from_club_record(
+                        records[player_id]
+                    )
+                elif placeholders:
+                    self._players[player_id] = Player.unknown(player_id)
+        return {
+            player_id: self._players[player_id]
+            for player_id in player_ids
+            if player_id in self._players
+        }
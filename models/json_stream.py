@@ -0,0 +1,184 @@
+"""
+Incremental reading of large JSON documents.
+
+The standard `json.load` materialises the whole document. The functions of this
+module read the file chunk by chunk and decode the items of one array at a
+time, so the memory used does not depend on the size of the array.
+"""
+import json
+from typing import Any, Dict, Iterator, Optional, TextIO, Tuple
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+_decoder = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """A JSON text buffer that is refilled from a file as it gets consumed"""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.base = (
+            0  # position in the file of the first character of the buffer
+        )
+        self.eof = False
+
+    def fill(self) -> bool:
+        """
+        Drops the consumed text and reads the next chunk. Returns False at the
+        end of the file.
+        """
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.base += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """
+        Returns the next non-whitespace character (without consuming it), or ""
+        at the end of the file
+        """
+        while True:
+            while (
+                self.pos < len(self.buffer)
+                and self.buffer[self.pos] in WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """
+        Consumes the next non-whitespace character, which must be one of
+        `chars`
+        """
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                f"Expecting one of {chars!r}", self.buffer, self.pos
+            )
+        self.pos += 1
+        return char
+
+    def decode(self) -> Any:
+        """
+        Decodes the next JSON value, reading more chunks until it is complete
+        """
+        return self.decode_span()[2]
+
+    def decode_span(self) -> Tuple[int, int, Any]:
+        """
+        Decodes the next JSON value. Returns its start and end positions in the
+        file, and the value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next
+            # chunk
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            start = self.base + self.pos
+            self.pos = end
+            return start, self.base + end, value
+
+
+def iter_array_spans(
+    fp: TextIO,
+    key: str,
+    header: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[int, int, Any]]:
+    """
+    Yields one by one the items of the array stored under `key` in the
+    top-level JSON object of a file, as (start, end, item) tuples where start
+    and end are the positions of the item's text in the file.
+
+    Positions are character offsets: they can be used to seek in the file when
+    it is ASCII (as written by `json.dump`) and opened with newline="" (no
+    newline translation).
+
+    Args:
+        fp: The file, opened in text mode.
+        key: The member of the top-level object holding the array.
+        header: If provided, the other members of the top-level object are
+            stored in it as they are read (only those preceding the array are
+            available while iterating).
+        chunk_size: The number of characters read at once.
+    """
+    reader = _ChunkReader(fp, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        member = reader.decode()
+        reader.expect(":")
+        if member == key:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.decode_span()
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            value = reader.decode()
+            if header is not None:
+                header[member] = value
+
+        if reader.expect(",}") == "}":
+            return
+
+
+def iter_array_items(
+    fp: TextIO,
+    key: str,
+    header: Optional[Dict[str, Any]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Yields one by one the items of the array stored under `key` in the
+    top-level JSON object of a file. See `iter_array_spans` for the arguments.
+    """
+    for _, _, item in iter_array_spans(fp, key, header, chunk_size):
+        yield item
+
+
+def project(record: Dict[str, Any], fields=None) -> Dict[str, Any]:
+    """
+    Keeps only the given fields of a record (all of them if fields is None)
+    """
+    if fields is None:
+        return record
+    return {field: record.get(field) for field in fields}
+
+
+def read_header(
+    fp: TextIO, key: str, chunk_size: int = 4096
+) -> Dict[str, Any]:
+    """
+    Reads the members of the top-level JSON object that precede the array
+    stored under `key`, without reading the rest of the array.
+    """
+    header = {}
+    items = iter_array_items(fp, key, header, chunk_size)
+    next(items, None)
+    items.close()
+    return header
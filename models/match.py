@@ -2,7 +2,8 @@
 """
 Defines the Match class, representing a single chess match within a round.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Optional
 import uuid
 from .player import Player # Import Player for type hinting if needed
 
@@ -13,6 +14,11 @@ class Match:
     player2: Player
     result: tuple[float, float] | None = None # (player1_score, player2_score) e.g., (1.0, 0.0), (0.5, 0.5)
     winner_id: str | None = None # ID of the winning player, or None for draw/not played
+    # Called as on_result(match, previous_result) when a result is recorded
+    # (e.g. to update the standings)
+    on_result: Optional[Callable] = field(
+        default=None, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if not self.match_id:
@@ -20,6 +26,7 @@ class Match:
 
     def set_winner(self, winner_player_id: str):
         """Sets the winner of the match and updates scores."""
+        previous_result = self.result
         if winner_player_id == self.player1.player_id:
             self.result = (1.0, 0.0)
             self.winner_id = self.player1.player_id
@@ -31,6 +38,8 @@ class Match:
             self.winner_id = None
         else:
             raise ValueError("Invalid winner_player_id. Must be player1_id, player2_id, or 'draw'.")
+        if self.on_result:
+            self.on_result(self, previous_result)
 
     def to_dict(self):
         """Converts the Match object to a dictionary for JSON serialization."""
@@ -43,10 +52,14 @@ class Match:
         }
 
     @classmethod
-    def from_dict(cls, data: dict, all_players_in_tournament: dict[str, Player]):
+    def from_dict(
+        cls, data: dict, all_players_in_tournament: Mapping[str, Player]
+    ):
         """
         Creates a Match object from a dictionary.
-        Requires a dictionary of all players in the tournament for proper object reconstruction.
+        Requires the players of the tournament by ID for proper object
+        reconstruction: a dict, or the session's PlayerIdentityMap (so that no
+        per-tournament dict has to be built).
         """
         player1 = all_players_in_tournament.get(data['player1_id'])
         player2 = all_players_in_tournament.get(data['player2_id'])
@@ -61,5 +74,40 @@ class Match:
             winner_id=data.get('winner_id')
         )
 
+    def to_spec(self) -> dict:
+        """
+        Converts the Match object to the tournament file format: {"players":
+        [player1_id, player2_id], "completed": bool, "winner": winner_id or
+        None for a draw}.
+        """
+        return {
+            "players": [self.player1.player_id, self.player2.player_id],
+            "completed": self.result is not None,
+            "winner": self.winner_id,
+        }
+
+    @classmethod
+    def from_spec(
+        cls, match_id: str, data: dict, players: Mapping[str, Player]
+    ):
+        """
+        Creates a Match object from the tournament file format (see to_spec).
+        The file format has no match IDs: the caller provides a stable one (see
+        Round.from_spec).
+        """
+        player1 = players.get(data['players'][0])
+        player2 = players.get(data['players'][1])
+        if not player1 or not player2:
+            raise ValueError(
+                f"Player(s) not found for match: {data['players'][0]}, "
+                f"{data['players'][1]}"
+            )
+
+        match = cls(match_id=match_id, player1=player1, player2=player2)
+        # The winner of a match that is not completed is ignored
+        if data.get('completed'):
+            match.set_winner(data.get('winner') or "draw")
+        return match
+
     def __str__(self):
-        return f"Match {self.player1.first_name} vs {self.player2.first_name} - Result: {self.result}"
\ No newline at end of file
+        return f"Match {self.player1.first_name} vs {self.player2.first_name} - Result: {self.result}"
@@ -0,0 +1,247 @@
+"""
+This module implements the Swiss pairing rules of the tournaments (see
+notes/matchmaking.md):
+- round 1: the players are shuffled and paired in order
+- following rounds: the players are sorted by points (players with the same
+  points in a random order) and paired in order (#1 with #2, #3 with #4...),
+  avoiding rematches when possible.
+
+Rematch checks are set lookups, and the search for a pairing without rematches
+is a depth-first search over a doubly linked list of the unpaired players
+(removing and restoring a player is O(1)). The number of backtracking steps is
+bounded: when the budget is spent, the remaining players are paired in order
+even if they already played each other.
+
+The "optimal" mode pairs the following rounds with a maximum-weight perfect
+matching instead: rematches are forbidden and the total (squared) points
+difference between opponents is minimal, where the greedy "swiss" mode can be
+cornered into rematches in late rounds. The matching is global for fields of up
+to OPTIMAL_FULL_GRAPH players (about 0.1 s per round at 200 players). Larger
+fields only consider the OPTIMAL_WINDOW players following each player in the
+ranking: the pairing is then the best one within that window, not a global
+optimum, and still takes a fraction of a second to about a second per round at
+1000 players (a few milliseconds in "swiss" mode).
+"""
+import random
+from typing import Dict, List, Optional, Set, Tuple
+
+from .standings import Standings
+from .weighted_matching import max_weight_matching
+
+# Backtracking steps allowed per pairing before accepting rematches
+MAX_BACKTRACKS = 5000
+# Largest field paired with a matching over all the possible pairs in "optimal"
+# mode
+OPTIMAL_FULL_GRAPH = 200
+# Number of following players in the ranking each player can be paired with in
+# "optimal" mode, in larger fields
+OPTIMAL_WINDOW = 40
+
+
+def pair_random(
+    player_ids: List[str], rng: Optional[random.Random] = None
+) -> List[Tuple[str, str]]:
+    """
+    Pairs the players randomly (first round).
+
+    Args:
+        player_ids (List[str]): The IDs of the players (an even number of
+            them).
+        rng (random.Random, optional): The random generator. Defaults to the
+            `random` module.
+
+    Returns:
+        List[Tuple[str, str]]: The pairs of player IDs.
+    """
+    _check_even(player_ids)
+    shuffled = list(player_ids)
+    (rng or random).shuffle(shuffled)
+    return list(zip(shuffled[::2], shuffled[1::2]))
+
+
+def rank_players(player_ids: List[str], points: Dict[str, float],
+                 rng: Optional[random.Random] = None) -> List[str]:
+    """
+    Sorts the players by points (descending), players with the same points
+    being in a random order. With Standings, the score groups are already
+    sorted: only the groups are shuffled.
+    """
+    rng = rng or random
+    if isinstance(points, Standings):
+        selected = set(player_ids)
+        ranked = []
+        for _, group in points.groups():
+            group = [player_id for player_id in group if player_id in selected]
+            rng.shuffle(group)
+            ranked += group
+        if len(ranked) == len(player_ids):
+            return ranked
+
+    ranked = list(player_ids)
+    rng.shuffle(ranked)
+    # The sort is stable: the shuffle decides between players with the same
+    # points
+    ranked.sort(key=lambda player_id: points.get(player_id, 0.0), reverse=True)
+    return ranked
+
+
+def pair_swiss(
+    player_ids: List[str],
+    points: Dict[str, float],
+    opponents: Dict[str, Set[str]],
+    rng: Optional[random.Random] = None,
+    max_backtracks: int = MAX_BACKTRACKS,
+) -> List[Tuple[str, str]]:
+    """
+    Pairs the players by points, avoiding rematches (rounds after the first
+    one).
+
+    Args:
+        player_ids (List[str]): The IDs of the players (an even number of
+            them).
+        points (Dict[str, float]): The tournament points of the players.
+        opponents (Dict[str, Set[str]]): The IDs of the players each player
+            already played.
+        rng (random.Random, optional): The random generator deciding between
+            players with the same points.
+        max_backtracks (int, optional): The backtracking budget. Defaults to
+            MAX_BACKTRACKS.
+
+    Returns:
+        List[Tuple[str, str]]: The pairs of player IDs, best ranked first.
+    """
+    _check_even(player_ids)
+    ranked = rank_players(player_ids, points, rng)
+    played = [opponents.get(player_id, ()) for player_id in ranked]
+    count = len(ranked)
+
+    # Doubly linked list of the unpaired players (indexes in `ranked`); `count`
+    # is the head sentinel
+    next_ = list(range(1, count + 1)) + [0]
+    prev = [count] + list(range(count))
+
+    def unlink(index):
+        next_[prev[index]] = next_[index]
+        prev[next_[index]] = prev[index]
+
+    def relink(index):
+        # Players are relinked in the reverse order of their removal ("dancing
+        # links")
+        next_[prev[index]] = index
+        prev[next_[index]] = index
+
+    def candidate(player, start):
+        """
+        The first unpaired player from `start` that `player` did not play, or
+        None.
+        """
+        index = start
+        while index != count:
+            if ranked[index] not in played[player]:
+                return index
+            index = next_[index]
+        return None
+
+    pairs = []  # (player, opponent) indexes
+    budget = max_backtracks
+    while next_[count] != count:
+        player = next_[count]
+        unlink(player)
+        opponent = candidate(player, next_[count])
+        while opponent is None and pairs and budget > 0:
+            # Dead end: try the next opponent of the previously paired players
+            relink(player)
+            player, previous_opponent = pairs.pop()
+            relink(previous_opponent)
+            budget -= 1
+            opponent = candidate(player, next_[previous_opponent])
+        if opponent is None:
+            # Budget spent (or no pairing without rematch): the next player in
+            # order is accepted
+            opponent = next_[count]
+        unlink(opponent)
+        pairs.append((player, opponent))
+
+    return [(ranked[player], ranked[opponent]) for player, opponent in pairs]
+
+
+def pair_optimal(
+    player_ids: List[str],
+    points: Dict[str, float],
+    opponents: Dict[str, Set[str]],
+    rng: Optional[random.Random] = None,
+    window: Optional[int] = OPTIMAL_WINDOW,
+) -> List[Tuple[str, str]]:
+    """
+    Pairs the players with a maximum-weight perfect matching (rounds after the
+    first one).
+
+    Rematches are not allowed, and the weight of a pairing decreases with the
+    square of the points difference of the players. Fields of up to
+    OPTIMAL_FULL_GRAPH players consider every pair (the matching is then
+    globally optimal). In larger fields, to keep the graph sparse, each player
+    can only be paired with the `window` players following it in the ranking
+    (None for no limit). If no perfect matching exists, the players left over
+    are paired as in the "swiss" mode.
+
+    Args:
+        player_ids (List[str]): The IDs of the players (an even number of
+            them).
+        points (Dict[str, float]): The tournament points of the players.
+        opponents (Dict[str, Set[str]]): The IDs of the players each player
+            already played.
+        rng (random.Random, optional): The random generator deciding between
+            players with the same points.
+        window (int, optional): The number of following players each player can
+            be paired with, in fields of more than OPTIMAL_FULL_GRAPH players.
+            Defaults to OPTIMAL_WINDOW.
+
+    Returns:
+        List[Tuple[str, str]]: The pairs of player IDs, best ranked first.
+    """
+    _check_even(player_ids)
+    ranked = rank_players(player_ids, points, rng)
+    count = len(ranked)
+    # Points are multiples of 0.5: differences are counted in half points, so
+    # weights are integers
+    half_points = [
+        round(2 * points.get(player_id, 0.0)) for player_id in ranked
+    ]
+    span = count if window is None or count <= OPTIMAL_FULL_GRAPH else window
+
+    candidates = []
+    for i, player_id in enumerate(ranked):
+        played = opponents.get(player_id, ())
+        for j in range(i + 1, min(count, i + 1 + span)):
+            if ranked[j] not in played:
+                candidates.append(
+                    (i, j, (half_points[i] - half_points[j]) ** 2)
+                )
+    # Weights must be positive for the matching to prefer pairing everybody
+    highest_penalty = max((penalty for _, _, penalty in candidates), default=0)
+    edges = [
+        (i, j, highest_penalty + 1 - penalty) for i, j, penalty in candidates
+    ]
+
+    mate = max_weight_matching(edges, maxcardinality=True) if edges else []
+    mate += [-1] * (count - len(mate))
+    pairs = [(ranked[i], ranked[mate[i]]) for i in range(count) if mate[i] > i]
+    left_over = [ranked[i] for i in range(count) if mate[i] == -1]
+    if left_over:
+        pairs += pair_swiss(left_over, points, opponents, rng)
+    return pairs
+
+
+# Pairing modes of the rounds after the first one, by name (see
+# Tournament.pairing)
+PAIRING_MODES = {
+    "swiss": pair_swiss,
+    "optimal": pair_optimal,
+}
+
+
+def _check_even(player_ids: List[str]):
+    if len(player_ids) % 2:
+        raise ValueError(
+            "An even number of players is required to pair a round."
+        )
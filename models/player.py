@@ -2,9 +2,12 @@
 """
 Defines the Player class, representing a chess player within the context of a tournament.
 """
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 import uuid
 
+# Rating given to players whose club record has no Elo rating yet
+DEFAULT_ELO_RATING = 1200
+
 @dataclass
 class Player:
     player_id: str
@@ -12,8 +15,9 @@ class Player:
     last_name: str
     date_of_birth: str # YYYY-MM-DD format
     elo_rating: int
-    tournament_points: float = 0.0
-    played_opponents: list[str] = field(default_factory=list) # List of player_ids
+    # Points and opponents depend on the tournament: they are kept by
+    # Tournament (the same Player instance is shared by all the tournaments of
+    # a session, see PlayerIdentityMap)
 
     def __post_init__(self):
         # Ensure player_id is unique if not provided (e.g., for new players)
@@ -28,8 +32,6 @@ class Player:
             "last_name": self.last_name,
             "date_of_birth": self.date_of_birth,
             "elo_rating": self.elo_rating,
-            "tournament_points": self.tournament_points,
-            "played_opponents": self.played_opponents
         }
 
     @classmethod
@@ -41,12 +43,38 @@ class Player:
             last_name=data['last_name'],
             date_of_birth=data['date_of_birth'],
             elo_rating=data['elo_rating'],
-            tournament_points=data.get('tournament_points', 0.0),
-            played_opponents=data.get('played_opponents', [])
+        )
+
+    @classmethod
+    def from_club_record(cls, record: dict):
+        """
+        Creates a Player object from a club player record (name, email,
+        chess_id, birthday).
+        """
+        first_name, _, last_name = record['name'].partition(" ")
+        return cls(
+            player_id=record['chess_id'],
+            first_name=first_name,
+            last_name=last_name,
+            date_of_birth=record.get('birthday', ""),
+            elo_rating=record.get('elo_rating', DEFAULT_ELO_RATING),
+        )
+
+    @classmethod
+    def unknown(cls, player_id: str):
+        """
+        Creates a stand-in Player for a chess ID that no club knows about.
+        """
+        return cls(
+            player_id=player_id,
+            first_name=player_id,
+            last_name="",
+            date_of_birth="",
+            elo_rating=DEFAULT_ELO_RATING,
         )
 
     def __str__(self):
-        return f"{self.first_name} {self.last_name} (Elo: {self.elo_rating}, Points: {self.tournament_points})"
+        return f"{self.first_name} {self.last_name} (Elo: {self.elo_rating})"
 
     def __repr__(self):
         return f"Player(id='{self.player_id}', name='{self.first_name} {self.last_name}')"
@@ -57,4 +85,4 @@ class Player:
         return self.player_id == other.player_id
 
     def __hash__(self):
-        return hash(self.player_id)
\ No newline at end of file
+        return hash(self.player_id)
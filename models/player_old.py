@@ -6,7 +6,7 @@ class Player:
 
     DATE_FORMAT = "%d-%m-%Y"
 
-    def __init__(self, name, email, chess_id, birthday):
+    def __init__(self, name, email, chess_id, birthday, elo_rating=None):
         if not name:
             raise ValueError("Player name is required!")
 
@@ -18,6 +18,8 @@ class Player:
         self._birthdate = None
         # And a public one with a getter/setter for the birthday (str)
         self.birthday = birthday
+        # Set once the player has played rated games (see models.elo)
+        self.elo_rating = elo_rating
 
     def __str__(self):
         return f"<{self.name}>"
@@ -55,4 +57,6 @@ class Player:
         # We make sure to use the str representation of the date
         # datetime is notnatively serializable in JSON
         data["birthday"] = self.birthday
+        if self.elo_rating is not None:
+            data["elo_rating"] = self.elo_rating
         return data
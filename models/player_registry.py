@@ -0,0 +1,355 @@
+"""
+This module defines the PlayerRegistry class, a persistent index of all the
+club players of the federation, by chess ID.
+
+For every chess ID, the registry records the club file holding the player, the
+player's position in the club and the location (start and end offsets) of the
+player's record in the file. Resolving a chess ID to the full player record is
+then a seek and a small read, instead of the parsing of every club file.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+import atexit
+import json
+import os
+import threading
+
+from .club import ChessClub, read_journal
+from .json_stream import iter_array_spans
+
+
+class PlayerRegistry:
+    """
+    Maps chess IDs to their club file and record location.
+
+    Club files are scanned again only when their mtime/size (or the mtime/size
+    of their journal) changed. ChessClub instances created with a registry
+    notify it of their saves, so the index is updated without waiting for the
+    next scan.
+
+    If the same chess ID appears in several clubs, the last club scanned wins.
+    """
+
+    INDEX_FILENAME = ".registry"
+    INDEX_VERSION = 1
+
+    def __init__(self, clubs_dir: str = "data/clubs"):
+        """
+        Loads the persisted index and brings it up to date with the club files.
+
+        Args:
+            clubs_dir (str): The directory holding the club JSON files.
+        """
+        self.clubs_dir = clubs_dir
+        self.index_path = os.path.join(clubs_dir, self.INDEX_FILENAME)
+        # Club key -> file and journal stats
+        self._clubs: Dict[str, List[Optional[int]]] = {}
+        # chess ID -> [club key, index in the club, start, end]. start/end are
+        # None when the player only exists in the club journal.
+        self._players: Dict[str, List[Any]] = {}
+        # club key -> chess IDs indexed from the club (not persisted: rebuilt
+        # from _players)
+        self._club_players: Dict[str, Set[str]] = defaultdict(set)
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._load_index()
+        self.refresh()
+        atexit.register(self.save)
+
+    def _load_index(self):
+        """
+        Loads the persisted index. A missing or unreadable index is simply
+        rebuilt.
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if (
+            isinstance(data, dict)
+            and data.get("version") == self.INDEX_VERSION
+        ):
+            self._clubs = data["clubs"]
+            self._players = data["players"]
+            for chess_id, location in self._players.items():
+                self._club_players[location[0]].add(chess_id)
+
+    def save(self):
+        """Writes the index to disk if it changed (temp file + rename)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": self.INDEX_VERSION,
+                "clubs": self._clubs,
+                "players": self._players,
+            }
+            temp_path = self.index_path + ".tmp"
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.index_path)
+                self._dirty = False
+            except OSError as e:
+                print(
+                    "Warning: Could not write player registry "
+                    f"{self.index_path}: {e}"
+                )
+
+    def _club_path(self, key: str) -> str:
+        return os.path.join(self.clubs_dir, f"{key}.json")
+
+    def _journal_path(self, key: str) -> str:
+        return os.path.join(self.clubs_dir, f"{key}{ChessClub.JOURNAL_SUFFIX}")
+
+    def _stat(self, key: str) -> Optional[List[Optional[int]]]:
+        """
+        Returns [mtime_ns, size, journal mtime_ns, journal size] for a club, or
+        None if it has no file.
+        """
+        try:
+            stat = os.stat(self._club_path(key))
+        except FileNotFoundError:
+            return None
+        try:
+            journal_stat = os.stat(self._journal_path(key))
+            return [
+                stat.st_mtime_ns,
+                stat.st_size,
+                journal_stat.st_mtime_ns,
+                journal_stat.st_size,
+            ]
+        except FileNotFoundError:
+            return [stat.st_mtime_ns, stat.st_size, None, None]
+
+    def _forget_clubs(self, keys: set):
+        """Removes the players of the given clubs from the index."""
+        for key in keys:
+            for chess_id in self._club_players.pop(key, ()):
+                location = self._players.get(chess_id)
+                # The chess ID may have been indexed from another club since
+                if location is not None and location[0] == key:
+                    del self._players[chess_id]
+
+    def _scan_club(self, key: str):
+        """
+        Indexes the players of a club file (and of its journal). The club's old
+        entries must be removed first.
+        """
+        chess_ids = []
+        club_players = self._club_players[key]
+        header = {}
+        # latin-1 maps each byte to one character: offsets in the text are
+        # offsets in the file
+        with open(
+            self._club_path(key), 'r', encoding='latin-1', newline=''
+        ) as f:
+            for index, (start, end, player) in enumerate(
+                iter_array_spans(f, "players", header)
+            ):
+                self._players[player["chess_id"]] = [key, index, start, end]
+                chess_ids.append(player["chess_id"])
+                club_players.add(player["chess_id"])
+
+        for record in read_journal(
+            self._journal_path(key), header.get("journal_seq", 0)
+        ):
+            index, chess_id = record["index"], record["player"]["chess_id"]
+            if index < len(chess_ids):
+                if chess_ids[index] != chess_id:
+                    # The chess ID of the player was changed
+                    self._players.pop(chess_ids[index], None)
+                    club_players.discard(chess_ids[index])
+                    chess_ids[index] = chess_id
+                location = self._players.get(chess_id)
+                if location is None or location[:2] != [key, index]:
+                    location = [key, index, None, None]
+                self._players[chess_id] = location
+            else:
+                chess_ids.append(chess_id)
+                self._players[chess_id] = [key, index, None, None]
+            club_players.add(chess_id)
+
+        self._clubs[key] = self._stat(key)
+        self._dirty = True
+
+    def refresh(self) -> bool:
+        """
+        Scans again the clubs whose files changed, and drops the clubs whose
+        files were deleted.
+
+        Returns:
+            bool: True if the index changed.
+        """
+        with self._lock:
+            keys = {
+                filename[:-5]
+                for filename in os.listdir(self.clubs_dir)
+                if filename.endswith(".json")
+            }
+            changed = {
+                key for key in keys if self._clubs.get(key) != self._stat(key)
+            }
+            removed = set(self._clubs) - keys
+            if not changed and not removed:
+                return False
+
+            self._forget_clubs(changed | removed)
+            for key in removed:
+                del self._clubs[key]
+            for key in sorted(changed):
+                try:
+                    self._scan_club(key)
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    print(f"Error indexing players of club {key}: {e}")
+                    self._clubs.pop(key, None)
+            self._dirty = True
+            self.save()
+            return True
+
+    def locate(self, chess_id: str) -> Optional[tuple]:
+        """
+        Returns the (club key, index in the club) of a player, or None if no
+        club has it.
+        """
+        location = self._players.get(chess_id)
+        return (location[0], location[1]) if location else None
+
+    def __contains__(self, chess_id: str) -> bool:
+        return chess_id in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def get(self, chess_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the full club record of a player, or None if no club has it.
+        """
+        return self.resolve([chess_id]).get(chess_id)
+
+    def resolve(self, chess_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolves chess IDs to the full club records of the players.
+
+        Each club file concerned is opened once; each record is read with a
+        seek at its recorded position. A club whose file changed since it was
+        indexed is scanned again first, and a club whose file was deleted is
+        dropped. If some chess IDs are not indexed, the clubs are refreshed
+        once (see refresh) in case another program added the players.
+
+        Args:
+            chess_ids: The chess IDs to resolve (e.g. the `players` list of a
+                tournament).
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The records, by chess ID. Unknown IDs
+                are left out.
+        """
+        with self._lock:
+            chess_ids = list(chess_ids)
+            if any(chess_id not in self._players for chess_id in chess_ids):
+                self.refresh()
+
+            by_club = defaultdict(list)
+            for chess_id in chess_ids:
+                location = self._players.get(chess_id)
+                if location:
+                    by_club[location[0]].append(chess_id)
+
+            records = {}
+            for key, club_ids in by_club.items():
+                stat = self._stat(key)
+                if stat is None:
+                    # The club file was deleted
+                    self._forget_clubs({key})
+                    self._clubs.pop(key, None)
+                    self._dirty = True
+                    continue
+                if self._clubs.get(key) != stat:
+                    self._forget_clubs({key})
+                    self._scan_club(key)
+                records.update(self._read_records(key, club_ids))
+            return records
+
+    def _read_records(
+        self, key: str, chess_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Reads the records of some players of one (up to date) club."""
+        journal = None
+        if self._clubs[key][2] is not None:
+            # The club has a journal: its records override the snapshot
+            with open(
+                self._club_path(key), 'r', encoding='latin-1', newline=''
+            ) as f:
+                header = {}
+                next(
+                    iter_array_spans(f, "players", header, chunk_size=4096),
+                    None,
+                )
+            journal = {
+                record["index"]: record["player"]
+                for record in read_journal(
+                    self._journal_path(key), header.get("journal_seq", 0)
+                )
+            }
+
+        records = {}
+        with open(self._club_path(key), 'rb') as f:
+            for chess_id in chess_ids:
+                location = self._players.get(chess_id)
+                if location is None or location[0] != key:
+                    continue
+                _, index, start, end = location
+                if journal and index in journal:
+                    record = journal[index]
+                elif start is not None:
+                    f.seek(start)
+                    record = json.loads(f.read(end - start))
+                else:
+                    continue
+                if record.get("chess_id") == chess_id:
+                    records[chess_id] = record
+        return records
+
+    def club_saved(self, key: str):
+        """
+        Called after a club file has been rewritten: indexes the club again.
+        """
+        with self._lock:
+            self._forget_clubs({key})
+            self._scan_club(key)
+
+    def player_saved(
+        self,
+        key: str,
+        index: int,
+        chess_id: str,
+        previous_chess_id: Optional[str] = None,
+    ):
+        """
+        Called after a single player of a club has been written to the club
+        journal.
+
+        Args:
+            key (str): The club key (file name without extension).
+            index (int): The position of the player in the club.
+            chess_id (str): The chess ID of the player.
+            previous_chess_id (str, optional): The chess ID of the player
+                before the update, if it changed.
+        """
+        with self._lock:
+            if previous_chess_id and previous_chess_id != chess_id:
+                location = self._players.get(previous_chess_id)
+                if location and location[:2] == [key, index]:
+                    del self._players[previous_chess_id]
+                    self._club_players[key].discard(previous_chess_id)
+            location = self._players.get(chess_id)
+            if location is None or location[:2] != [key, index]:
+                self._players[chess_id] = [key, index, None, None]
+            self._club_players[key].add(chess_id)
+            if key in self._clubs:
+                self._clubs[key] = self._stat(key)
+            self._dirty = True
@@ -0,0 +1,341 @@
+"""
+This module defines the storage interface shared by the data managers, and its
+default JSON implementation.
+
+A repository stores clubs (with their players) and tournaments as the same
+plain dictionaries that are found in the JSON data files:
+- a club is {"name": str, "players": [player_dict, ...]} and is identified by a
+  key (the JSON file name without extension, e.g. "cornville")
+- a tournament is the dictionary produced by `Tournament.to_dict` and is
+  identified by its name
+
+Tournaments carry a version stamp: saving data whose "version" is not the
+stored version raises ConflictError (see models.concurrency), so concurrent
+instances never overwrite each other. Clubs stored as JSON files carry one as
+well.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import os
+
+from .club import ChessClub, read_journal
+from .concurrency import FileLock, file_stamp, next_version
+from .json_stream import iter_array_items, project, read_header
+from .tournament_catalog import TournamentCatalog
+
+
+class Repository(ABC):
+    """
+    Abstract storage backend for clubs, players and tournaments.
+
+    Child classes must implement the abstract methods. The query methods
+    (`club_players`, `find_player`, `round_matches`) have generic
+    implementations based on the load methods, that backends with indexes
+    should override.
+    """
+
+    # Clubs and players
+
+    @abstractmethod
+    def list_clubs(self) -> List[str]:
+        """Returns the keys of all the stored clubs."""
+
+    @abstractmethod
+    def load_club(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the club data ({"name", "players"}) for the given key, or None
+        if it does not exist.
+        """
+
+    @abstractmethod
+    def save_club(self, key: str, data: Dict[str, Any]) -> Optional[int]:
+        """
+        Stores the whole club data under the given key (creating the club if
+        needed). Backends keeping club versions return the new version, and
+        raise ConflictError if data["version"] is not the version currently
+        stored; the others return None.
+        """
+
+    def save_player(
+        self, key: str, index: int, player: Dict[str, Any]
+    ) -> Optional[int]:
+        """
+        Stores a single player of a club, at the given position in the players
+        list. An index equal to the number of players appends the player.
+        Returns the new version of the club, as save_club.
+        """
+        data = self.load_club(key)
+        if index < len(data["players"]):
+            data["players"][index] = player
+        else:
+            data["players"].append(player)
+        return self.save_club(key, data)
+
+    def club_players(self, key: str) -> List[Dict[str, Any]]:
+        """Returns the players of a club."""
+        data = self.load_club(key)
+        return data["players"] if data else []
+
+    def iter_club_players(
+        self, key: str, fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the players of a club one at a time, keeping only the given
+        fields (all if None).
+        """
+        for player in self.club_players(key):
+            yield project(player, fields)
+
+    def iter_players(
+        self, fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the players of all the clubs, keeping only the given fields (all
+        if None).
+        """
+        for key in self.list_clubs():
+            yield from self.iter_club_players(key, fields)
+
+    def find_player(self, chess_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the player with the given chess ID, or None if no club has it.
+        """
+        return next(
+            (p for p in self.iter_players() if p.get("chess_id") == chess_id),
+            None,
+        )
+
+    # Tournaments
+
+    @abstractmethod
+    def list_tournaments(self) -> List[str]:
+        """Returns the names of all the stored tournaments."""
+
+    @abstractmethod
+    def load_tournament(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the tournament data for the given name, or None if it does not
+        exist.
+        """
+
+    @abstractmethod
+    def save_tournament(self, data: Dict[str, Any]) -> int:
+        """
+        Stores the tournament data (as produced by `Tournament.to_dict`) and
+        returns its new version. Raises ConflictError if data["version"] is not
+        the version currently stored.
+        """
+
+    def tournament_stamp(self, name: str) -> Optional[Any]:
+        """
+        Returns a cheap stamp of the stored tournament, that changes whenever
+        the tournament is saved (None if unknown: the tournament must then be
+        considered changed).
+        """
+        return None
+
+    def round_matches(
+        self, name: str, round_number: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Returns the matches of a tournament round (round numbers start at 1).
+        """
+        data = self.load_tournament(name)
+        if not data or not 0 < round_number <= len(data.get("rounds", [])):
+            return []
+        return data["rounds"][round_number - 1]
+
+    def import_from(self, other: "Repository"):
+        """
+        Copies all the clubs and tournaments of another repository into this
+        one.
+        """
+        for key in other.list_clubs():
+            self.save_club(key, other.load_club(key))
+        for name in other.list_tournaments():
+            self.save_tournament(other.load_tournament(name))
+
+    def close(self):
+        """
+        Releases the resources held by the repository (nothing to do by
+        default).
+        """
+
+
+class JsonRepository(Repository):
+    """
+    Stores each club and each tournament in its own JSON file (the historical
+    storage format).
+    """
+
+    def __init__(
+        self,
+        tournaments_dir: str = "data/tournaments",
+        clubs_dir: str = "data/clubs",
+    ):
+        self.tournaments_dir = tournaments_dir
+        self.clubs_dir = clubs_dir
+        os.makedirs(self.tournaments_dir, exist_ok=True)
+        os.makedirs(self.clubs_dir, exist_ok=True)
+        self.catalog = TournamentCatalog(self.tournaments_dir)
+
+    def _club_path(self, key: str) -> str:
+        return os.path.join(self.clubs_dir, f"{key}.json")
+
+    def _journal_overrides(
+        self, key: str, journal_seq: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Returns the players changed in the club journal (see ChessClub) since
+        the snapshot, by index.
+        """
+        journal_path = os.path.join(
+            self.clubs_dir, f"{key}{ChessClub.JOURNAL_SUFFIX}"
+        )
+        return {
+            record["index"]: record["player"]
+            for record in read_journal(journal_path, journal_seq)
+        }
+
+    def _tournament_path(self, name: str) -> str:
+        """
+        Returns the file of a tournament: the existing one if any, otherwise
+        one derived from its name.
+        """
+        entry = self.catalog.lookup(name)
+        if entry:
+            return os.path.join(self.tournaments_dir, entry["path"])
+        file_name = f"{name.lower().replace(' ', '_')}.json"
+        return os.path.join(self.tournaments_dir, file_name)
+
+    def list_clubs(self) -> List[str]:
+        return sorted(
+            os.path.splitext(filename)[0]
+            for filename in os.listdir(self.clubs_dir)
+            if filename.endswith(".json")
+        )
+
+    def load_club(self, key: str) -> Optional[Dict[str, Any]]:
+        file_path = self._club_path(key)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+        overrides = self._journal_overrides(key, data.get("journal_seq", 0))
+        for index in sorted(overrides):
+            if index < len(data["players"]):
+                data["players"][index] = overrides[index]
+            else:
+                data["players"].append(overrides[index])
+        return data
+
+    def iter_club_players(
+        self, key: str, fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the players of a club file: players are decoded one at a time,
+        without loading the whole document in memory.
+        """
+        header = {}
+        overrides = None
+        with open(self._club_path(key), 'r') as f:
+            for index, player in enumerate(
+                iter_array_items(f, "players", header)
+            ):
+                if overrides is None:
+                    # The journal sequence number precedes the players in the
+                    # file
+                    overrides = self._journal_overrides(
+                        key, header.get("journal_seq", 0)
+                    )
+                yield project(overrides.pop(index, player), fields)
+
+        if overrides is None:
+            overrides = self._journal_overrides(
+                key, header.get("journal_seq", 0)
+            )
+        # Remaining journal records are players appended after the snapshot
+        for index in sorted(overrides):
+            yield project(overrides[index], fields)
+
+    def save_club(self, key: str, data: Dict[str, Any]) -> int:
+        file_path = self._club_path(key)
+        # Same lock, version check and atomic write as ChessClub.save
+        with FileLock(file_path):
+            try:
+                with open(file_path, 'r') as f:
+                    stored = read_header(f, "players")
+            except FileNotFoundError:
+                stored = None
+            version = next_version(
+                data["name"], stored, data.get("version", 0)
+            )
+            data = dict(
+                data, version=version, player_count=len(data["players"])
+            )
+
+            temp_path = file_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(temp_path, file_path)
+            # The saved data is the full state of the club: a journal would now
+            # be stale
+            journal_path = os.path.join(
+                self.clubs_dir, f"{key}{ChessClub.JOURNAL_SUFFIX}"
+            )
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+        return version
+
+    def list_tournaments(self) -> List[str]:
+        return [entry["name"] for entry in self.catalog.entries()]
+
+    def load_tournament(self, name: str) -> Optional[Dict[str, Any]]:
+        file_path = self._tournament_path(name)
+        if not os.path.exists(file_path):
+            return None
+        with open(file_path, 'r') as f:
+            return json.load(f)
+
+    def save_tournament(self, data: Dict[str, Any]) -> int:
+        file_path = self._tournament_path(data["name"])
+        # The catalog can then tell its own write from other changes of the
+        # directory
+        directory_mtime_ns = os.stat(self.tournaments_dir).st_mtime_ns
+        # The lock makes the version check and the write atomic for the other
+        # instances
+        with FileLock(file_path):
+            try:
+                with open(file_path, 'r') as f:
+                    stored = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                stored = None
+            data = dict(
+                data,
+                version=next_version(
+                    data["name"], stored, data.get("version", 0)
+                ),
+            )
+
+            # Write to a temporary file first: an interrupted save never leaves
+            # a torn file
+            temp_path = file_path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, indent=4)
+            os.replace(temp_path, file_path)
+        self.catalog.record(file_path, data, directory_mtime_ns)
+        return data["version"]
+
+    def tournament_stamp(self, name: str) -> Optional[Any]:
+        """
+        The modification time and size of the tournament file (an os.stat
+        call).
+        """
+        entry = self.catalog.lookup(name)
+        return (
+            file_stamp(os.path.join(self.tournaments_dir, entry["path"]))
+            if entry
+            else None
+        )
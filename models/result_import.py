@@ -0,0 +1,181 @@
+"""
+Bulk import of the results of a round, from a CSV or TSV file (e.g. exported by
+an electronic scoring system).
+
+Each row gives a match, by board number in the current round or by match ID,
+and its result:
+
+    board,result            match_id<TAB>result
+    1,1-0                   3-1<TAB>1/2-1/2
+    2,0-1                   3-2<TAB>0-1
+
+The header row is optional (without it, the first column is the board number,
+or the match ID if it is not a number). A header row must name a "result"
+column and a "board" or "match_id" column; the columns are then taken by name,
+in any order. The delimiter (comma, semicolon or tab) is taken from the first
+line, and a UTF-8 byte order mark is ignored. Results are written "1-0", "0-1"
+or "1/2-1/2" (also "½-½", "0.5-0.5", "=", "draw").
+
+The file is read row by row, and every row is checked before any result is
+recorded: a file with errors changes nothing.
+"""
+import csv
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .match import Match
+
+# Result notations -> which player won ("p1", "p2" or "draw")
+RESULTS = {
+    "1-0": "p1",
+    "0-1": "p2",
+    "1/2-1/2": "draw",
+    "½-½": "draw",
+    "0.5-0.5": "draw",
+    "=": "draw",
+    "draw": "draw",
+}
+DELIMITERS = "\t;,"
+# Header names of the columns giving the match, and of the result column
+REFERENCE_COLUMNS = ("board", "match_id")
+RESULT_COLUMN = "result"
+# Errors listed in the exception message (the others are counted)
+MAX_ERRORS_SHOWN = 20
+
+
+def _columns(header: List[str]) -> Optional[Tuple[int, int]]:
+    """
+    Returns the positions of the match and result columns if the first row is a
+    header row, None if it is a data row.
+
+    Raises:
+        ValueError: If the header row lacks the result column or a board /
+            match_id column.
+    """
+    names = [cell.strip().lower() for cell in header]
+    if not any(
+        name in REFERENCE_COLUMNS or name == RESULT_COLUMN for name in names
+    ):
+        return None
+    reference = next(
+        (names.index(name) for name in REFERENCE_COLUMNS if name in names),
+        None,
+    )
+    if reference is None or RESULT_COLUMN not in names:
+        raise ValueError(
+            f"The header row must have a '{RESULT_COLUMN}' column and a "
+            f"'{REFERENCE_COLUMNS[0]}' or '{REFERENCE_COLUMNS[1]}' column "
+            f"(found: {', '.join(names)})."
+        )
+    return reference, names.index(RESULT_COLUMN)
+
+
+def _rows(fp: TextIO) -> Iterator[Tuple[int, List[str]]]:
+    """
+    Yields the non-empty rows of a results file with their line numbers, as
+    [match, result] (and the cells after them, without header), the header row
+    skipped.
+    """
+    # The byte order mark written by some spreadsheets, if the file was not
+    # opened as utf-8-sig
+    first = fp.readline().lstrip("\ufeff")
+    delimiter = next((char for char in DELIMITERS if char in first), ",")
+    lines = csv.reader(fp, delimiter=delimiter)
+    header = next(csv.reader([first], delimiter=delimiter), [])
+    columns = _columns(header)
+    if header and columns is None:
+        yield 1, header
+    for line_number, row in enumerate(lines, 2):
+        if any(cell.strip() for cell in row):
+            if columns is not None:
+                row = [row[index] for index in columns if index < len(row)]
+            yield line_number, row
+
+
+def read_results(fp: TextIO, tournament) -> List[Tuple[Match, str]]:
+    """
+    Reads and checks the results of the current round of a tournament (in an
+    arena, of the games in progress).
+
+    Args:
+        fp (TextIO): The results file.
+        tournament (Tournament): The tournament.
+
+    Returns:
+        List[Tuple[Match, str]]: The matches with the ID of their winner (or
+            "draw"), ready for
+        Tournament.record_results. Rows repeating a result already recorded are
+        left out.
+
+    Raises:
+        ValueError: If the header row lacks a required column, or a row is
+            invalid: unknown board or match, match outside the current round,
+            unknown result, match given twice, or a match that already has
+            another result.
+    """
+    if not tournament.rounds:
+        raise ValueError(f"Tournament '{tournament.name}' has not started.")
+    current = (
+        tournament.ongoing_matches()
+        if tournament.is_arena
+        else tournament.rounds[-1].matches
+    )
+    current_ids = {match.match_id for match in current}
+
+    results: List[Tuple[Match, str]] = []
+    seen: Dict[str, int] = {}
+    errors: List[str] = []
+    for line_number, row in _rows(fp):
+        error = None
+        match: Optional[Match] = None
+        if len(row) < 2:
+            error = "expected a board or match ID, and a result"
+        else:
+            reference = row[0].strip()
+            notation = row[1].strip().lower().replace(" ", "")
+            if reference.isdigit() and not tournament.is_arena:
+                board = int(reference)
+                if 1 <= board <= len(current):
+                    match = current[board - 1]
+                else:
+                    error = f"no board {board} in the current round"
+            else:
+                match = tournament.get_match(reference)
+                if match is None or match.match_id not in current_ids:
+                    error = f"no match '{reference}' in play"
+            outcome = RESULTS.get(notation)
+            if error is None and outcome is None:
+                error = f"unknown result '{row[1].strip()}'"
+
+        if error is None:
+            winner_id = {
+                "p1": match.player1.player_id,
+                "p2": match.player2.player_id,
+            }.get(outcome, "draw")
+            if match.match_id in seen:
+                error = (
+                    f"match {match.match_id} already given on line "
+                    f"{seen[match.match_id]}"
+                )
+            elif match.result is not None:
+                if match.winner_id != (
+                    None if winner_id == "draw" else winner_id
+                ):
+                    error = (
+                        f"match {match.match_id} already has the result "
+                        f"{match.result[0]}-{match.result[1]}"
+                    )
+            else:
+                results.append((match, winner_id))
+            seen.setdefault(match.match_id, line_number)
+        if error:
+            errors.append(f"line {line_number}: {error}")
+
+    if errors:
+        shown = errors[:MAX_ERRORS_SHOWN]
+        if len(errors) > len(shown):
+            shown.append(f"... and {len(errors) - len(shown)} more")
+        raise ValueError(
+            f"{len(errors)} invalid row(s), no result imported:\n"
+            + "\n".join(shown)
+        )
+    return results
@@ -4,14 +4,16 @@ Defines the Round class, representing a round in a chess tournament.
 """
 from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Mapping
 import uuid
 from .match import Match
+from .player import Player
 
 @dataclass
 class Round:
     round_id: str
     name: str
-    start_time: str
+    start_time: str | None
     end_time: str | None
     matches: list[Match] = field(default_factory=list)
 
@@ -30,10 +32,13 @@ class Round:
         }
 
     @classmethod
-    def from_dict(cls, data: dict, all_players_in_tournament: dict[str, any]):
+    def from_dict(
+        cls, data: dict, all_players_in_tournament: Mapping[str, Player]
+    ):
         """
         Creates a Round object from a dictionary.
-        Requires a dictionary of all players in the tournament for match reconstruction.
+        Requires the players of the tournament by ID (a dict or a
+        PlayerIdentityMap) for match reconstruction.
         """
         matches = [
             Match.from_dict(m_data, all_players_in_tournament)
@@ -47,9 +52,37 @@ class Round:
             matches=matches
         )
 
+    def to_spec(self) -> list[dict]:
+        """
+        Converts the Round object to the tournament file format: the list of
+        its matches.
+        """
+        return [match.to_spec() for match in self.matches]
+
+    @classmethod
+    def from_spec(
+        cls, number: int, matches: list[dict], players: Mapping[str, Player]
+    ):
+        """
+        Creates a Round object from the tournament file format (a list of
+        matches). The round and its matches get stable IDs derived from their
+        positions: round "3", matches "3-1", "3-2", ... (round number, board
+        number).
+        """
+        return cls(
+            round_id=str(number),
+            name=f"Round {number}",
+            start_time=None,
+            end_time=None,
+            matches=[
+                Match.from_spec(f"{number}-{board}", m_data, players)
+                for board, m_data in enumerate(matches, 1)
+            ]
+        )
+
     def is_finished(self) -> bool:
         """Checks if all matches in the round have results."""
         return all(match.result is not None for match in self.matches)
 
     def __str__(self):
-        return f"Round {self.name} ({len(self.matches)} matches)"
\ No newline at end of file
+        return f"Round {self.name} ({len(self.matches)} matches)"
@@ -0,0 +1,120 @@
+"""
+Round-robin (all-play-all) schedules, computed with Berger table arithmetic.
+
+With n players (n even; a "bye" slot is added to an odd field), the schedule
+has n - 1 rounds. Player n - 1 stays fixed while the others turn around a
+circle: in round r (0-based), the circle starts at position r * n / 2 (mod n -
+1), the first player of the circle meets the fixed player and the k-th player
+meets the k-th from the end. Every pair meets exactly once, and the colours
+alternate: nobody has more than one extra white, nor the same colour three
+rounds in a row (see FIDE Handbook C.05, Annex 1).
+
+A round is computed from its index alone in O(n), so the whole schedule costs
+O(n^2) and a round is only built when it is asked for. A double round robin
+plays the schedule twice, with the colours reversed in the second cycle.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+# Round-robin pairing modes (see Tournament.pairing), with the number of cycles
+# they play
+ROUND_ROBIN_CYCLES = {
+    "round_robin": 1,
+    "double_round_robin": 2,
+}
+
+
+def berger_round(count: int, index: int) -> List[Tuple[int, int]]:
+    """
+    Returns the pairs of a round of the Berger table for `count` players (an
+    even number).
+
+    Args:
+        count (int): The number of players (even).
+        index (int): The round index (0-based, less than count - 1).
+
+    Returns:
+        List[Tuple[int, int]]: The (white, black) pairs of player indexes, by
+            board.
+    """
+    circle = count - 1
+    start = index * (count // 2) % circle
+
+    def at(position):
+        return (start + position) % circle
+
+    # The fixed player alternates colours from one round to the next
+    pairs = [(at(0), circle) if index % 2 == 0 else (circle, at(0))]
+    pairs += [(at(k), at(circle - k)) for k in range(1, count // 2)]
+    return pairs
+
+
+class RoundRobinSchedule:
+    """
+    The lazily computed rounds of a round-robin tournament between players.
+
+    The players keep their order (the order of registration): the i-th player
+    gets the i-th line of the Berger table. With an odd number of players, the
+    player paired with the extra slot rests (has a bye) in that round.
+    """
+
+    def __init__(self, player_ids: Sequence[str], cycles: int = 1):
+        """
+        Args:
+            player_ids (Sequence[str]): The players, in table order.
+            cycles (int, optional): The number of times each pair meets.
+                Defaults to 1.
+
+        Raises:
+            ValueError: With fewer than two players.
+        """
+        if len(player_ids) < 2:
+            raise ValueError("A round robin needs at least two players.")
+        self.player_ids = list(player_ids)
+        self.cycles = cycles
+        # An odd field gets an extra slot: the player paired with it rests
+        self._count = len(self.player_ids) + len(self.player_ids) % 2
+
+    @property
+    def rounds_per_cycle(self) -> int:
+        return self._count - 1
+
+    def __len__(self) -> int:
+        return self.rounds_per_cycle * self.cycles
+
+    def _table_round(
+        self, index: int
+    ) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        if not 0 <= index < len(self):
+            raise IndexError(
+                f"Round index {index} out of range (the schedule has "
+                f"{len(self)} rounds)."
+            )
+        cycle, table_index = divmod(index, self.rounds_per_cycle)
+        pairs, bye = [], None
+        for white, black in berger_round(self._count, table_index):
+            if cycle % 2:
+                white, black = black, white
+            if black >= len(self.player_ids):
+                bye = self.player_ids[white]
+            elif white >= len(self.player_ids):
+                bye = self.player_ids[black]
+            else:
+                pairs.append((self.player_ids[white], self.player_ids[black]))
+        return pairs, bye
+
+    def __getitem__(self, index: int) -> List[Tuple[str, str]]:
+        """
+        Returns the (white, black) pairs of player IDs of a round (0-based
+        index).
+        """
+        return self._table_round(index)[0]
+
+    def bye(self, index: int) -> Optional[str]:
+        """
+        Returns the player resting in a round (0-based index), or None for an
+        even field.
+        """
+        return self._table_round(index)[1]
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
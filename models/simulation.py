@@ -0,0 +1,377 @@
+"""
+Monte Carlo simulation of the outcome of a tournament in progress.
+
+From the current state of a tournament (points, opponents, Elo ratings), the
+remaining games are played out many times: first the matches of the current
+round still without a result, then the rounds left, paired as in the "swiss"
+mode (by points, players with the same points in a random order, avoiding
+rematches of the games already played, real or simulated), or taken from the
+schedule of a round robin. The finishing positions are counted over all the
+simulations to give the probability of each player to win the tournament or to
+finish in the top N.
+
+Simulations are run in batches: a batch is a (simulations x players) array of
+points, and a round of the whole batch is a handful of array operations
+(sorting by points, pairing neighbours, drawing the results from the Elo
+expected scores). Batches are spread over a process pool; each worker gets its
+own random stream, spawned from one seed, so the results are reproducible for a
+given seed and number of workers.
+
+Simplifications: a rematch is avoided only by swapping with the neighbouring
+pair, and players with the same final points are ordered randomly (the
+tiebreaks are not simulated).
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .elo import expected_scores
+
+# Share of draws between players of the same strength (fewer when the ratings
+# differ)
+DRAW_RATE = 0.3
+# Simulations played at once by a worker (memory grows with batch size x
+# players)
+BATCH_SIZE = 2000
+# Bound on the (simulations x players x players) pairs already played by a
+# batch: large fields play smaller batches
+MAX_PLAYED_CELLS = 64_000_000
+
+
+@dataclass
+class SimulationResult:
+    """
+    The finishing distribution of the players over the simulations.
+
+    Attributes:
+        player_ids (List[str]): The players, in the order of the arrays.
+        simulations (int): The number of simulations.
+        top_n (int): The number of places counted by top_n_counts.
+        win_counts (np.ndarray): The number of simulations won by each player.
+        top_n_counts (np.ndarray): The number of simulations each player
+            finished in the top N.
+        total_points (np.ndarray): The final points of each player, summed over
+            the simulations.
+    """
+    player_ids: List[str]
+    simulations: int
+    top_n: int
+    win_counts: np.ndarray
+    top_n_counts: np.ndarray
+    total_points: np.ndarray
+
+    def win_probabilities(self) -> Dict[str, float]:
+        """
+        Returns the probability of each player to win the tournament, by ID.
+        """
+        return dict(
+            zip(self.player_ids, (self.win_counts / self.simulations).tolist())
+        )
+
+    def top_n_probabilities(self) -> Dict[str, float]:
+        """
+        Returns the probability of each player to finish in the top N, by ID.
+        """
+        return dict(
+            zip(
+                self.player_ids,
+                (self.top_n_counts / self.simulations).tolist(),
+            )
+        )
+
+    def expected_points(self) -> Dict[str, float]:
+        """Returns the average final points of each player, by ID."""
+        return dict(
+            zip(
+                self.player_ids,
+                (self.total_points / self.simulations).tolist(),
+            )
+        )
+
+
+def tournament_state(tournament) -> dict:
+    """
+    Extracts what the simulation needs from a tournament, as plain arrays (sent
+    to the workers).
+
+    Returns:
+        dict: player_ids, ratings, half_points (current points, in half
+            points), played (players x
+        players matrix of the pairs already paired), pending (index pairs of
+        the current round's matches without a result), remaining_rounds (the
+        rounds still to be paired) and scheduled (the index pairs of the rounds
+        still to be played, for a round robin).
+    """
+    player_ids = list(tournament.players)
+    index = {player_id: i for i, player_id in enumerate(player_ids)}
+    count = len(player_ids)
+
+    played = np.zeros((count, count), dtype=bool)
+    for player_id, opponents in tournament.opponents.items():
+        if player_id in index:
+            columns = [
+                index[opponent] for opponent in opponents if opponent in index
+            ]
+            played[index[player_id], columns] = True
+
+    pending = []
+    if tournament.rounds and not tournament.completed:
+        pending = [
+            (index[match.player1.player_id], index[match.player2.player_id])
+            for match in tournament.rounds[-1].matches
+            if match.result is None
+            and match.player1.player_id in index
+            and match.player2.player_id in index
+        ]
+    remaining_rounds = (
+        0
+        if tournament.completed
+        else max(0, tournament.num_rounds - len(tournament.rounds))
+    )
+    scheduled = []
+    if tournament.is_round_robin and remaining_rounds:
+        # The pairings do not depend on the results: the rest of the schedule
+        # is played as is
+        schedule = tournament.schedule()
+        scheduled = [
+            np.array(
+                [
+                    (index[white], index[black])
+                    for white, black in schedule[number]
+                ],
+                dtype=np.int64,
+            )
+            for number in range(len(tournament.rounds), len(schedule))
+        ]
+        remaining_rounds = 0
+
+    return {
+        "player_ids": player_ids,
+        "ratings": np.array(
+            [
+                tournament.roster[player_id].elo_rating
+                for player_id in player_ids
+            ],
+            dtype=float,
+        ),
+        "half_points": np.array(
+            [
+                round(2 * tournament.points.get(player_id, 0.0))
+                for player_id in player_ids
+            ]
+        ),
+        "played": played,
+        "pending": np.array(pending, dtype=np.int64).reshape(-1, 2),
+        "remaining_rounds": remaining_rounds,
+        "scheduled": scheduled,
+    }
+
+
+def _play(
+    rng: np.random.Generator,
+    ratings: np.ndarray,
+    half_points: np.ndarray,
+    player1: np.ndarray,
+    player2: np.ndarray,
+):
+    """
+    Plays a round of games in every simulation of a batch and adds the results
+    to half_points.
+    """
+    expected = expected_scores(ratings[player1], ratings[player2])
+    # expected = P(win) + P(draw) / 2, with fewer draws between players of
+    # different strength
+    draws = np.minimum(DRAW_RATE, 2 * np.minimum(expected, 1 - expected))
+    wins = expected - draws / 2
+    draw = rng.random(expected.shape)
+    # In half points
+    result1 = np.where(draw < wins, 2, np.where(draw < wins + draws, 1, 0))
+    rows = np.arange(half_points.shape[0])[:, None]
+    half_points[rows, player1] += result1
+    half_points[rows, player2] += 2 - result1
+
+
+def _pair(
+    rng: np.random.Generator, half_points: np.ndarray, played: np.ndarray
+):
+    """
+    Pairs a round in every simulation of a batch: players sorted by points
+    (random order within a score group), #1 with #2, #3 with #4... A pair that
+    already played (played is the simulations x players x players matrix of the
+    batch) swaps its second player with the next pair's, when that removes the
+    rematch. The new pairs are then marked as played.
+    """
+    order = np.lexsort((rng.random(half_points.shape), -half_points), axis=-1)
+    player1, player2 = order[:, 0::2].copy(), order[:, 1::2].copy()
+    rows = np.arange(half_points.shape[0])[:, None]
+    for parity in (0, 1):
+        # Even then odd pairs, so that two swaps never involve the same pair
+        first = np.arange(parity, player1.shape[1] - 1, 2)
+        if not len(first):
+            continue
+        a1, a2 = player1[:, first], player2[:, first]
+        b1, b2 = player1[:, first + 1], player2[:, first + 1]
+        swap = (
+            played[rows, a1, a2]
+            & ~played[rows, a1, b2]
+            & ~played[rows, b1, a2]
+        )
+        player2[:, first] = np.where(swap, b2, a2)
+        player2[:, first + 1] = np.where(swap, a2, b2)
+    played[rows, player1, player2] = True
+    played[rows, player2, player1] = True
+    return player1, player2
+
+
+def _simulate_chunk(
+    state: dict,
+    simulations: int,
+    top_n: int,
+    seed: np.random.SeedSequence,
+    batch_size: int = BATCH_SIZE,
+):
+    """
+    Runs simulations in batches (in a worker process) and returns the counts of
+    SimulationResult.
+    """
+    rng = np.random.default_rng(seed)
+    ratings, played, pending = (
+        state["ratings"],
+        state["played"],
+        state["pending"],
+    )
+    count = len(ratings)
+    win_counts = np.zeros(count, dtype=np.int64)
+    top_n_counts = np.zeros(count, dtype=np.int64)
+    total_half_points = np.zeros(count, dtype=np.int64)
+    if state["remaining_rounds"]:
+        # Each simulation of a batch has its own copy of the pairs already
+        # played
+        batch_size = max(
+            1, min(batch_size, MAX_PLAYED_CELLS // (count * count))
+        )
+
+    done = 0
+    while done < simulations:
+        size = min(batch_size, simulations - done)
+        half_points = np.tile(state["half_points"], (size, 1))
+        for pairs in [pending, *state["scheduled"]]:
+            if len(pairs):
+                _play(
+                    rng,
+                    ratings,
+                    half_points,
+                    np.tile(pairs[:, 0], (size, 1)),
+                    np.tile(pairs[:, 1], (size, 1)),
+                )
+        if state["remaining_rounds"]:
+            batch_played = np.broadcast_to(played, (size, count, count)).copy()
+            for _ in range(state["remaining_rounds"]):
+                _play(
+                    rng,
+                    ratings,
+                    half_points,
+                    *_pair(rng, half_points, batch_played),
+                )
+
+        # Final ranking: players with the same points in a random order
+        final = np.lexsort(
+            (rng.random(half_points.shape), -half_points), axis=-1
+        )
+        win_counts += np.bincount(final[:, 0], minlength=count)
+        top_n_counts += np.bincount(final[:, :top_n].ravel(), minlength=count)
+        total_half_points += half_points.sum(axis=0)
+        done += size
+
+    return win_counts, top_n_counts, total_half_points
+
+
+def simulate_outcomes(
+    tournament,
+    simulations: int = 100_000,
+    top_n: int = 3,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch_size: int = BATCH_SIZE,
+) -> SimulationResult:
+    """
+    Simulates the rest of a tournament and counts the finishing positions of
+    the players.
+
+    Args:
+        tournament (Tournament): The tournament (in progress, with an even
+            number of players).
+        simulations (int, optional): The number of simulations. Defaults to
+            100,000.
+        top_n (int, optional): The number of places counted as "top N".
+            Defaults to 3.
+        seed (int, optional): The seed of the random streams. Defaults to fresh
+            entropy.
+        workers (int, optional): The number of worker processes. Defaults to
+            the number of CPUs; 1 runs the simulations in the calling process.
+        batch_size (int, optional): The simulations played at once by a worker.
+            Defaults to BATCH_SIZE.
+
+    Returns:
+        SimulationResult: The counts, with the win and top-N probabilities of
+            each player.
+
+    Raises:
+        ValueError: If the tournament has fewer than 2 players, an odd number
+            of players (and is not a round robin), or is an arena (its games
+            are not played in rounds).
+    """
+    if tournament.is_arena:
+        raise ValueError(
+            "The games of an arena cannot be simulated round by round."
+        )
+    if len(tournament.players) < 2:
+        raise ValueError(
+            "At least 2 players are required to simulate the tournament."
+        )
+    state = tournament_state(tournament)
+    if len(state["player_ids"]) % 2 and state["remaining_rounds"]:
+        raise ValueError(
+            "An even number of players is required to simulate the rounds."
+        )
+    workers = max(1, min(workers or os.cpu_count() or 1, simulations))
+    # One independent random stream per worker
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    chunks = [
+        simulations // workers + (i < simulations % workers)
+        for i in range(workers)
+    ]
+
+    if workers == 1:
+        results = [
+            _simulate_chunk(state, chunks[0], top_n, seeds[0], batch_size)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _simulate_chunk,
+                    state,
+                    chunk,
+                    top_n,
+                    chunk_seed,
+                    batch_size,
+                )
+                for chunk, chunk_seed in zip(chunks, seeds)
+            ]
+            results = [future.result() for future in futures]
+
+    win_counts, top_n_counts, total_half_points = (
+        sum(counts) for counts in zip(*results)
+    )
+    return SimulationResult(
+        player_ids=state["player_ids"],
+        simulations=simulations,
+        top_n=top_n,
+        win_counts=win_counts,
+        top_n_counts=top_n_counts,
+        total_points=total_half_points / 2,
+    )
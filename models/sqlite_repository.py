@@ -0,0 +1,353 @@
+"""
+This module defines the SQLite implementation of the storage interface.
+
+Clubs, players, tournaments, rounds and matches each have their own table, with
+indexes on the columns used by the queries (club of a player, chess ID, round
+of a match...). Reading the players of one club or the matches of one round is
+an indexed query instead of the parsing of a whole JSON file.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional
+import json
+import sqlite3
+
+from .concurrency import next_version
+from .json_stream import project
+from .repository import Repository
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clubs (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS players (
+    club_id INTEGER NOT NULL REFERENCES clubs(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chess_id TEXT,
+    name TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (club_id, position)
+);
+CREATE INDEX IF NOT EXISTS players_chess_id ON players(chess_id);
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    venue TEXT,
+    date_from TEXT,
+    date_to TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tournament_players (
+    tournament_id INTEGER NOT NULL
+        REFERENCES tournaments(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    chess_id TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, position)
+);
+CREATE INDEX IF NOT EXISTS tournament_players_chess_id
+    ON tournament_players(chess_id);
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    tournament_id INTEGER NOT NULL
+        REFERENCES tournaments(id) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    UNIQUE (tournament_id, number)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    round_id INTEGER NOT NULL REFERENCES rounds(id) ON DELETE CASCADE,
+    board INTEGER NOT NULL,
+    player1 TEXT NOT NULL,
+    player2 TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    winner TEXT,
+    PRIMARY KEY (round_id, board)
+);
+CREATE INDEX IF NOT EXISTS matches_player1 ON matches(player1);
+CREATE INDEX IF NOT EXISTS matches_player2 ON matches(player2);
+"""
+
+
+class SqliteRepository(Repository):
+    """Stores clubs and tournaments in a single SQLite database file."""
+
+    def __init__(self, database: str = "data/chess.sqlite3"):
+        """
+        Opens (and creates if needed) the database.
+
+        Args:
+            database (str): Path of the database file (or ":memory:").
+        """
+        self.database = database
+        # Saves may come from another thread (write-behind timer): sqlite3
+        # serializes the calls
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    # Clubs and players
+
+    def _club_id(self, key: str) -> Optional[int]:
+        row = self.connection.execute(
+            "SELECT id FROM clubs WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _player_row(
+        club_id: int, position: int, player: Dict[str, Any]
+    ) -> tuple:
+        return (
+            club_id,
+            position,
+            player.get("chess_id"),
+            player.get("name"),
+            json.dumps(player),
+        )
+
+    def list_clubs(self) -> List[str]:
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT key FROM clubs ORDER BY key"
+            )
+        ]
+
+    def load_club(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT name FROM clubs WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"name": row[0], "players": self.club_players(key)}
+
+    def save_club(self, key: str, data: Dict[str, Any]):
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO clubs (key, name) VALUES (?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET name = excluded.name",
+                (key, data["name"]),
+            )
+            club_id = self._club_id(key)
+            self.connection.execute(
+                "DELETE FROM players WHERE club_id = ?", (club_id,)
+            )
+            self.connection.executemany(
+                "INSERT INTO players (club_id, position, chess_id, name, data)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    self._player_row(club_id, position, p)
+                    for position, p in enumerate(data["players"])
+                ),
+            )
+
+    def save_player(self, key: str, index: int, player: Dict[str, Any]):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO players "
+                "(club_id, position, chess_id, name, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                self._player_row(self._club_id(key), index, player),
+            )
+
+    def club_players(self, key: str) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            "SELECT p.data FROM players p JOIN clubs c ON p.club_id = c.id "
+            "WHERE c.key = ? ORDER BY p.position",
+            (key,),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    # Fields that have their own column: projecting on them does not need to
+    # decode the JSON data
+    PLAYER_COLUMNS = ("chess_id", "name")
+
+    def _iter_player_rows(
+        self, where: str, params: tuple, fields: Optional[List[str]]
+    ):
+        if fields is not None and set(fields) <= set(self.PLAYER_COLUMNS):
+            columns = ", ".join(f"p.{field}" for field in fields)
+            for row in self.connection.execute(
+                f"SELECT {columns} FROM players p {where}", params
+            ):
+                yield dict(zip(fields, row))
+        else:
+            for row in self.connection.execute(
+                f"SELECT p.data FROM players p {where}", params
+            ):
+                yield project(json.loads(row[0]), fields)
+
+    def iter_club_players(
+        self, key: str, fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        return self._iter_player_rows(
+            "JOIN clubs c ON p.club_id = c.id "
+            "WHERE c.key = ? ORDER BY p.position",
+            (key,),
+            fields,
+        )
+
+    def iter_players(
+        self, fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        return self._iter_player_rows(
+            "ORDER BY p.club_id, p.position", (), fields
+        )
+
+    def find_player(self, chess_id: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT data FROM players WHERE chess_id = ?", (chess_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Tournaments
+
+    def list_tournaments(self) -> List[str]:
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT name FROM tournaments ORDER BY name"
+            )
+        ]
+
+    def load_tournament(self, name: str) -> Optional[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT id, data FROM tournaments WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return None
+        tournament_id, header = row
+        data = json.loads(header)
+        data["players"] = [
+            r[0]
+            for r in self.connection.execute(
+                "SELECT chess_id FROM tournament_players "
+                "WHERE tournament_id = ? ORDER BY position",
+                (tournament_id,),
+            )
+        ]
+        rounds = []
+        for (round_id,) in self.connection.execute(
+            "SELECT id FROM rounds WHERE tournament_id = ? ORDER BY number",
+            (tournament_id,),
+        ):
+            rounds.append(self._matches(round_id))
+        data["rounds"] = rounds
+        return data
+
+    def _matches(self, round_id: int) -> List[Dict[str, Any]]:
+        rows = self.connection.execute(
+            "SELECT player1, player2, completed, winner FROM matches "
+            "WHERE round_id = ? ORDER BY board",
+            (round_id,),
+        )
+        return [
+            {
+                "players": [player1, player2],
+                "completed": bool(completed),
+                "winner": winner,
+            }
+            for player1, player2, completed, winner in rows
+        ]
+
+    def save_tournament(self, data: Dict[str, Any]) -> int:
+        header = {
+            key: value
+            for key, value in data.items()
+            if key not in ("players", "rounds")
+        }
+        dates = data.get("dates", {})
+        with self.connection:
+            # Taking the write lock first makes the version check and the write
+            # atomic
+            self.connection.execute("BEGIN IMMEDIATE")
+            row = self.connection.execute(
+                "SELECT data FROM tournaments WHERE name = ?", (data["name"],)
+            ).fetchone()
+            header["version"] = next_version(
+                data["name"],
+                json.loads(row[0]) if row else None,
+                data.get("version", 0),
+            )
+            self.connection.execute(
+                "INSERT INTO tournaments "
+                "(name, venue, date_from, date_to, data) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET venue = excluded.venue, "
+                "date_from = excluded.date_from, date_to = excluded.date_to, "
+                "data = excluded.data",
+                (
+                    data["name"],
+                    data.get("venue"),
+                    dates.get("from"),
+                    dates.get("to"),
+                    json.dumps(header),
+                ),
+            )
+            tournament_id = self.connection.execute(
+                "SELECT id FROM tournaments WHERE name = ?", (data["name"],)
+            ).fetchone()[0]
+
+            # Rounds and matches cascade from the round rows
+            self.connection.execute(
+                "DELETE FROM tournament_players WHERE tournament_id = ?",
+                (tournament_id,),
+            )
+            self.connection.execute(
+                "DELETE FROM rounds WHERE tournament_id = ?", (tournament_id,)
+            )
+            self.connection.executemany(
+                "INSERT INTO tournament_players "
+                "(tournament_id, position, chess_id) VALUES (?, ?, ?)",
+                (
+                    (tournament_id, position, chess_id)
+                    for position, chess_id in enumerate(
+                        data.get("players", [])
+                    )
+                ),
+            )
+            for number, matches in enumerate(data.get("rounds", []), 1):
+                round_id = self.connection.execute(
+                    "INSERT INTO rounds (tournament_id, number) VALUES (?, ?)",
+                    (tournament_id, number),
+                ).lastrowid
+                self.connection.executemany(
+                    "INSERT INTO matches "
+                    "(round_id, board, player1, player2, completed, winner) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            round_id,
+                            board,
+                            m["players"][0],
+                            m["players"][1],
+                            int(m.get("completed", False)),
+                            m.get("winner"),
+                        )
+                        for board, m in enumerate(matches, 1)
+                    ),
+                )
+        return header["version"]
+
+    def tournament_stamp(self, name: str) -> Optional[Any]:
+        """The version of the stored tournament."""
+        row = self.connection.execute(
+            "SELECT json_extract(data, '$.version') FROM tournaments "
+            "WHERE name = ?",
+            (name,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def round_matches(
+        self, name: str, round_number: int
+    ) -> List[Dict[str, Any]]:
+        row = self.connection.execute(
+            "SELECT r.id FROM rounds r "
+            "JOIN tournaments t ON r.tournament_id = t.id "
+            "WHERE t.name = ? AND r.number = ?",
+            (name, round_number),
+        ).fetchone()
+        return self._matches(row[0]) if row else []
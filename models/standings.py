@@ -0,0 +1,148 @@
+"""
+Defines the Standings class, the incrementally maintained ranking of a
+tournament.
+"""
+from bisect import insort
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class Standings:
+    """
+    The tournament points of the players, grouped in score buckets.
+
+    Points are multiples of 0.5, so the players are kept in one bucket per
+    score (in half points), and the scores in use are kept sorted. A result
+    moves a player from one bucket to another, and rank, top-k and score group
+    queries walk the buckets instead of sorting the players. The number of
+    buckets is at most 2 * rounds + 1, so updates and rank queries cost O(log
+    n) or better in practice.
+
+    A Standings object can be used as a read-only mapping of the points by
+    player ID.
+    """
+
+    def __init__(self, player_ids=()):
+        # Player ID -> points, in half points
+        self._half_points: Dict[str, int] = {}
+        # half points -> players with these points (a dict keeps the insertion
+        # order, for reproducible pairings)
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._scores: List[int] = []  # the keys of _buckets, ascending
+        for player_id in player_ids:
+            self.add(player_id)
+
+    def _insert(self, player_id: str, half_points: int):
+        bucket = self._buckets.get(half_points)
+        if bucket is None:
+            bucket = self._buckets[half_points] = {}
+            insort(self._scores, half_points)
+        bucket[player_id] = None
+        self._half_points[player_id] = half_points
+
+    def _remove(self, player_id: str) -> int:
+        half_points = self._half_points.pop(player_id)
+        bucket = self._buckets[half_points]
+        del bucket[player_id]
+        if not bucket:
+            del self._buckets[half_points]
+            self._scores.remove(half_points)
+        return half_points
+
+    def add(self, player_id: str, points: float = 0.0):
+        """
+        Adds a player (with no points by default). A player already present is
+        left unchanged.
+        """
+        if player_id not in self._half_points:
+            self._insert(player_id, round(2 * points))
+
+    def add_points(self, player_id: str, points: float):
+        """
+        Adds points (possibly negative, to cancel a result) to a player, adding
+        the player if needed.
+        """
+        half_points = (
+            self._remove(player_id) if player_id in self._half_points else 0
+        )
+        self._insert(player_id, half_points + round(2 * points))
+
+    # Mapping interface (points by player ID)
+
+    def __getitem__(self, player_id: str) -> float:
+        return self._half_points[player_id] / 2
+
+    def get(
+        self, player_id: str, default: Optional[float] = None
+    ) -> Optional[float]:
+        half_points = self._half_points.get(player_id)
+        return default if half_points is None else half_points / 2
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._half_points
+
+    def __len__(self) -> int:
+        return len(self._half_points)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._half_points)
+
+    def items(self):
+        return (
+            (player_id, half_points / 2)
+            for player_id, half_points in self._half_points.items()
+        )
+
+    def __eq__(self, other):
+        if isinstance(other, Standings):
+            return self._half_points == other._half_points
+        return NotImplemented
+
+    # Ranking queries
+
+    def groups(self) -> Iterator[Tuple[float, List[str]]]:
+        """
+        Yields the score groups, best first, as (points, player IDs) tuples.
+        """
+        for half_points in reversed(self._scores):
+            yield half_points / 2, list(self._buckets[half_points])
+
+    def group(self, points: float) -> List[str]:
+        """Returns the IDs of the players with the given points."""
+        return list(self._buckets.get(round(2 * points), ()))
+
+    def rank(self, player_id: str) -> int:
+        """
+        Returns the rank of a player (1 for the leaders). Players with the same
+        points share the same rank, as in "1, 2, 2, 4".
+        """
+        half_points = self._half_points[player_id]
+        ahead = 0
+        for score in reversed(self._scores):
+            if score == half_points:
+                return ahead + 1
+            ahead += len(self._buckets[score])
+        raise KeyError(player_id)
+
+    def ranked(
+        self, key: Optional[Callable[[str], object]] = None
+    ) -> Iterator[str]:
+        """
+        Yields the player IDs by decreasing points. Within a score group, the
+        players are sorted by `key` if given (only the groups actually consumed
+        are sorted), or in insertion order.
+        """
+        for _, players in self.groups():
+            if key is not None:
+                players.sort(key=key)
+            yield from players
+
+    def top(
+        self, k: int, key: Optional[Callable[[str], object]] = None
+    ) -> List[str]:
+        """Returns the IDs of the k best ranked players (see ranked)."""
+        players = []
+        for player_id in self.ranked(key):
+            if len(players) == k:
+                break
+            players.append(player_id)
+        return players
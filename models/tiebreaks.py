@@ -0,0 +1,160 @@
+"""
+Tiebreak scores of the players of a tournament, computed with NumPy.
+
+The results of the rounds are read once into two players x rounds matrices (the
+opponent of each player in each round, and the points the player scored). The
+tiebreaks are then array operations over these matrices:
+- buchholz: the sum of the points of the player's opponents
+- median_buchholz: the Buchholz score without the best and the worst opponent
+- sonneborn_berger: the sum of the points of the defeated opponents, plus half
+  the points of the drawn opponents (the points of each opponent weighted by
+  the result against them)
+- cumulative: the sum of the player's running score after each round (early
+  wins count more)
+
+Only the matches with a result are taken into account.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Tiebreak names, with their labels in the reports
+TIEBREAKS = {
+    "buchholz": "Buchholz",
+    "median_buchholz": "Median Buchholz",
+    "sonneborn_berger": "Sonneborn-Berger",
+    "cumulative": "Cumulative",
+}
+DEFAULT_TIEBREAKS = (
+    "median_buchholz",
+    "buchholz",
+    "sonneborn_berger",
+    "cumulative",
+)
+
+
+def check_tiebreaks(tiebreaks: Iterable[str]):
+    """Raises ValueError if a tiebreak name is unknown."""
+    unknown = [name for name in tiebreaks if name not in TIEBREAKS]
+    if unknown:
+        raise ValueError(
+            f"Unknown tiebreak(s): {', '.join(unknown)}. Expected: "
+            f"{', '.join(TIEBREAKS)}."
+        )
+
+
+class TiebreakTable:
+    """
+    The points and tiebreak scores of all the players of a tournament.
+
+    Attributes:
+        player_ids (List[str]): The registered players, followed by the players
+            only found in the rounds.
+        points (np.ndarray): The points of each player.
+        scores (Dict[str, np.ndarray]): The tiebreak scores of each player, by
+            tiebreak name.
+    """
+
+    def __init__(self, player_ids: Sequence[str], rounds: Sequence):
+        """
+        Args:
+            player_ids: The registered players of the tournament.
+            rounds: The rounds of the tournament (Round objects).
+        """
+        self.player_ids = list(player_ids)
+        self.index: Dict[str, int] = {
+            player_id: i for i, player_id in enumerate(self.player_ids)
+        }
+        self._registered = len(self.player_ids)
+
+        # One pass over the matches fills the matrices; everything else is
+        # vectorized
+        results = []
+        for number, round_ in enumerate(rounds):
+            for match in round_.matches:
+                if match.result is not None:
+                    results.append(
+                        (
+                            number,
+                            self._position(match.player1.player_id),
+                            self._position(match.player2.player_id),
+                            match.result[0],
+                            match.result[1],
+                        )
+                    )
+
+        count, round_count = len(self.player_ids), len(rounds)
+        opponents = np.full((count, round_count), -1, dtype=np.int64)
+        game_points = np.zeros((count, round_count))
+        if results:
+            number, player1, player2, points1, points2 = (
+                np.array(column) for column in zip(*results)
+            )
+            opponents[player1, number] = player2
+            opponents[player2, number] = player1
+            game_points[player1, number] = points1
+            game_points[player2, number] = points2
+
+        self.points = game_points.sum(axis=1)
+        played = opponents >= 0
+        # Points of the opponent of each game (0 where no game was played)
+        opponent_points = np.where(played, self.points[opponents], 0.0)
+        buchholz = opponent_points.sum(axis=1)
+
+        games = played.sum(axis=1)
+        if round_count:
+            best = np.where(played, opponent_points, -np.inf).max(axis=1)
+            worst = np.where(played, opponent_points, np.inf).min(axis=1)
+            median_buchholz = np.where(
+                games > 2, buchholz - best - worst, buchholz
+            )
+        else:
+            median_buchholz = buchholz
+
+        self.scores: Dict[str, np.ndarray] = {
+            "buchholz": buchholz,
+            "median_buchholz": median_buchholz,
+            "sonneborn_berger": (game_points * opponent_points).sum(axis=1),
+            "cumulative": np.cumsum(game_points, axis=1).sum(axis=1),
+        }
+
+    def _position(self, player_id: str) -> int:
+        """
+        Returns the row of a player, adding players that are not registered
+        (their points still count).
+        """
+        position = self.index.get(player_id)
+        if position is None:
+            position = self.index[player_id] = len(self.player_ids)
+            self.player_ids.append(player_id)
+        return position
+
+    def score(self, tiebreak: str, player_id: str) -> float:
+        """Returns the tiebreak score of a player."""
+        return float(self.scores[tiebreak][self.index[player_id]])
+
+    def rank(
+        self,
+        tiebreaks: Sequence[str],
+        ratings: Optional[Sequence[float]] = None,
+    ) -> List[str]:
+        """
+        Returns the registered players by decreasing points, then by decreasing
+        tiebreak scores in the order of the chain, then by decreasing rating
+        (if given).
+
+        Args:
+            tiebreaks: The tiebreak chain (names from TIEBREAKS).
+            ratings: The ratings of the registered players (in the order of
+                player_ids).
+        """
+        check_tiebreaks(tiebreaks)
+        registered = slice(0, self._registered)
+        # np.lexsort sorts by the last key first; values are negated for a
+        # decreasing order
+        keys = [-self.scores[name][registered] for name in reversed(tiebreaks)]
+        if ratings is not None:
+            keys.insert(0, -np.asarray(ratings, dtype=float))
+        keys.append(-self.points[registered])
+        order = np.lexsort(keys)
+        return [self.player_ids[i] for i in order]
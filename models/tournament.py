@@ -4,8 +4,25 @@ It includes attributes such as name, venue, start date, end date,
 number of rounds, a list of participating players, and detailed round/match data.
 """
 
+from collections import defaultdict
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+import random
+from typing import List, Dict, Optional, Any, Sequence, Set, Tuple
+from .arena import ARENA, ArenaPool
+from .clinch import ClinchAnalysis
+from .elo import rate_results
+from .identity_map import PlayerIdentityMap
+from .match import Match
+from .pairing import PAIRING_MODES, pair_random
+from .player import Player
+from .round import Round
+from .round_robin import ROUND_ROBIN_CYCLES, RoundRobinSchedule
+from .standings import Standings
+from .tiebreaks import DEFAULT_TIEBREAKS, TiebreakTable, check_tiebreaks
+
+# Every value accepted for Tournament.pairing
+PAIRINGS = (*PAIRING_MODES, *ROUND_ROBIN_CYCLES, ARENA)
+
 
 class Tournament:
     """
@@ -23,12 +40,41 @@ class Tournament:
         finished (bool): True if the tournament is officially closed/reported.
         players (list): A list of player IDs (e.g., Chess Identifiers)
                         participating in the tournament.
-        rounds (List[List[Dict[str, Any]]]): A list of rounds, where each round is a list of matches.
-                                             Each match is a dictionary with:
-                                             - "players": List[str] (two player IDs)
-                                             - "completed": bool
-                                             - "winner": Optional[str] (player ID or None for tie)
+        roster (Dict[str, Player]): The Player objects of the registered
+            players, by ID. They are shared with the other tournaments of the
+            session.
+        rounds (List[Round]): The rounds played so far. In the JSON format,
+            each round is a list of matches, and each match is a dictionary
+            with:
+            - "players": List[str] (two player IDs)
+            - "completed": bool
+            - "winner": Optional[str] (player ID or None for tie)
+        standings (Standings): The tournament points of each player, by ID,
+            kept ranked as results are recorded.
+        points (Standings): The same object, as a mapping of the points by
+            player ID.
+        opponents (Dict[str, Set[str]]): The IDs of the players each player has
+            been paired with, by ID.
+        matches (Dict[str, Match]): The matches of all the rounds, by match ID.
+        history (Dict[str, List[Tuple[int, Match]]]): The (round number, match)
+            pairs of each player, by ID, in the order of the rounds.
         description (str): A general description or notes about the tournament.
+        version (int): The version of the stored tournament this object was
+            loaded from or saved as (0 if it was never saved). See
+            models.concurrency.
+        pairing (str): How the rounds after the first one are paired: "swiss"
+            (greedy, as in notes/matchmaking.md) or "optimal" (maximum-weight
+            matching). See models.pairing. "round_robin" and
+            "double_round_robin" play an all-play-all schedule instead (see
+            models.round_robin): the number of rounds follows from the number
+            of players. "arena" pairs players again as soon as their game is
+            over (see models.arena): each game goes in the round after the last
+            rounds of its two players.
+        tiebreaks (List[str]): The tiebreak chain ordering the players with the
+            same points (names from models.tiebreaks.TIEBREAKS). Elo ratings
+            decide last.
+        rated_rounds (int): The number of rounds (from the first one) whose
+            results were applied to the Elo ratings of the players.
     """
 
     def __init__(self,
@@ -41,8 +87,13 @@ class Tournament:
                  current_round: Optional[int] = 0, # 0 could mean not started, None could mean finished
                  completed: bool = False,
                  finished: bool = False,
-                 rounds: List[List[Dict[str, Any]]] = None,
-                 description: str = ""):
+                 rounds: List[Round] = None,
+                 description: str = "",
+                 roster: Dict[str, Player] = None,
+                 version: int = 0,
+                 pairing: str = "swiss",
+                 tiebreaks: Optional[Sequence[str]] = None,
+                 rated_rounds: int = 0):
         """
         Initializes a new Tournament instance.
 
@@ -56,20 +107,437 @@ class Tournament:
             current_round (Optional[int], optional): The current round number. Defaults to 0.
             completed (bool, optional): Whether all rounds are played. Defaults to False.
             finished (bool, optional): Whether the tournament is officially finished. Defaults to False.
-            rounds (List[List[Dict[str, Any]]], optional): List of round data. Defaults to empty list.
+            rounds (List[Round], optional): List of rounds. Defaults to empty
+                list.
             description (str, optional): Tournament description. Defaults to "".
+            roster (Dict[str, Player], optional): The Player objects of the
+                players, by ID. Defaults to empty dict.
+            version (int, optional): The version of the stored tournament.
+                Defaults to 0 (never saved).
+            pairing (str, optional): The pairing mode of the rounds after the
+                first one. Defaults to "swiss".
+            tiebreaks (Sequence[str], optional): The tiebreak chain. Defaults
+                to DEFAULT_TIEBREAKS.
+            rated_rounds (int, optional): The number of rounds already rated.
+                Defaults to 0.
         """
+        if pairing not in PAIRINGS:
+            raise ValueError(
+                f"Unknown pairing mode '{pairing}'. Expected one of: "
+                f"{', '.join(PAIRINGS)}."
+            )
         self.name = name
         self.venue = venue
         self.start_date = start_date
         self.end_date = end_date
         self.num_rounds = num_rounds
         self.players = players if players is not None else []
+        self._registered = set(self.players)  # for O(1) registration checks
         self.current_round = current_round
         self.completed = completed
         self.finished = finished
         self.rounds = rounds if rounds is not None else []
         self.description = description
+        self.roster = roster if roster is not None else {}
+        self.version = version
+        self.pairing = pairing
+        self.tiebreaks = list(
+            DEFAULT_TIEBREAKS if tiebreaks is None else tiebreaks
+        )
+        check_tiebreaks(self.tiebreaks)
+        self.rated_rounds = rated_rounds
+        # The tiebreak table is computed again only after results or
+        # registrations changed
+        self._results_version = 0
+        self._tiebreak_table = None
+        # Points and opponents are per tournament: they cannot live on the
+        # shared Player objects
+        self.standings = Standings(self.players)
+        self.opponents: Dict[str, Set[str]] = defaultdict(set)
+        # Indexes of the matches, kept up to date as matches are added (see
+        # _track)
+        self.matches: Dict[str, Match] = {}
+        self.history: Dict[str, List[Tuple[int, Match]]] = defaultdict(list)
+        # The last round each player played in (arena tournaments place the
+        # games with it)
+        self._last_round: Dict[str, int] = {}
+        for number, round_ in enumerate(self.rounds, 1):
+            for match in round_.matches:
+                self._track(match, number)
+                self._add_result(
+                    match.player1.player_id,
+                    match.player2.player_id,
+                    match.result,
+                    1,
+                )
+                for player in (match.player1, match.player2):
+                    self._last_round[player.player_id] = number
+        # The pool of the players waiting for a game, while an arena tournament
+        # is running
+        self.arena: Optional[ArenaPool] = None
+        if self.is_arena and self.rounds and not self.completed:
+            self.arena = ArenaPool(self.opponents)
+            for round_ in self.rounds:
+                for match in round_.matches:
+                    self.arena.last_opponent[match.player1.player_id] = (
+                        match.player2.player_id
+                    )
+                    self.arena.last_opponent[match.player2.player_id] = (
+                        match.player1.player_id
+                    )
+            busy = {
+                player.player_id
+                for match in self.ongoing_matches()
+                for player in (match.player1, match.player2)
+            }
+            self._arena_join(
+                [
+                    player_id
+                    for player_id in self.players
+                    if player_id not in busy
+                ]
+            )
+
+    @property
+    def points(self) -> Standings:
+        """The tournament points of the players, by ID (the standings)."""
+        return self.standings
+
+    def _track(self, match: Match, number: int):
+        """
+        Records that the two players of a match have been paired (in round
+        `number`), indexes the match, and follows its results.
+        """
+        player1_id, player2_id = (
+            match.player1.player_id,
+            match.player2.player_id,
+        )
+        self.opponents[player1_id].add(player2_id)
+        self.opponents[player2_id].add(player1_id)
+        self.matches[match.match_id] = match
+        self.history[player1_id].append((number, match))
+        self.history[player2_id].append((number, match))
+        match.on_result = self._result_recorded
+
+    def _add_result(
+        self,
+        player1_id: str,
+        player2_id: str,
+        result: Optional[tuple],
+        sign: int,
+    ):
+        """
+        Adds (sign=1) or removes (sign=-1) the points of a match result to the
+        standings.
+        """
+        if result is not None:
+            self.standings.add_points(player1_id, sign * result[0])
+            self.standings.add_points(player2_id, sign * result[1])
+
+    def _result_recorded(self, match: Match, previous_result: Optional[tuple]):
+        """
+        Updates the standings when a result is set on a match (a corrected
+        result replaces the previous one).
+        """
+        player1_id, player2_id = (
+            match.player1.player_id,
+            match.player2.player_id,
+        )
+        self._add_result(player1_id, player2_id, previous_result, -1)
+        self._add_result(player1_id, player2_id, match.result, 1)
+        self._results_version += 1
+
+    def record_result(self, match: Match, winner_id: str) -> List[Match]:
+        """
+        Records the result of a match of the tournament. The standings follow
+        (see Match.set_winner). In a running arena, the two players are then
+        paired again if opponents are waiting.
+
+        Args:
+            match (Match): The match.
+            winner_id (str): The ID of the winner, or "draw".
+
+        Returns:
+            List[Match]: The new games (arena tournaments only).
+        """
+        first_result = match.result is None
+        match.set_winner(winner_id)
+        if self.arena is None or not first_result:
+            return []
+        return self._arena_join(
+            [match.player1.player_id, match.player2.player_id]
+        )
+
+    def record_results(
+        self, results: Sequence[Tuple[Match, str]]
+    ) -> List[Match]:
+        """
+        Records the results of several matches in one pass (e.g. from
+        models.result_import.read_results).
+
+        Args:
+            results (Sequence[Tuple[Match, str]]): The matches, with the ID of
+                their winner or "draw".
+
+        Returns:
+            List[Match]: The new games (arena tournaments only).
+        """
+        new_matches = []
+        for match, winner_id in results:
+            new_matches += self.record_result(match, winner_id)
+        return new_matches
+
+    def get_match(self, match_id: str) -> Optional[Match]:
+        """Returns the match with the given ID, or None."""
+        return self.matches.get(match_id)
+
+    def player_history(self, player_id: str) -> List[Tuple[int, Match]]:
+        """
+        Returns the (round number, match) pairs of a player, in the order of
+        the rounds.
+        """
+        return list(self.history.get(player_id, ()))
+
+    def opponents_of(self, player_id: str) -> List[str]:
+        """
+        Returns the IDs of the opponents of a player, in the order of the
+        rounds (repeated for rematches).
+        """
+        return [
+            (
+                match.player2.player_id
+                if match.player1.player_id == player_id
+                else match.player1.player_id
+            )
+            for _, match in self.history.get(player_id, ())
+        ]
+
+    def ongoing_matches(self) -> List[Match]:
+        """
+        Returns the matches without a result: those of the current round (of
+        any round, in an arena).
+        """
+        rounds = self.rounds if self.is_arena else self.rounds[-1:]
+        return [
+            match
+            for round_ in rounds
+            for match in round_.matches
+            if match.result is None
+        ]
+
+    @property
+    def is_round_robin(self) -> bool:
+        """True if the tournament plays an all-play-all schedule."""
+        return self.pairing in ROUND_ROBIN_CYCLES
+
+    @property
+    def is_arena(self) -> bool:
+        """True if the players are paired continuously (see models.arena)."""
+        return self.pairing == ARENA
+
+    def _arena_join(self, player_ids: List[str]) -> List[Match]:
+        """
+        Puts players in the arena pool, and starts the games of those who found
+        an opponent.
+        """
+        new_matches = []
+        for player_id in player_ids:
+            player = self.roster[player_id]
+            opponent_id = self.arena.join(
+                player_id,
+                round(2 * self.points.get(player_id, 0.0)),
+                player.elo_rating,
+            )
+            if opponent_id is not None:
+                new_matches.append(
+                    self._add_arena_match(opponent_id, player_id)
+                )
+        return new_matches
+
+    def _add_arena_match(self, player1_id: str, player2_id: str) -> Match:
+        """
+        Starts an arena game. It goes in the round after the last rounds of
+        both players, so each player has at most one game per round (and never
+        in a round already rated).
+        """
+        number = (
+            max(
+                self._last_round.get(player1_id, 0),
+                self._last_round.get(player2_id, 0),
+                self.rated_rounds,
+            )
+            + 1
+        )
+        if number > len(self.rounds):
+            self.rounds.append(Round(
+                round_id=str(number),
+                name=f"Round {number}",
+                start_time=datetime.now().strftime('%d-%m-%Y %H:%M'),
+                end_time=None,
+            ))
+            self.current_round = number
+        round_ = self.rounds[number - 1]
+        match = Match(
+            f"{number}-{len(round_.matches) + 1}",
+            self.roster[player1_id],
+            self.roster[player2_id],
+        )
+        round_.matches.append(match)
+        self._track(match, number)
+        self._last_round[player1_id] = self._last_round[player2_id] = number
+        return match
+
+    def schedule(self) -> RoundRobinSchedule:
+        """
+        Returns the round-robin schedule of the tournament (rounds are computed
+        when accessed).
+
+        Raises:
+            ValueError: If the tournament is not a round robin, or has fewer
+                than two players.
+        """
+        if not self.is_round_robin:
+            raise ValueError(f"Tournament '{self.name}' is not a round robin.")
+        return RoundRobinSchedule(
+            self.players, ROUND_ROBIN_CYCLES[self.pairing]
+        )
+
+    def update_player_elos_based_on_results(self) -> Dict[str, int]:
+        """
+        Applies the results of the finished rounds not rated yet to the Elo
+        ratings of the players (see models.elo). The rounds are rated as one
+        batch, against the ratings before the batch, and each round is rated
+        only once: a result corrected afterwards does not change the ratings.
+
+        Returns:
+            Dict[str, int]: The new ratings of the players of the rated rounds,
+                by ID (empty if no round was ready). The shared Player objects
+                are updated.
+        """
+        start = end = self.rated_rounds
+        while end < len(self.rounds) and self.rounds[end].is_finished():
+            end += 1
+        if end == start:
+            return {}
+
+        matches = [
+            match
+            for round_ in self.rounds[start:end]
+            for match in round_.matches
+        ]
+        players = {}
+        for match in matches:
+            players[match.player1.player_id] = match.player1
+            players[match.player2.player_id] = match.player2
+        ratings = rate_results(
+            {
+                player_id: player.elo_rating
+                for player_id, player in players.items()
+            },
+            [
+                (
+                    match.player1.player_id,
+                    match.player2.player_id,
+                    match.result[0],
+                )
+                for match in matches
+            ],
+        )
+        for player_id, rating in ratings.items():
+            players[player_id].elo_rating = rating
+        self.rated_rounds = end
+        return ratings
+
+    def tiebreak_table(self) -> TiebreakTable:
+        """
+        Returns the tiebreak scores of the players (computed once per state of
+        the results).
+        """
+        if (
+            self._tiebreak_table is None
+            or self._tiebreak_table[0] != self._results_version
+        ):
+            self._tiebreak_table = (
+                self._results_version,
+                TiebreakTable(self.players, self.rounds),
+            )
+        return self._tiebreak_table[1]
+
+    def get_ranked_players(
+        self, tiebreaks: Optional[Sequence[str]] = None
+    ) -> List[Player]:
+        """
+        Returns the registered players by decreasing points. Players with the
+        same points are ordered by the tiebreak chain, then by decreasing Elo
+        rating.
+
+        Args:
+            tiebreaks (Sequence[str], optional): The tiebreak chain. Defaults
+                to the tournament's chain; an empty chain orders the players
+                with the same points by Elo rating only.
+        """
+        roster = self.roster
+        chain = self.tiebreaks if tiebreaks is None else tiebreaks
+        if not chain:
+            # The standings already group the players by points: only the
+            # groups are sorted
+            return [
+                roster[player_id]
+                for player_id in self.standings.ranked(
+                    key=lambda player_id: -roster[player_id].elo_rating
+                )
+                if player_id in roster
+            ]
+
+        ratings = [
+            roster[player_id].elo_rating if player_id in roster else 0
+            for player_id in self.players
+        ]
+        return [
+            roster[player_id]
+            for player_id in self.tiebreak_table().rank(chain, ratings)
+            if player_id in roster
+        ]
+
+    def clinch_analysis(self) -> ClinchAnalysis:
+        """
+        Returns the remaining games of the tournament, to answer clinch /
+        elimination questions (see models.clinch). The analysis is a copy: it
+        does not follow later results.
+
+        Raises:
+            ValueError: For an arena tournament.
+        """
+        return ClinchAnalysis(self)
+
+    def has_clinched(self, player_id: str, places: int = 1) -> bool:
+        """
+        True if the player finishes in the top `places` whatever the remaining
+        results and tiebreaks.
+        """
+        return self.clinch_analysis().has_clinched(player_id, places)
+
+    def can_still_reach(self, player_id: str, places: int = 1) -> bool:
+        """
+        True if some remaining results (and tiebreaks) put the player in the
+        top `places`.
+        """
+        return self.clinch_analysis().can_reach(player_id, places)
+
+    def contenders(self, places: int = 1) -> List[str]:
+        """
+        Returns the IDs of the players who can still finish in the top
+        `places`, by decreasing points.
+
+        Raises:
+            ValueError: For an arena tournament.
+        """
+        analysis = self.clinch_analysis()
+        return [
+            player_id
+            for player_id in self.standings.ranked()
+            if analysis.can_reach(player_id, places)
+        ]
 
     def __str__(self):
         """
@@ -80,6 +548,146 @@ class Tournament:
                 f"({self.start_date.strftime('%d-%m-%Y')} to {self.end_date.strftime('%d-%m-%Y')}) "
                 f"Status: {status}")
 
+    def add_player(self, player: Player) -> bool:
+        """
+        Registers a player in the tournament.
+
+        Args:
+            player (Player): The player (from the session's PlayerIdentityMap).
+
+        Returns:
+            bool: True if the player was added, False if already registered.
+
+        Raises:
+            ValueError: If the tournament is a round robin that has started
+                (its schedule is fixed).
+        """
+        if player.player_id in self._registered:
+            return False
+        if self.is_round_robin and self.rounds:
+            raise ValueError(
+                f"Round robin '{self.name}' has started: registrations are "
+                "closed."
+            )
+
+        self.players.append(player.player_id)
+        self._registered.add(player.player_id)
+        self.roster[player.player_id] = player
+        self.standings.add(player.player_id)
+        self._results_version += 1
+        if self.arena is not None:
+            # Late entries join the running arena
+            self._arena_join([player.player_id])
+        return True
+
+    def _add_round(self, pairs: List[tuple]) -> Round:
+        """
+        Creates the next round from pairs of player IDs and makes it the
+        current round.
+        """
+        number = len(self.rounds) + 1
+        new_round = Round(
+            round_id=str(number),
+            name=f"Round {number}",
+            start_time=datetime.now().strftime('%d-%m-%Y %H:%M'),
+            end_time=None,
+            matches=[
+                Match(
+                    f"{number}-{board}",
+                    self.roster[player1_id],
+                    self.roster[player2_id],
+                )
+                for board, (player1_id, player2_id) in enumerate(pairs, 1)
+            ],
+        )
+        for match in new_round.matches:
+            self._track(match, number)
+        self.rounds.append(new_round)
+        self.current_round = number
+        return new_round
+
+    def start_first_round(self, rng: Optional[random.Random] = None) -> Round:
+        """
+        Starts the tournament: the players are paired randomly (see
+        notes/matchmaking.md). A round robin starts its schedule instead, and
+        its number of rounds is set from it. An arena opens its pool: the
+        players join it in a random order and are paired as they join.
+
+        Args:
+            rng (random.Random, optional): The random generator. Defaults to
+                the `random` module.
+
+        Returns:
+            Round: The first round.
+
+        Raises:
+            ValueError: If the tournament has already started, or has an odd
+                number of players (a round robin gives a bye instead).
+        """
+        if self.rounds:
+            raise ValueError(f"Tournament '{self.name}' has already started.")
+        if self.is_round_robin:
+            schedule = self.schedule()
+            self.num_rounds = len(schedule)
+            return self._add_round(schedule[0])
+        if self.is_arena:
+            if len(self.players) < 2:
+                raise ValueError("An arena needs at least two players.")
+            self.arena = ArenaPool(self.opponents)
+            arrivals = list(self.players)
+            (rng or random).shuffle(arrivals)
+            self._arena_join(arrivals)
+            return self.rounds[0]
+        return self._add_round(pair_random(self.players, rng))
+
+    def advance_round(
+        self, rng: Optional[random.Random] = None
+    ) -> Optional[Round]:
+        """
+        Closes the current round and pairs the next one by points, avoiding
+        rematches (see notes/matchmaking.md), with the tournament's pairing
+        mode. A round robin takes the next round of its schedule. After the
+        last round, the tournament is marked as completed. An arena is closed
+        instead: no more games are paired (games in progress can still be
+        recorded).
+
+        Args:
+            rng (random.Random, optional): The random generator deciding
+                between players with the same points.
+
+        Returns:
+            Optional[Round]: The new round, or None if the tournament is now
+                completed.
+
+        Raises:
+            ValueError: If the current round has matches without a result
+                (except in an arena).
+        """
+        if not self.rounds:
+            return self.start_first_round(rng)
+        if self.is_arena:
+            self.arena = None
+            self.completed = True
+            self.current_round = None
+            return None
+
+        current = self.rounds[-1]
+        if not current.is_finished():
+            raise ValueError(f"{current.name} has matches without a result.")
+        if current.end_time is None:
+            current.end_time = datetime.now().strftime('%d-%m-%Y %H:%M')
+
+        if len(self.rounds) >= self.num_rounds:
+            self.completed = True
+            self.current_round = None
+            return None
+        if self.is_round_robin:
+            return self._add_round(self.schedule()[len(self.rounds)])
+        pair = PAIRING_MODES[self.pairing]
+        return self._add_round(
+            pair(self.players, self.points, self.opponents, rng)
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Converts the Tournament object to a dictionary for JSON serialization,
@@ -97,17 +705,55 @@ class Tournament:
             "completed": self.completed,
             "finished": self.finished,
             "players": self.players,
-            "rounds": self.rounds
+            "rounds": [round_.to_spec() for round_ in self.rounds],
+            "pairing": self.pairing,
+            "tiebreaks": self.tiebreaks,
+            "rated_rounds": self.rated_rounds,
+            "version": self.version
         }
 
+    def replace_state(self, other: "Tournament"):
+        """
+        Takes the whole state of another Tournament object (e.g. loaded from
+        merged data), so that the code holding this object sees it. The matches
+        then report their results to this object.
+        """
+        self.__dict__.update(other.__dict__)
+        for match in self.matches.values():
+            match.on_result = self._result_recorded
+
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]):
+    def from_dict(
+        cls, data: Dict[str, Any], identity_map: PlayerIdentityMap = None
+    ):
         """
         Creates a Tournament object from a dictionary, parsing dates and
         other attributes from the specified JSON format.
+
+        Args:
+            data (Dict[str, Any]): The tournament data.
+            identity_map (PlayerIdentityMap, optional): The session's map of
+                players. All the tournaments loaded with the same map share
+                their Player objects. Defaults to a map of its own.
         """
         start_date_str = data["dates"]["from"]
         end_date_str = data["dates"]["to"]
+        if identity_map is None:
+            identity_map = PlayerIdentityMap()
+
+        # All the players of the tournament (registered or found in the rounds)
+        # are resolved in one batch
+        player_ids = data.get("players", [])
+        rounds_data = data.get("rounds", [])
+        identity_map.resolve(
+            player_ids
+            + [
+                player_id
+                for matches in rounds_data
+                for m_data in matches
+                for player_id in m_data["players"]
+            ]
+        )
 
         return cls(
             name=data["name"],
@@ -115,11 +761,20 @@ class Tournament:
             start_date=datetime.strptime(start_date_str, '%d-%m-%Y'),
             end_date=datetime.strptime(end_date_str, '%d-%m-%Y'),
             num_rounds=data["number_of_rounds"],
-            players=data.get("players", []),
+            players=list(player_ids),
             current_round=data.get("current_round"), # Will load None if null in JSON
             completed=data.get("completed", False),
             finished=data.get("finished", False),
-            rounds=data.get("rounds", []),
-            description=data.get("description", "") # Assuming description might not always be in JSON
+            rounds=[
+                Round.from_spec(number, matches, identity_map)
+                for number, matches in enumerate(rounds_data, 1)
+            ],
+            description=data.get("description", ""), # Assuming description might not always be in JSON
+            roster={
+                player_id: identity_map[player_id] for player_id in player_ids
+            },
+            version=data.get("version", 0),
+            pairing=data.get("pairing", "swiss"),
+            tiebreaks=data.get("tiebreaks"),
+            rated_rounds=data.get("rated_rounds", 0)
         )
-
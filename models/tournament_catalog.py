@@ -0,0 +1,341 @@
+"""
+This module defines the TournamentCatalog class, a persistent on-disk index
+of the tournament JSON files stored in a directory.
+
+The catalog records, for every tournament file, the header information needed
+to list or find a tournament (name, dates, venue, status) together with the
+file's modification time and size. Only files whose mtime/size changed since
+the last scan are parsed again, so name lookups and existence checks do not
+need to open unrelated tournament files.
+"""
+
+from typing import Dict, List, Optional, Any
+import json
+import os
+
+
+def sidecar_path(directory: str, suffix: str) -> str:
+    """
+    Returns the path of a hidden file next to a directory, named after it
+    (e.g. data/.tournaments.catalog for data/tournaments and ".catalog").
+
+    The indexes of a directory are kept there: writing them inside the
+    directory would change its mtime, which the catalog relies on to skip
+    scans.
+    """
+    directory = os.path.abspath(directory)
+    return os.path.join(
+        os.path.dirname(directory), f".{os.path.basename(directory)}{suffix}"
+    )
+
+
+class TournamentCatalog:
+    """
+    Maintains an index of the tournaments stored as JSON files in a directory.
+
+    The index is persisted in a hidden file next to the storage directory (e.g.
+    data/.tournaments.catalog) and is reconciled with the directory contents
+    using `os.stat` information only. The directory's own mtime is remembered
+    as well: as long as no file has been added, removed or renamed, lookups
+    skip the directory scan entirely. The index is kept out of the directory
+    (see sidecar_path). The directory mtime does not change when a file is
+    rewritten in place, so lookups still check the mtime and size of the file
+    they return.
+    """
+
+    INDEX_SUFFIX = ".catalog"
+    INDEX_VERSION = 1
+
+    def __init__(self, storage_directory: str):
+        """
+        Initializes the catalog and loads the persisted index, if any.
+
+        Args:
+            storage_directory (str): The directory holding the tournament JSON
+                files.
+        """
+        self.storage_directory = storage_directory
+        self.index_path = sidecar_path(storage_directory, self.INDEX_SUFFIX)
+        self._entries: Dict[str, Dict[str, Any]] = {}  # filename -> entry
+        self._by_name: Dict[str, str] = {}  # tournament name -> filename
+        self._directory_mtime_ns: Optional[int] = None
+        self._load_index()
+
+    def _load_index(self):
+        """
+        Loads the persisted index. A missing or unreadable index is simply
+        rebuilt.
+        """
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != self.INDEX_VERSION
+        ):
+            return
+        self._entries = data.get("entries", {})
+        self._directory_mtime_ns = data.get("directory_mtime_ns")
+        self._rebuild_name_index()
+
+    def _save_index(self):
+        """
+        Writes the index to disk (temp file + rename, so it is never left
+        half-written).
+        """
+        data = {
+            "version": self.INDEX_VERSION,
+            "directory_mtime_ns": self._directory_mtime_ns,
+            "entries": self._entries,
+        }
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            print(
+                "Warning: Could not write tournament catalog "
+                f"{self.index_path}: {e}"
+            )
+
+    def _rebuild_name_index(self):
+        """Rebuilds the name -> filename mapping from the entries."""
+        self._by_name = {
+            entry["name"]: filename
+            for filename, entry in self._entries.items()
+        }
+
+    @staticmethod
+    def _status(data: Dict[str, Any]) -> str:
+        """Derives a short status label from the tournament JSON data."""
+        if data.get("finished"):
+            return "finished"
+        if data.get("completed"):
+            return "completed"
+        if not data.get("current_round"):
+            return "not started"
+        return "in progress"
+
+    def _read_entry(
+        self, filename: str, stat: os.stat_result
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parses a tournament file and extracts its catalog entry.
+
+        Args:
+            filename (str): The file name, relative to the storage directory.
+            stat (os.stat_result): The file's stat information.
+
+        Returns:
+            Optional[Dict[str, Any]]: The catalog entry, or None if the file is
+                not a valid tournament.
+        """
+        filepath = os.path.join(self.storage_directory, filename)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {
+                "name": data["name"],
+                "path": filename,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "dates": data["dates"],
+                "venue": data["venue"],
+                "status": self._status(data),
+            }
+        except json.JSONDecodeError:
+            print(
+                f"Warning: Could not decode JSON from {filepath}. Skipping "
+                "file."
+            )
+        except (KeyError, TypeError) as e:
+            print(
+                f"Warning: Missing key {e} in JSON from {filepath}. Skipping "
+                "file."
+            )
+        except OSError as e:
+            print(
+                "An unexpected error occurred reading tournament from "
+                f"{filepath}: {e}"
+            )
+        return None
+
+    @staticmethod
+    def _is_fresh(
+        entry: Optional[Dict[str, Any]], stat: os.stat_result
+    ) -> bool:
+        """Checks whether an entry still matches the file's mtime and size."""
+        return (entry is not None
+                and entry["mtime_ns"] == stat.st_mtime_ns
+                and entry["size"] == stat.st_size)
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Reconciles the index with the storage directory.
+
+        Every JSON file is stat'ed, but only new files and files whose mtime or
+        size changed are parsed. Entries of deleted files are dropped. Unless
+        `force` is set, the scan is skipped when the directory mtime has not
+        changed since the last scan.
+
+        Args:
+            force (bool): Stat every file even if the directory itself did not
+                change.
+
+        Returns:
+            bool: True if the index was modified (and saved), False otherwise.
+        """
+        try:
+            directory_mtime_ns = os.stat(self.storage_directory).st_mtime_ns
+        except FileNotFoundError:
+            directory_mtime_ns = None
+
+        if (
+            not force
+            and directory_mtime_ns is not None
+            and directory_mtime_ns == self._directory_mtime_ns
+        ):
+            return False
+
+        changed = directory_mtime_ns != self._directory_mtime_ns
+        entries = {}
+        if directory_mtime_ns is not None:
+            with os.scandir(self.storage_directory) as it:
+                for dir_entry in it:
+                    if (
+                        not dir_entry.name.endswith(".json")
+                        or not dir_entry.is_file()
+                    ):
+                        continue
+                    stat = dir_entry.stat()
+                    entry = self._entries.get(dir_entry.name)
+                    if not self._is_fresh(entry, stat):
+                        entry = self._read_entry(dir_entry.name, stat)
+                        changed = True
+                    if entry is not None:
+                        entries[dir_entry.name] = entry
+
+        if changed or entries.keys() != self._entries.keys():
+            self._entries = entries
+            self._directory_mtime_ns = directory_mtime_ns
+            self._rebuild_name_index()
+            self._save_index()
+            return True
+        return False
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Finds the catalog entry of a tournament by name.
+
+        Only the matching file is stat'ed (and re-parsed if it changed); the
+        directory is scanned only when files were added, removed or renamed
+        since the last scan.
+
+        Args:
+            name (str): The tournament name.
+
+        Returns:
+            Optional[Dict[str, Any]]: The catalog entry if found, None
+                otherwise.
+        """
+        self.refresh()
+        filename = self._by_name.get(name)
+        if filename is None:
+            return None
+
+        try:
+            stat = os.stat(os.path.join(self.storage_directory, filename))
+        except FileNotFoundError:
+            self.forget(filename)
+            return None
+
+        entry = self._entries[filename]
+        if not self._is_fresh(entry, stat):
+            # The file was rewritten in place: its name may have changed too
+            entry = self._read_entry(filename, stat)
+            if entry is None:
+                self.forget(filename)
+                return None
+            self._entries[filename] = entry
+            self._rebuild_name_index()
+            self._save_index()
+            if entry["name"] != name:
+                return None
+        return entry
+
+    def __contains__(self, name: str) -> bool:
+        """Checks whether a tournament with the given name exists."""
+        return self.lookup(name) is not None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Returns all catalog entries, after a full stat-based refresh.
+
+        Returns:
+            List[Dict[str, Any]]: The catalog entries (one per valid tournament
+                file).
+        """
+        self.refresh(force=True)
+        return list(self._entries.values())
+
+    def record(
+        self,
+        filepath: str,
+        data: Dict[str, Any],
+        directory_mtime_ns: Optional[int] = None,
+    ):
+        """
+        Updates the entry of a file that has just been written by the
+        application, without parsing it again.
+
+        Writing the file (temporary file, lock file, rename) changes the
+        directory mtime. If the index was up to date with the directory before
+        the write, the new mtime is recorded, so the application's own saves do
+        not force a scan on the next refresh.
+
+        Args:
+            filepath (str): The path of the tournament file.
+            data (Dict[str, Any]): The tournament data that was written (as
+                from `Tournament.to_dict`).
+            directory_mtime_ns (int, optional): The mtime of the directory
+                before the write.
+        """
+        filename = os.path.basename(filepath)
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return
+        if (
+            directory_mtime_ns is not None
+            and directory_mtime_ns == self._directory_mtime_ns
+        ):
+            self._directory_mtime_ns = os.stat(
+                self.storage_directory
+            ).st_mtime_ns
+        self._entries[filename] = {
+            "name": data["name"],
+            "path": filename,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "dates": data["dates"],
+            "venue": data["venue"],
+            "status": self._status(data),
+        }
+        self._rebuild_name_index()
+        self._save_index()
+
+    def forget(self, filepath: str):
+        """
+        Removes the entry of a deleted file.
+
+        Args:
+            filepath (str): The path (or file name) of the tournament file.
+        """
+        filename = os.path.basename(filepath)
+        if self._entries.pop(filename, None) is not None:
+            self._rebuild_name_index()
+            self._save_index()
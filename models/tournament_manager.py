@@ -7,6 +7,8 @@ It ensures data persistence and synchronization with in-memory objects.
 
 from typing import List, Optional, Any, Dict
 from models.tournament import Tournament  # Assuming tournament.py is in the same 'models' package
+from models.identity_map import PlayerIdentityMap
+from models.tournament_catalog import TournamentCatalog
 from datetime import datetime
 import json
 import os
@@ -32,7 +34,11 @@ class TournamentManager:
         self.storage_directory = storage_directory
         self._ensure_storage_directory_exists()
         # Tournaments are loaded on demand or when getting all tournaments
-        # to ensure the latest state from disk.
+        # to ensure the latest state from disk. The catalog tells us which file
+        # holds which tournament without parsing all of them.
+        self.catalog = TournamentCatalog(self.storage_directory)
+        # The loaded tournaments share their Player objects
+        self.identity_map = PlayerIdentityMap()
 
     def _ensure_storage_directory_exists(self):
         """Ensures the directory for tournament storage files exists."""
@@ -55,11 +61,46 @@ class TournamentManager:
         safe_name = safe_name.replace(' ', '_')
         return os.path.join(self.storage_directory, f"{safe_name}.json")
 
+    def _load_tournament_file(self, filepath: str) -> Optional[Tournament]:
+        """
+        Loads a single tournament from its JSON file.
+
+        Args:
+            filepath (str): The path to the tournament's JSON file.
+
+        Returns:
+            Optional[Tournament]: The Tournament object, or None if the file
+                could not be loaded.
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                if isinstance(data, dict):
+                    return Tournament.from_dict(data, self.identity_map)
+                # No need for 'elif isinstance(data, list)' as per project spec
+                # and single tournament per file assumption.
+        except json.JSONDecodeError:
+            print(
+                f"Warning: Could not decode JSON from {filepath}. Skipping "
+                "file."
+            )
+        except KeyError as e:
+            print(
+                f"Warning: Missing key {e} in JSON from {filepath}. Skipping "
+                "file."
+            )
+        except Exception as e:
+            print(
+                "An unexpected error occurred loading tournament from "
+                f"{filepath}: {e}"
+            )
+        return None
+
     def _load_all_tournaments(self) -> List[Tournament]:
         """
         Loads all tournament data from JSON files in the storage directory.
-        This method is called when `get_all_tournaments` or `get_tournament_by_name`
-        is invoked to ensure the in-memory list is always synchronized with the files.
+        This method is called when `get_all_tournaments` is invoked to ensure
+        the in-memory list is always synchronized with the files.
 
         Returns:
             List[Tournament]: A list of Tournament objects loaded from files.
@@ -68,22 +109,12 @@ class TournamentManager:
         if not os.path.exists(self.storage_directory):
             return loaded_tournaments
 
-        for filename in os.listdir(self.storage_directory):
-            if filename.endswith(".json"):
-                filepath = os.path.join(self.storage_directory, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        if isinstance(data, dict):
-                            loaded_tournaments.append(Tournament.from_dict(data))
-                        # No need for 'elif isinstance(data, list)' as per project spec
-                        # and single tournament per file assumption.
-                except json.JSONDecodeError:
-                    print(f"Warning: Could not decode JSON from {filepath}. Skipping file.")
-                except KeyError as e:
-                    print(f"Warning: Missing key {e} in JSON from {filepath}. Skipping file.")
-                except Exception as e:
-                    print(f"An unexpected error occurred loading tournament from {filepath}: {e}")
+        for entry in self.catalog.entries():
+            tournament = self._load_tournament_file(
+                os.path.join(self.storage_directory, entry["path"])
+            )
+            if tournament:
+                loaded_tournaments.append(tournament)
         return loaded_tournaments
 
     def _save_tournament(self, tournament: Tournament):
@@ -95,9 +126,11 @@ class TournamentManager:
             tournament (Tournament): The Tournament object to save.
         """
         filepath = self._get_tournament_file_path(tournament.name)
+        data = tournament.to_dict()
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(tournament.to_dict(), f, indent=4)
+                json.dump(data, f, indent=4)
+            self.catalog.record(filepath, data)
         except Exception as e:
             print(f"Error saving tournament {tournament.name} to {filepath}: {e}")
 
@@ -123,9 +156,8 @@ class TournamentManager:
             Optional[Tournament]: The newly created Tournament object, or None if creation fails
                                   (e.g., tournament name already exists or invalid date format).
         """
-        # Reload all tournaments to check for existing name
-        existing_tournaments = self._load_all_tournaments()
-        if any(t.name == name for t in existing_tournaments):
+        # The catalog answers existence checks without loading any tournament
+        if name in self.catalog:
             print(f"Error: Tournament with name '{name}' already exists.")
             return None
 
@@ -166,7 +198,8 @@ class TournamentManager:
     def get_tournament_by_name(self, name: str) -> Optional[Tournament]:
         """
         Finds and returns a tournament by its name.
-        This method reloads all tournaments to ensure it reflects the latest file system state.
+        The catalog locates the tournament's file, so only that file is loaded
+        from disk.
 
         Args:
             name (str): The name of the tournament to find.
@@ -174,11 +207,12 @@ class TournamentManager:
         Returns:
             Optional[Tournament]: The Tournament object if found, None otherwise.
         """
-        self.tournaments = self._load_all_tournaments() # Ensure in-memory is synced
-        for tournament in self.tournaments:
-            if tournament.name == name:
-                return tournament
-        return None
+        entry = self.catalog.lookup(name)
+        if entry is None:
+            return None
+        return self._load_tournament_file(
+            os.path.join(self.storage_directory, entry["path"])
+        )
 
     def update_tournament(self, tournament: Tournament) -> bool:
         """
@@ -220,6 +254,7 @@ class TournamentManager:
         if os.path.exists(filepath):
             try:
                 os.remove(filepath)
+                self.catalog.forget(filepath)
                 print(f"Tournament '{tournament_name}' and its file deleted successfully.")
                 return True
             except OSError as e:
@@ -228,4 +263,3 @@ class TournamentManager:
         else:
             print(f"Tournament '{tournament_name}' file not found. Nothing to delete.")
             return False
-
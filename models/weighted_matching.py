@@ -0,0 +1,460 @@
+"""
+Maximum-weight matching in general graphs (Edmonds' blossom algorithm, O(n^3)).
+
+The implementation follows "An O(EV log V) algorithm for finding a maximal
+weighted matching in general graphs" (Galil, Micali and Gabow) in the O(n^3)
+form described by Galil, as in Joris van Rantwijk's public-domain reference
+implementation.
+
+Vertices are numbered from 0. Integer weights keep all the computations exact.
+"""
+from typing import List, Tuple
+
+
+def max_weight_matching(
+    edges: List[Tuple[int, int, int]], maxcardinality: bool = False
+) -> List[int]:
+    """
+    Computes a maximum-weight matching of a general graph.
+
+    Args:
+        edges: The edges, as (i, j, weight) tuples. There must be at most one
+            edge between two vertices.
+        maxcardinality: If True, only maximum-cardinality matchings are
+            considered (the result is a perfect matching whenever one exists).
+
+    Returns:
+        List[int]: mate[v] is the vertex matched with v, or -1 if v is not
+            matched.
+    """
+    if not edges:
+        return []
+
+    edge_count = len(edges)
+    vertex_count = 1 + max(max(i, j) for i, j, _ in edges)
+    max_weight = max(0, max(weight for _, _, weight in edges))
+
+    # endpoint[p] is the vertex at end p of an edge: edge k has ends 2k and
+    # 2k+1
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * edge_count)]
+    # neighbend[v] lists the remote ends of the edges of v
+    neighbend = [[] for _ in range(vertex_count)]
+    for k, (i, j, _) in enumerate(edges):
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+
+    # mate[v] is the remote end of the matched edge of v (-1 if single);
+    # vertices at the end
+    mate = vertex_count * [-1]
+    # Labels of top-level blossoms: 0 free, 1 S (outer), 2 T (inner); bit 4
+    # marks a scanned blossom
+    label = (2 * vertex_count) * [0]
+    # The end through which a labelled blossom got its label
+    labelend = (2 * vertex_count) * [-1]
+    # The top-level blossom of each vertex
+    inblossom = list(range(vertex_count))
+    # Blossom b (vertex_count <= b < 2 * vertex_count) structure
+    blossomparent = (2 * vertex_count) * [-1]
+    blossomchilds = (2 * vertex_count) * [None]
+    blossombase = list(range(vertex_count)) + vertex_count * [-1]
+    blossomendps = (2 * vertex_count) * [None]
+    # Least-slack edge to a different S-blossom, per vertex / top-level blossom
+    bestedge = (2 * vertex_count) * [-1]
+    blossombestedges = (2 * vertex_count) * [None]
+    unusedblossoms = list(range(vertex_count, 2 * vertex_count))
+    # Dual variables: vertices start at the maximum weight, blossoms at 0
+    dualvar = vertex_count * [max_weight] + vertex_count * [0]
+    # Edges with zero slack, that can be used in the alternating trees
+    allowedge = edge_count * [False]
+    queue = []
+
+    # Start from a greedy matching of the edges of maximum weight: they have
+    # zero slack with the initial duals, so the invariants of the algorithm
+    # hold, and the stages that would match these edges one by one are saved
+    for k, (i, j, weight) in enumerate(edges):
+        if weight == max_weight and mate[i] == -1 and mate[j] == -1 and i != j:
+            mate[i] = 2 * k + 1
+            mate[j] = 2 * k
+
+    def slack(k):
+        i, j, weight = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * weight
+
+    def blossom_leaves(b):
+        if b < vertex_count:
+            yield b
+        else:
+            for t in blossomchilds[b]:
+                if t < vertex_count:
+                    yield t
+                else:
+                    yield from blossom_leaves(t)
+
+    def assign_label(w, t, p):
+        """
+        Labels the top-level blossom of w (and its mate, for a T-blossom),
+        reached through end p.
+        """
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(blossom_leaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assign_label(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scan_blossom(v, w):
+        """
+        Traces back from v and w: returns the base of the new blossom, or -1
+        for an augmenting path.
+        """
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def add_blossom(base, k):
+        """Creates a blossom with the given base, closed by edge k."""
+        v, w, _ = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in blossom_leaves(b):
+            if label[inblossom[v]] == 2:
+                # T-vertices become S-vertices
+                queue.append(v)
+            inblossom[v] = b
+
+        # Least-slack edges from the new blossom to the other S-blossoms
+        bestedgeto = (2 * vertex_count) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                neighbour_lists = [
+                    [p // 2 for p in neighbend[v]] for v in blossom_leaves(bv)
+                ]
+            else:
+                neighbour_lists = [blossombestedges[bv]]
+            for neighbour_list in neighbour_lists:
+                for k in neighbour_list:
+                    i, j, _ = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if (
+                        bj != b
+                        and label[bj] == 1
+                        and (
+                            bestedgeto[bj] == -1
+                            or slack(k) < slack(bestedgeto[bj])
+                        )
+                    ):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expand_blossom(b, endstage):
+        """
+        Expands a top-level blossom into its sub-blossoms (recursively at the
+        end of a stage).
+        """
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < vertex_count:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expand_blossom(s, endstage)
+            else:
+                for v in blossom_leaves(s):
+                    inblossom[v] = s
+
+        if not endstage and label[b] == 2:
+            # Relabel the sub-blossoms on the path from the entry child to the
+            # base
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                q = blossomendps[b][j - endptrick]
+                label[endpoint[q ^ endptrick ^ 1]] = 0
+                assign_label(endpoint[p ^ 1], 2, p)
+                allowedge[q // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossom_leaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assign_label(v, 2, labelend[v])
+                j += jstep
+
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augment_blossom(b, v):
+        """
+        Swaps matched/unmatched edges along the path from v to the base of
+        blossom b.
+        """
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= vertex_count:
+            augment_blossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= vertex_count:
+                augment_blossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        # v is the new base of the blossom
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augment_matching(k):
+        """
+        Swaps matched/unmatched edges along the augmenting path through edge k.
+        """
+        v, w, _ = edges[k]
+        for s, p in ((v, 2 * k + 1), (w, 2 * k)):
+            while True:
+                bs = inblossom[s]
+                if bs >= vertex_count:
+                    augment_blossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    # Reached a single vertex: the end of the path
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= vertex_count:
+                    augment_blossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    # Each stage augments the matching by one edge, or stops
+    for _ in range(vertex_count):
+        label[:] = (2 * vertex_count) * [0]
+        bestedge[:] = (2 * vertex_count) * [-1]
+        blossombestedges[vertex_count:] = vertex_count * [None]
+        allowedge[:] = edge_count * [False]
+        queue[:] = []
+
+        for v in range(vertex_count):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assign_label(v, 1, -1)
+
+        augmented = False
+        while True:
+            # Grow the alternating trees from the S-vertices
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assign_label(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scan_blossom(v, w)
+                            if base >= 0:
+                                add_blossom(base, k)
+                            else:
+                                augment_matching(k)
+                                augmented = True
+                                break
+                        elif label[w] == 0:
+                            # w is in a T-blossom but was not reached yet
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+
+            if augmented:
+                break
+
+            # No augmenting path with the current duals: compute the dual
+            # update
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+            if not maxcardinality:
+                deltatype = 1
+                delta = min(dualvar[:vertex_count])
+            for v in range(vertex_count):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+            for b in range(2 * vertex_count):
+                if (
+                    blossomparent[b] == -1
+                    and label[b] == 1
+                    and bestedge[b] != -1
+                ):
+                    kslack = slack(bestedge[b])
+                    d = kslack // 2 if isinstance(kslack, int) else kslack / 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+            for b in range(vertex_count, 2 * vertex_count):
+                if (
+                    blossombase[b] >= 0
+                    and blossomparent[b] == -1
+                    and label[b] == 2
+                    and (deltatype == -1 or dualvar[b] < delta)
+                ):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+            if deltatype == -1:
+                # No further improvement possible (max cardinality mode):
+                # optimum reached
+                deltatype = 1
+                delta = max(0, min(dualvar[:vertex_count]))
+
+            for v in range(vertex_count):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(vertex_count, 2 * vertex_count):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+
+            if deltatype == 1:
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                i, j, _ = edges[deltaedge]
+                queue.append(i)
+            else:
+                expand_blossom(deltablossom, False)
+
+        if not augmented:
+            break
+
+        # End of the stage: expand the S-blossoms whose dual variable dropped
+        # to zero
+        for b in range(vertex_count, 2 * vertex_count):
+            if (
+                blossomparent[b] == -1
+                and blossombase[b] >= 0
+                and label[b] == 1
+                and dualvar[b] == 0
+            ):
+                expand_blossom(b, True)
+
+    return [endpoint[p] if p >= 0 else -1 for p in mate]
@@ -0,0 +1,92 @@
+"""
+Defines the WriteBehindCache class, which delays and coalesces repeated saves.
+
+Saving a tournament after every registration, round start or result rewrites
+the whole tournament each time. With the cache, a save only records the latest
+data of the tournament and marks it dirty; dirty entries are written at most
+once per window by a timer, and on an explicit flush (checkpoint) or at
+interpreter exit.
+"""
+import atexit
+import threading
+from typing import Any, Callable, Dict
+
+
+class WriteBehindCache:
+    """
+    Collects the data to save, keyed by entity, and writes it later in one go.
+
+    Only the most recent data of each key is kept, so several saves of the same
+    entity within a window result in a single write.
+    """
+
+    def __init__(self, write: Callable[[Any], None], window: float = 5.0):
+        """
+        Args:
+            write: The function actually saving the data of one entity.
+            window: Maximum delay (in seconds) between marking an entity dirty
+                and writing it.
+        """
+        self.write = write
+        self.window = window
+        self._pending: Dict[str, Any] = {}
+        # Protects the pending data and the timer
+        self._lock = threading.Lock()
+        # Keeps flushes (and thus writes of a key) in order
+        self._write_lock = threading.Lock()
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _arm_timer(self):
+        """
+        Starts the flush timer if it is not running. Must be called with the
+        lock held.
+        """
+        if self._timer is None:
+            self._timer = threading.Timer(self.window, self.flush)
+            # The timer must not keep the program alive: the exit flush takes
+            # over
+            self._timer.daemon = True
+            self._timer.start()
+
+    def mark_dirty(self, key: str, data: Any):
+        """
+        Records the latest data of an entity, to be written within the window.
+
+        Args:
+            key: The entity identifier (e.g. the tournament name).
+            data: The data to write, captured now (later changes to the entity
+                are not included).
+        """
+        with self._lock:
+            self._pending[key] = data
+            self._arm_timer()
+
+    def is_dirty(self, key: str) -> bool:
+        """Checks whether an entity has data waiting to be written."""
+        with self._lock:
+            return key in self._pending
+
+    def flush(self):
+        """
+        Writes all the pending data now (checkpoint). An entity whose write
+        fails, whatever the error, is kept pending and retried; the other
+        entities are still written.
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+
+            for key, data in pending.items():
+                try:
+                    self.write(data)
+                except Exception as e:
+                    print(f"Error writing {key}: {e}. Will retry.")
+                    with self._lock:
+                        # Keep newer data if the entity was saved again in the
+                        # meantime
+                        self._pending.setdefault(key, data)
+                        self._arm_timer()
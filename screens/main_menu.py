@@ -32,7 +32,9 @@ class MainMenu(BaseScreen):
         print("\n--- Tournament Management Menu ---")
         print("1. Create New Tournament")
         print("2. Load and Manage Existing Tournament")
-        print("3. Back to Main Menu")
+        print("3. Federation Statistics")
+        print("4. Head-to-Head Record")
+        print("5. Back to Main Menu")
         return input("Enter your choice: ").strip()
 
     @staticmethod
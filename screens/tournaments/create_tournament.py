@@ -3,6 +3,8 @@
 Screen for collecting details to create a new tournament.
 """
 from screens.base_screen import BaseScreen
+from models.pairing import OPTIMAL_FULL_GRAPH, OPTIMAL_WINDOW
+from models.tournament import PAIRINGS
 import datetime
 
 
@@ -19,12 +21,12 @@ class CreateTournamentScreen(BaseScreen):
         """Prompts the user for new tournament details and returns them as a dict."""
         print("\n--- Create New Tournament ---")
         name = input("Tournament Name: ").strip()
-        location = input("Location: ").strip()
+        venue = input("Venue: ").strip()
 
         while True:
             start_date_str = input("Start Date (YYYY-MM-DD): ").strip()
             try:
-                datetime.date.fromisoformat(start_date_str)
+                start_date = datetime.datetime.fromisoformat(start_date_str)
                 break
             except ValueError:
                 print("Invalid date format. Please use YYYY-MM-DD.")
@@ -32,27 +34,49 @@ class CreateTournamentScreen(BaseScreen):
         while True:
             end_date_str = input("End Date (YYYY-MM-DD): ").strip()
             try:
-                datetime.date.fromisoformat(end_date_str)
-                if datetime.date.fromisoformat(end_date_str) < datetime.date.fromisoformat(start_date_str):
+                end_date = datetime.datetime.fromisoformat(end_date_str)
+                if end_date < start_date:
                     print("End date cannot be before start date.")
                     continue
                 break
             except ValueError:
                 print("Invalid date format. Please use YYYY-MM-DD.")
 
-        num_rounds = BaseScreen.get_user_input_int("Number of Rounds (default 4): ", default=4)
+        while True:
+            num_rounds_str = (
+                input("Number of Rounds (default 4): ").strip() or "4"
+            )
+            if num_rounds_str.isdigit() and int(num_rounds_str) > 0:
+                num_rounds = int(num_rounds_str)
+                break
+            print("Please enter a positive whole number.")
+        while True:
+            pairing = (
+                input(f"Pairing ({', '.join(PAIRINGS)}) [swiss]: ")
+                .strip()
+                .lower()
+                or "swiss"
+            )
+            if pairing in PAIRINGS:
+                break
+            print("Invalid pairing mode.")
+        if pairing == "optimal":
+            print(
+                f"Note: with more than {OPTIMAL_FULL_GRAPH} players, each "
+                "player is only paired with "
+                f"the {OPTIMAL_WINDOW} players ranked below, and pairing a "
+                "round can take about a second."
+            )
         description = input("Description (optional): ").strip()
 
+        # The keys are the arguments of the Tournament constructor
         return {
-            "tournament_id": None,  # Will be generated by model
             "name": name,
-            "location": location,
-            "start_date": start_date_str,
-            "end_date": end_date_str,
+            "venue": venue,
+            "start_date": start_date,
+            "end_date": end_date,
+            # Round robins: set from the number of players
             "num_rounds": num_rounds,
+            "pairing": pairing,
             "description": description,
-            "players": [],  # Start empty
-            "rounds": [],  # Start empty
-            "current_round_num": 0,
-            "status": "created"
-        }
\ No newline at end of file
+        }
@@ -47,4 +47,20 @@ class EnterResultsScreen(BaseScreen):
                     break
                 else:
                     print("Invalid input. Please enter '1', '2', or 'd'.")
-        return results
\ No newline at end of file
+        return results
+
+    @staticmethod
+    def get_results_file() -> str | None:
+        """
+        Prompts for the path of a results file (board or match ID, result).
+        Returns None to go back.
+        """
+        print("\n--- Import Match Results ---")
+        print(
+            "One row per match: board number (or match ID) and result (1-0, "
+            "0-1 or 1/2-1/2)."
+        )
+        path = input(
+            "Enter the path of the CSV/TSV file, or leave empty to go back: "
+        ).strip()
+        return path or None
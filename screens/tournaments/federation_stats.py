@@ -0,0 +1,46 @@
+# screens/tournaments/federation_stats.py
+"""
+Screen for displaying the statistics of the players over all the tournaments.
+"""
+from typing import Dict
+
+from screens.base_screen import BaseScreen
+from models.analytics import PlayerStats
+
+
+class FederationStatsScreen(BaseScreen):
+    """
+    Handles the user interface for displaying the federation-wide player
+    statistics.
+    """
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def display_stats(
+        stats: Dict[str, PlayerStats], ratings: Dict[str, int], limit: int = 20
+    ):
+        """
+        Displays the most active players: games, score, performance rating and
+        colour balance.
+        """
+        print(f"\n--- Federation Statistics ({len(stats)} players) ---")
+        if not stats:
+            print("No games played yet.")
+            return
+        for chess_id in sorted(
+            stats,
+            key=lambda p: (stats[p].games, stats[p].points),
+            reverse=True,
+        )[:limit]:
+            player_stats = stats[chess_id]
+            performance = player_stats.performance(ratings)
+            print(
+                f"{chess_id}: {player_stats.games} games, Score "
+                f"{player_stats.score_percentage:.1f}%, "
+                "Performance "
+                f"{'N/A' if performance is None else f'{performance:.0f}'}, "
+                f"White {player_stats.white} / Black {player_stats.black} "
+                f"({player_stats.colour_balance:+d})"
+            )
+        print("-" * 30)
@@ -0,0 +1,66 @@
+# screens/tournaments/head_to_head.py
+"""
+Screen for displaying the head-to-head record of two players over all the
+tournaments.
+"""
+
+from typing import Tuple
+
+from screens.base_screen import BaseScreen
+from models.head_to_head import HeadToHead
+
+
+class HeadToHeadScreen(BaseScreen):
+    """
+    Handles the user interface for displaying the games between two players.
+    """
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def select_players() -> Tuple[str, str] | None:
+        """
+        Prompts for the Chess IDs of two players. Returns None to go back.
+        """
+        player_ids = []
+        while len(player_ids) < 2:
+            player_id = (
+                input(
+                    f"Enter the Chess ID of player {len(player_ids) + 1}, or "
+                    "'b' to go back: "
+                )
+                .strip()
+                .upper()
+            )
+            if player_id == 'B':
+                return None
+            if player_id in player_ids:
+                print("Please enter two different players.")
+            elif player_id:
+                player_ids.append(player_id)
+        return player_ids[0], player_ids[1]
+
+    @staticmethod
+    def display_record(record: HeadToHead):
+        """
+        Displays the score of a player against an opponent, and their games.
+        """
+        print(
+            f"\n--- Head-to-Head: {record.player_id} vs {record.opponent_id} "
+            "---"
+        )
+        if not record.games:
+            print("These players have never played each other.")
+            return
+        print(
+            f"{record.player_id}: +{record.wins} ={record.draws} "
+            f"-{record.losses} "
+            f"({record.points}/{len(record.games)})"
+        )
+        for game in record.games:
+            colour = "White" if game.white == record.player_id else "Black"
+            print(
+                f"{game.tournament}, Round {game.round}, Board {game.board}: "
+                f"{colour}, {game.points}"
+            )
+        print("-" * 30)
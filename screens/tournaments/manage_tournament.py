@@ -46,5 +46,8 @@ class ManageTournamentScreen(BaseScreen):
         print("2. Start/Advance Round")
         print("3. Enter Match Results")
         print("4. View Tournament Report")
-        print("5. Back to Tournament Menu")
+        print("5. Simulate Outcome Probabilities")
+        print("6. View Player History")
+        print("7. Import Match Results (CSV/TSV)")
+        print("8. Back to Tournament Menu")
         return BaseScreen.get_user_input("Enter your choice: ")
\ No newline at end of file
@@ -0,0 +1,45 @@
+# screens/tournaments/outcome_probabilities.py
+"""
+Screen for displaying the simulated outcome probabilities of a tournament in
+progress.
+"""
+
+from screens.base_screen import BaseScreen
+from models.simulation import SimulationResult
+from models.tournament import Tournament
+
+
+class OutcomeProbabilitiesScreen(BaseScreen):
+    """
+    Handles the user interface for displaying the win and top-N probabilities
+    of the players.
+    """
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def display_probabilities(
+        tournament: Tournament, result: SimulationResult, limit: int = 20
+    ):
+        """
+        Displays the players most likely to win, with their top-N probability
+        and expected points.
+        """
+        print(
+            f"\n--- Outcome Probabilities: {tournament.name} "
+            f"({result.simulations} simulations) ---"
+        )
+        wins = result.win_probabilities()
+        top_n = result.top_n_probabilities()
+        expected = result.expected_points()
+        for player_id in sorted(
+            wins, key=lambda p: (wins[p], top_n[p]), reverse=True
+        )[:limit]:
+            player = tournament.roster[player_id]
+            print(
+                f"{player.first_name} {player.last_name}: Win "
+                f"{wins[player_id]:.1%}, "
+                f"Top {result.top_n} {top_n[player_id]:.1%}, Expected points "
+                f"{expected[player_id]:.2f}"
+            )
+        print("-" * 30)
@@ -0,0 +1,62 @@
+# screens/tournaments/player_history.py
+"""
+Screen for displaying the games of a player in a tournament.
+"""
+from screens.base_screen import BaseScreen
+from models.tournament import Tournament
+
+
+class PlayerHistoryScreen(BaseScreen):
+    """
+    Handles the user interface for displaying the match history of a player.
+    """
+    def __init__(self):
+        super().__init__()
+
+    @staticmethod
+    def select_player(tournament: Tournament) -> str | None:
+        """
+        Prompts for the Chess ID of a registered player. Returns None to go
+        back.
+        """
+        while True:
+            player_id = (
+                input("Enter the Chess ID of the player, or 'b' to go back: ")
+                .strip()
+                .upper()
+            )
+            if player_id == 'B':
+                return None
+            if player_id in tournament.roster:
+                return player_id
+            print(f"No player with Chess ID {player_id} in this tournament.")
+
+    @staticmethod
+    def display_history(tournament: Tournament, player_id: str):
+        """
+        Displays the games of a player, round by round, with the player's
+        results.
+        """
+        player = tournament.roster[player_id]
+        history = tournament.player_history(player_id)
+        print(
+            f"\n--- Games of {player.first_name} {player.last_name} "
+            f"({player_id}) in {tournament.name} ---"
+        )
+        if not history:
+            print("No games played yet.")
+        for number, match in history:
+            is_player1 = match.player1.player_id == player_id
+            opponent = match.player2 if is_player1 else match.player1
+            if match.result is None:
+                result = "Pending"
+            else:
+                score = match.result[0] if is_player1 else match.result[1]
+                result = {1.0: "Win", 0.5: "Draw", 0.0: "Loss"}[score]
+            colour = "White" if is_player1 else "Black"
+            print(
+                f"Round {number}: {colour} vs {opponent.first_name} "
+                f"{opponent.last_name} - {result}"
+            )
+        print(f"Points: {tournament.points.get(player_id, 0.0)}")
+        print("-" * 30)
@@ -0,0 +1,476 @@
+# screens/tournaments/report_renderer.py
+"""
+Streaming renderer of the tournament reports.
+
+A report is a pipeline:
+- each section (header, race, standings, rounds) is a generator of records:
+  titles, notes (free text) and table rows (tuples of cells)
+- the records are paginated (a page is a number of rows and notes; the titles
+  of a page are only kept when the page has rows under them)
+- a format turns the records into text: "terminal" (text, pausing between the
+  pages), "text" or "csv" (one row per record, a header row when the table
+  changes, titles and notes skipped)
+- the text goes to one buffered writer, which writes big chunks to the output
+  stream
+
+Nothing holds the whole report: memory does not depend on the size of the
+tournament.
+"""
+
+import csv
+import itertools
+import sys
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+from models.tiebreaks import TIEBREAKS
+from models.tournament import Tournament
+
+SECTIONS = ("header", "race", "standings", "rounds")
+FORMATS = ("terminal", "text", "csv")
+# Characters buffered before a write to the output stream
+BUFFER_SIZE = 64 * 1024
+# Largest field whose report includes the race by default (the clinch analysis
+# grows fast with the number of players): larger tournaments get it only when
+# the "race" section is asked for
+RACE_MAX_PLAYERS = 64
+
+# Record kinds that are not table rows
+TITLE = "title"
+NOTE = "note"
+
+# Columns of the tables (the standings get a column per tiebreak of the chain)
+INFO_COLUMNS = ("field", "value")
+RACE_COLUMNS = ("status", "player_id", "name", "points")
+STANDINGS_COLUMNS = ("rank", "player_id", "name", "elo", "points")
+MATCHES_COLUMNS = (
+    "round",
+    "board",
+    "match_id",
+    "white",
+    "black",
+    "white_points",
+    "black_points",
+    "winner",
+)
+
+Record = Tuple[str, tuple]
+
+
+class BufferedWriter:
+    """
+    Collects written text and writes it to a stream in chunks of about `size`
+    characters.
+    """
+
+    def __init__(self, stream: TextIO, size: int = BUFFER_SIZE):
+        self.stream = stream
+        self.size = size
+        self._parts: List[str] = []
+        self._length = 0
+
+    def write(self, text: str):
+        self._parts.append(text)
+        self._length += len(text)
+        if self._length >= self.size:
+            self.flush()
+
+    def flush(self):
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts.clear()
+            self._length = 0
+        self.stream.flush()
+
+
+class ReportRenderer:
+    """
+    Renders the report of a tournament, or some of its sections, page by page.
+
+    Attributes:
+        tournament (Tournament): The tournament.
+        sections (Sequence[str]): The sections rendered, among SECTIONS.
+        round_number (Optional[int]): The only round rendered (1-based), or
+            None for all the rounds.
+        tiebreaks (Sequence[str]): The tiebreak chain of the standings.
+        places (int): The number of places of the race section.
+    """
+
+    def __init__(
+        self,
+        tournament: Tournament,
+        sections: Optional[Sequence[str]] = None,
+        round_number: Optional[int] = None,
+        tiebreaks: Optional[Sequence[str]] = None,
+        places: int = 1,
+    ):
+        """
+        Args:
+            tournament (Tournament): The tournament.
+            sections (Sequence[str], optional): The sections to render.
+                Defaults to all of them (the race only while the tournament is
+                in progress, with at most RACE_MAX_PLAYERS players).
+            round_number (int, optional): Renders only this round (1-based).
+                Defaults to all the rounds.
+            tiebreaks (Sequence[str], optional): The tiebreak chain. Defaults
+                to the tournament's chain.
+            places (int, optional): The number of places of the race section.
+                Defaults to 1.
+
+        Raises:
+            ValueError: If a section is unknown, or the round does not exist.
+        """
+        unknown = [
+            section for section in sections or () if section not in SECTIONS
+        ]
+        if unknown:
+            raise ValueError(
+                f"Unknown report section(s): {', '.join(unknown)}. Expected: "
+                f"{', '.join(SECTIONS)}."
+            )
+        if round_number is not None and not 1 <= round_number <= len(
+            tournament.rounds
+        ):
+            raise ValueError(
+                f"Round {round_number} does not exist (rounds played: "
+                f"{len(tournament.rounds)})."
+            )
+        self.tournament = tournament
+        if sections is None:
+            race = (
+                tournament.rounds
+                and not tournament.completed
+                and not tournament.is_arena
+                and len(tournament.players) <= RACE_MAX_PLAYERS
+            )
+            sections = [
+                section for section in SECTIONS if section != "race" or race
+            ]
+        self.sections = list(sections)
+        self.round_number = round_number
+        self.tiebreaks = list(
+            tournament.tiebreaks if tiebreaks is None else tiebreaks
+        )
+        self.places = places
+
+    def columns(self, table: str) -> Tuple[str, ...]:
+        """Returns the columns of a table of the report."""
+        if table == "standings":
+            return STANDINGS_COLUMNS + tuple(self.tiebreaks)
+        return {
+            "info": INFO_COLUMNS,
+            "race": RACE_COLUMNS,
+            "matches": MATCHES_COLUMNS,
+        }[table]
+
+    # Sections: generators of records
+
+    def records(self) -> Iterator[Record]:
+        """Yields the records of the selected sections, in order."""
+        for section in self.sections:
+            yield from getattr(self, f"_{section}")()
+
+    def _header(self) -> Iterator[Record]:
+        tournament = self.tournament
+        yield TITLE, (
+            f"Tournament Report: {tournament.name} ({tournament.venue})",
+        )
+        status = (
+            "Completed"
+            if tournament.completed
+            else "In progress" if tournament.rounds else "Not started"
+        )
+        yield "info", ("Status", status)
+        yield "info", (
+            "Dates",
+            f"{tournament.start_date:%d-%m-%Y} to "
+            f"{tournament.end_date:%d-%m-%Y}",
+        )
+        yield "info", (
+            "Rounds Played",
+            f"{len(tournament.rounds)}/{tournament.num_rounds}",
+        )
+        yield "info", ("Description", tournament.description or "N/A")
+
+    def _race(self) -> Iterator[Record]:
+        tournament = self.tournament
+        yield TITLE, (
+            (
+                "Race for First Place"
+                if self.places == 1
+                else f"Race for Top {self.places}"
+            ),
+        )
+        try:
+            analysis = tournament.clinch_analysis()
+        except ValueError as e:
+            yield NOTE, (f"Error: {e}",)
+            return
+        for player_id in tournament.standings.ranked():
+            player = tournament.roster.get(player_id)
+            if player is None or not analysis.can_reach(
+                player_id, self.places
+            ):
+                continue
+            status = (
+                "Clinched"
+                if analysis.has_clinched(player_id, self.places)
+                else "In contention"
+            )
+            yield "race", (
+                status,
+                player_id,
+                f"{player.first_name} {player.last_name}",
+                tournament.points[player_id],
+            )
+
+    def _standings(self) -> Iterator[Record]:
+        tournament = self.tournament
+        chain = self.tiebreaks
+        labels = ", ".join(TIEBREAKS[name] for name in chain)
+        yield TITLE, (
+            f"Players (Ranked by Points{', then ' + labels if chain else ''})",
+        )
+        ranked_players = tournament.get_ranked_players(chain)
+        if not ranked_players:
+            yield NOTE, ("No players registered yet.",)
+            return
+        table = tournament.tiebreak_table() if chain else None
+        points = tournament.points
+        rank = previous = None
+        for i, player in enumerate(ranked_players, 1):
+            player_points = points[player.player_id]
+            # Without tiebreaks, players with the same points share the same
+            # rank
+            if chain or player_points != previous:
+                rank, previous = i, player_points
+            scores = tuple(
+                table.score(name, player.player_id) for name in chain
+            )
+            yield "standings", (
+                rank,
+                player.player_id,
+                f"{player.first_name} {player.last_name}",
+                player.elo_rating,
+                player_points,
+            ) + scores
+
+    def _rounds(self) -> Iterator[Record]:
+        tournament = self.tournament
+        if self.round_number is None:
+            yield TITLE, ("Rounds and Matches",)
+            if not tournament.rounds:
+                yield NOTE, ("No rounds have been played yet.",)
+                return
+            numbered = enumerate(tournament.rounds, 1)
+        else:
+            numbered = [
+                (self.round_number, tournament.rounds[self.round_number - 1])
+            ]
+
+        names = {}  # player ID -> name: each player appears in every round
+        for number, round_ in numbered:
+            yield TITLE, (
+                f"{round_.name} (Started: {round_.start_time or 'N/A'}, "
+                f"Ended: {round_.end_time or 'N/A'})",
+            )
+            if not round_.matches:
+                yield NOTE, ("No matches in this round.",)
+            for board, match in enumerate(round_.matches, 1):
+                player1, player2 = match.player1, match.player2
+                white_points, black_points = match.result or ("", "")
+                # The result tells the winner: no lookup by ID
+                winner = (
+                    ""
+                    if match.result is None or white_points == black_points
+                    else (
+                        player1 if white_points > black_points else player2
+                    ).player_id
+                )
+                white = names.get(player1.player_id) or names.setdefault(
+                    player1.player_id,
+                    f"{player1.first_name} {player1.last_name}",
+                )
+                black = names.get(player2.player_id) or names.setdefault(
+                    player2.player_id,
+                    f"{player2.first_name} {player2.last_name}",
+                )
+                yield "matches", (
+                    number,
+                    board,
+                    match.match_id,
+                    white,
+                    black,
+                    white_points,
+                    black_points,
+                    winner,
+                )
+
+    # Output
+
+    def render(
+        self,
+        stream: Optional[TextIO] = None,
+        fmt: str = "terminal",
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+        prompt: Callable[[str], str] = input,
+    ) -> Optional[int]:
+        """
+        Writes the report to a stream.
+
+        Args:
+            stream (TextIO, optional): The output stream. Defaults to the
+                standard output.
+            fmt (str, optional): The output format, among FORMATS. Defaults to
+                "terminal".
+            page (int, optional): Renders only this page (1-based). Defaults to
+                all the pages.
+            page_size (int, optional): The rows (and notes) per page. Defaults
+                to a single page. In the terminal format, the report pauses
+                after each page when all pages are rendered.
+            prompt (Callable[[str], str], optional): Asks the user to continue
+                after a page (terminal format). An answer starting with "q"
+                stops the report. Defaults to input.
+
+        Returns:
+            Optional[int]: The number of rows and notes written, or None if the
+                user quit the report.
+
+        Raises:
+            ValueError: If the format is unknown, or the page or page size is
+                not positive.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(
+                f"Unknown report format '{fmt}'. Expected one of: "
+                f"{', '.join(FORMATS)}."
+            )
+        if (page is not None and page < 1) or (
+            page_size is not None and page_size < 1
+        ):
+            raise ValueError("Pages and page sizes start at 1.")
+        writer = BufferedWriter(stream or sys.stdout)
+        records = self.records()
+        if page is not None and page_size is not None:
+            records = self._page(
+                records, (page - 1) * page_size, page * page_size
+            )
+        if fmt == "csv":
+            count = self._write_csv(records, writer)
+        else:
+            pause = page_size if fmt == "terminal" and page is None else None
+            count = self._write_text(records, writer, pause, prompt)
+            if page is None and count is not None:
+                writer.write("\n--- End of Report ---\n")
+        writer.flush()
+        return count
+
+    @staticmethod
+    def _page(
+        records: Iterable[Record], start: int, end: int
+    ) -> Iterator[Record]:
+        """
+        Yields the records of rows start to end (titles kept only above rows of
+        the page).
+        """
+        titles: List[Record] = []
+        position = 0
+        for record in records:
+            if record[0] == TITLE:
+                titles.append(record)
+                continue
+            if position >= end:
+                break
+            if position >= start:
+                yield from titles
+                yield record
+            titles = []
+            position += 1
+
+    def _write_text(
+        self,
+        records: Iterable[Record],
+        writer: BufferedWriter,
+        pause: Optional[int],
+        prompt: Callable[[str], str],
+    ) -> Optional[int]:
+        """
+        Writes the records as text lines. Returns the rows and notes written,
+        or None if the user quit.
+        """
+        count = 0
+        format_row = {
+            "info": lambda cells: f"{cells[0]}: {cells[1]}",
+            "race": lambda cells: (
+                f"{cells[0]}: {cells[2]} ({cells[3]} points)"
+            ),
+            "standings": self._format_standing,
+            "matches": self._format_match,
+        }
+        for kind, cells in records:
+            if kind == TITLE:
+                writer.write(f"\n--- {cells[0]} ---\n")
+                continue
+            writer.write(
+                f"{cells[0] if kind == NOTE else format_row[kind](cells)}\n"
+            )
+            count += 1
+            if pause and count % pause == 0:
+                writer.flush()
+                if (
+                    prompt("-- More (Enter to continue, q to quit) -- ")
+                    .strip()
+                    .lower()
+                    .startswith("q")
+                ):
+                    return None
+        return count
+
+    def _format_standing(self, cells: tuple) -> str:
+        rank, _, name, elo, points = cells[:5]
+        scores = "".join(
+            f", {TIEBREAKS[name]}: {score:g}"
+            for name, score in zip(self.tiebreaks, cells[5:])
+        )
+        return f"{rank}. {name} (ELO: {elo}, Points: {points}{scores})"
+
+    @staticmethod
+    def _format_match(cells: tuple) -> str:
+        _, board, _, white, black, white_points, black_points, winner = cells
+        if white_points == "":
+            result = "Pending"
+        elif winner:
+            leader = white if white_points > black_points else black
+            result = f"{white_points} - {black_points} (Winner: {leader})"
+        else:
+            result = f"{white_points} - {black_points} (Draw)"
+        return f"  Match {board}: {white} vs {black} | {result}"
+
+    def _write_csv(
+        self, records: Iterable[Record], writer: BufferedWriter
+    ) -> int:
+        """
+        Writes the table rows as CSV, with a header row each time the table
+        changes. Returns the rows written.
+        """
+        out = csv.writer(writer, lineterminator="\n")
+        count = 0
+        table = None
+        for kind, cells in records:
+            if kind in (TITLE, NOTE):
+                continue
+            if kind != table:
+                table = kind
+                out.writerow(("table",) + self.columns(kind))
+            out.writerow(itertools.chain((kind,), cells))
+            count += 1
+        return count
@@ -2,57 +2,151 @@
 """
 Screen for displaying detailed tournament reports.
 """
+from typing import Any, Dict, Optional, Sequence
+
 from screens.base_screen import BaseScreen
 from models.tournament import Tournament
+from .report_renderer import FORMATS, SECTIONS, ReportRenderer
 
 
 class TournamentReportScreen(BaseScreen):
     """
     Handles the user interface for displaying various tournament reports.
+    The reports are streamed by ReportRenderer (see
+    screens.tournaments.report_renderer).
     """
 
     def __init__(self):
         super().__init__()
 
     @staticmethod
-    def display_report(tournament: Tournament):
-        """Displays a detailed report for the given tournament."""
-        print(f"\n--- Tournament Report: {tournament.name} ({tournament.location}) ---")
-        print(f"Status: {tournament.status}")
-        print(f"Dates: {tournament.start_date} to {tournament.end_date}")
-        print(f"Rounds Played: {tournament.current_round_num}/{tournament.num_rounds}")
-        print(f"Description: {tournament.description if tournament.description else 'N/A'}")
-
-        print("\n--- Players (Ranked by Points) ---")
-        ranked_players = tournament.get_ranked_players()
-        if not ranked_players:
-            print("No players registered yet.")
-        else:
-            for i, player in enumerate(ranked_players):
-                print(
-                    f"{i + 1}. {player.first_name} {player.last_name} (ELO: {player.elo_rating}, Points: {player.tournament_points})")
-
-        print("\n--- Rounds and Matches ---")
-        if not tournament.rounds:
-            print("No rounds have been played yet.")
-        else:
-            for round_obj in tournament.rounds:
-                print(
-                    f"\n--- {round_obj.name} (Started: {round_obj.start_time}, Ended: {round_obj.end_time or 'N/A'}) ---")
-                if not round_obj.matches:
-                    print("No matches in this round.")
-                else:
-                    for i, match in enumerate(round_obj.matches):
-                        p1_name = f"{match.player1.first_name} {match.player1.last_name}"
-                        p2_name = f"{match.player2.first_name} {match.player2.last_name}"
-                        result_str = "Pending"
-                        if match.result:
-                            result_str = f"{match.result[0]} - {match.result[1]}"
-                            if match.winner_id:
-                                winner = match.player1 if match.player1.player_id == match.winner_id else match.player2
-                                result_str += f" (Winner: {winner.first_name})"
-                            elif match.result == (0.5, 0.5):
-                                result_str += " (Draw)"
-
-                        print(f"  Match {i + 1}: {p1_name} vs {p2_name} | {result_str}")
-        print("\n--- End of Report ---")
\ No newline at end of file
+    def get_report_options(tournament: Tournament) -> Dict[str, Any]:
+        """
+        Prompts for the parts of the report to show and where to show them.
+        Returns the keyword arguments of display_report, or of export_report
+        (with a "path") when the report is written to a file.
+        """
+        print("\n--- Report Options (Enter for the defaults) ---")
+        while True:
+            answer = (
+                input(
+                    f"Sections ({', '.join(SECTIONS)}; comma-separated) "
+                    "[all]: "
+                )
+                .strip()
+                .lower()
+            )
+            sections = [
+                section.strip()
+                for section in answer.split(",")
+                if section.strip()
+            ] or None
+            if not sections or all(
+                section in SECTIONS for section in sections
+            ):
+                break
+            print("Unknown section.")
+
+        round_number = None
+        if tournament.rounds and (sections is None or "rounds" in sections):
+            while True:
+                answer = input(
+                    f"Round (1-{len(tournament.rounds)}) [all]: "
+                ).strip()
+                if not answer:
+                    break
+                if answer.isdigit() and 1 <= int(answer) <= len(
+                    tournament.rounds
+                ):
+                    round_number = int(answer)
+                    break
+                print("Invalid round.")
+
+        while True:
+            fmt = (
+                input(f"Output ({', '.join(FORMATS)}) [terminal]: ")
+                .strip()
+                .lower()
+                or "terminal"
+            )
+            if fmt in FORMATS:
+                break
+            print("Invalid output.")
+
+        options = {"sections": sections, "round_number": round_number}
+        if fmt != "terminal":
+            default_path = (
+                f"{tournament.name}.{'csv' if fmt == 'csv' else 'txt'}"
+            )
+            options.update(
+                fmt=fmt,
+                path=input(f"File [{default_path}]: ").strip() or default_path,
+            )
+            return options
+
+        while True:
+            answer = input("Rows per page [no pages]: ").strip()
+            if not answer:
+                break
+            if answer.isdigit() and int(answer) > 0:
+                options["page_size"] = int(answer)
+                break
+            print("Please enter a positive whole number.")
+        return options
+
+    @staticmethod
+    def display_report(
+        tournament: Tournament,
+        tiebreaks: Optional[Sequence[str]] = None,
+        places: int = 1,
+        sections: Optional[Sequence[str]] = None,
+        round_number: Optional[int] = None,
+        page: Optional[int] = None,
+        page_size: Optional[int] = None,
+    ):
+        """
+        Displays a detailed report for the given tournament. Players with the
+        same points are ordered by the tiebreak chain (the tournament's chain
+        by default). While the tournament is in progress, the report shows who
+        has clinched, or can still reach, the top `places` places. `sections`
+        and `round_number` select parts of the report (e.g. ["standings"], or
+        round 3 only); with a `page_size`, the report pauses after each page,
+        or shows only the given `page`.
+        """
+        try:
+            renderer = ReportRenderer(
+                tournament, sections, round_number, tiebreaks, places
+            )
+            renderer.render(page=page, page_size=page_size)
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    @staticmethod
+    def export_report(
+        tournament: Tournament,
+        path: str,
+        fmt: str = "text",
+        sections: Optional[Sequence[str]] = None,
+        round_number: Optional[int] = None,
+        tiebreaks: Optional[Sequence[str]] = None,
+    ) -> bool:
+        """
+        Writes the report of the tournament to a file, as plain text or CSV
+        ("text" or "csv"). Returns False (after displaying the error) if the
+        report cannot be written.
+        """
+        try:
+            if fmt not in ("text", "csv"):
+                raise ValueError(
+                    f"Unknown export format '{fmt}'. Expected text or csv."
+                )
+            renderer = ReportRenderer(
+                tournament, sections, round_number, tiebreaks
+            )
+            with open(path, "w", newline="", encoding="utf-8") as fp:
+                rows = renderer.render(fp, fmt=fmt)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return False
+        print(f"Report written to {path} ({rows} rows).")
+        return True